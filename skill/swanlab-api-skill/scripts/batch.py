@@ -0,0 +1,139 @@
+"""
+SwanLab API CLI - Batch 命令模块
+
+在同一进程中并发执行多条 CLI 命令：共享一个 Api 实例（只认证一次），
+每条输入的结果按完成顺序以 NDJSON 输出，并标记对应的输入。
+"""
+
+import io
+import json
+import shlex
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Tuple
+
+DEFAULT_BATCH_WORKERS = 8
+
+
+class _ThreadLocalStream(io.TextIOBase):
+    """按线程重定向的输出流：工作线程的 print 写入各自的缓冲区，其余线程写入原始流。"""
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    def capture(self) -> io.StringIO:
+        buffer = io.StringIO()
+        self._local.buffer = buffer
+        return buffer
+
+    def release(self):
+        self._local.buffer = None
+
+    def _target(self):
+        buffer = getattr(self._local, "buffer", None)
+        return buffer if buffer is not None else self._default
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        return self._target().write(s)
+
+    def flush(self):
+        self._target().flush()
+
+
+def run_command(parser, argv: List[str], stdout: _ThreadLocalStream, stderr: _ThreadLocalStream) -> Tuple[int, str, str]:
+    """在当前线程执行一条命令，返回 (退出码, stdout, stderr)。
+
+    调用前需要把 sys.stdout/sys.stderr 替换为对应的 `_ThreadLocalStream`。
+    """
+    from .swanlab_cli import LOCAL_COMMANDS, get_handler
+
+    captured_out, captured_err = stdout.capture(), stderr.capture()
+    code = 0
+    try:
+        command_args = parser.parse_args(argv)
+        handler = get_handler(command_args.command, getattr(command_args, "subcommand", None))
+        if handler is None or command_args.command in LOCAL_COMMANDS:
+            raise ValueError(f"Unsupported command: {shlex.join(argv)}")
+        handler(command_args)
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else int(e.code is not None)
+    except Exception as e:
+        code = 1
+        print(f"Error: {e}", file=sys.stderr)
+    finally:
+        stdout.release()
+        stderr.release()
+    return code, captured_out.getvalue(), captured_err.getvalue()
+
+
+def _parse_output(text: str):
+    """命令输出为 JSON 时解析为对象，否则保留原始文本。"""
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _read_inputs(source: str) -> list:
+    """读取输入：每行一条命令（与命令行参数相同，如 `runs config myproject/exp_1`），忽略空行和 # 注释。"""
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        lines = [line.strip() for line in stream]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return [(n, line) for n, line in enumerate(lines, 1) if line and not line.startswith("#")]
+
+
+def cmd_batch(args):
+    """从文件或 stdin 读取多条命令并发执行，按完成顺序输出 NDJSON。"""
+    from .swanlab_cli import build_parser
+    from .utils import get_api
+
+    inputs = _read_inputs(args.input)
+    if not inputs:
+        return
+
+    # 认证一次，之后所有命令共享同一个 Api
+    get_api()
+
+    parser = build_parser()
+    out, err = sys.stdout, sys.stderr
+    stdout, stderr = _ThreadLocalStream(out), _ThreadLocalStream(err)
+
+    def execute(line: str) -> dict:
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            return {"ok": False, "output": None, "error": f"Error: {e}"}
+        code, output, error = run_command(parser, argv, stdout, stderr)
+        result = {"ok": code == 0, "output": _parse_output(output)}
+        error = error.strip()
+        if error:
+            result["error"] = error
+        return result
+
+    sys.stdout, sys.stderr = stdout, stderr
+    failed = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            futures = {pool.submit(execute, line): (n, line) for n, line in inputs}
+            for future in as_completed(futures):
+                n, line = futures[future]
+                result = {"line": n, "input": line, **future.result()}
+                failed += not result["ok"]
+                out.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+                out.flush()
+    finally:
+        sys.stdout, sys.stderr = out, err
+
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,263 @@
+"""
+SwanLab API CLI - Daemon 命令模块
+
+可选的常驻后台进程：通过 Unix socket 接收命令，在进程内复用同一个 Api、
+已建立的连接和缓存。daemon 运行时，swanlab_cli 会把命令透明转发给它，
+每条命令只需一次 socket 往返，不再重复导入 swanlab/pandas 和认证。
+
+协议：每个连接发送一行 JSON 请求，daemon 返回一行 JSON 响应。
+    {"op": "run", "argv": [...], "cwd": "..."} -> {"code": 0, "stdout": "...", "stderr": "..."}
+    {"op": "status"} / {"op": "stop"}
+"""
+
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+DAEMON_DIR = Path.home() / ".swanlab"
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+START_TIMEOUT = 30
+CONNECT_TIMEOUT = 1
+
+# 会写文件的命令：在 daemon 中切换到客户端的工作目录执行，需要串行
+FILE_COMMANDS = {("runs", "metrics"), ("projects", "export")}
+
+
+def socket_path() -> Optional[Path]:
+    """当前凭证对应的 socket 路径；未配置 API Key 时返回 None。
+
+    不同 host / API Key 使用不同的 daemon，避免串用账号。
+    """
+    from .utils import credentials_fingerprint, get_credentials
+
+    host, api_key = get_credentials()
+    if not api_key:
+        return None
+    return DAEMON_DIR / f"cli-daemon-{credentials_fingerprint(host, api_key)}.sock"
+
+
+def _request(path: Path, payload: dict, timeout: Optional[float] = None) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(path))
+        # 连接成功后不限制等待时间，长时间运行的命令（如 export）也能完成
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("daemon closed the connection")
+    return json.loads(line)
+
+
+def forward(argv: List[str]) -> Optional[int]:
+    """把命令转发给运行中的 daemon 并输出结果，返回退出码；daemon 不可用时返回 None。"""
+    path = socket_path()
+    if path is None or not path.exists():
+        return None
+    try:
+        response = _request(path, {"op": "run", "argv": argv, "cwd": os.getcwd()})
+    except (ConnectionRefusedError, FileNotFoundError, socket.timeout):
+        # socket 文件残留但 daemon 已退出
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error: daemon request failed: {e}", file=sys.stderr)
+        return 1
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    return int(response.get("code", 1))
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path, parser, streams):
+        super().__init__(str(path), _DaemonHandler)
+        self.parser = parser
+        self.streams = streams
+        self.started_at = time.time()
+        self.last_active = time.time()
+        self.requests = 0
+        # 正在处理的请求数；有请求未完成时不会因空闲超时退出
+        self.in_flight = 0
+        self.state_lock = threading.Lock()
+        self.cwd_lock = threading.Lock()
+
+    def is_idle(self, timeout: float) -> bool:
+        with self.state_lock:
+            return not self.in_flight and time.time() - self.last_active > timeout
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        with server.state_lock:
+            server.in_flight += 1
+            server.last_active = time.time()
+        try:
+            self._respond(server, request)
+        finally:
+            with server.state_lock:
+                server.in_flight -= 1
+                server.last_active = time.time()
+
+    def _respond(self, server, request):
+        from .batch import run_command
+
+        op = request.get("op")
+        if op == "run":
+            argv = [str(arg) for arg in request.get("argv", [])]
+            stdout, stderr = server.streams
+            if tuple(argv[:2]) in FILE_COMMANDS:
+                # 相对输出路径以客户端的工作目录为准；chdir 是进程级的，这类命令串行执行
+                with server.cwd_lock:
+                    previous = os.getcwd()
+                    try:
+                        os.chdir(request.get("cwd") or previous)
+                        code, out, err = run_command(server.parser, argv, stdout, stderr)
+                    finally:
+                        os.chdir(previous)
+            else:
+                code, out, err = run_command(server.parser, argv, stdout, stderr)
+            server.requests += 1
+            response = {"code": code, "stdout": out, "stderr": err}
+        elif op == "status":
+            response = {
+                "pid": os.getpid(),
+                "socket": server.server_address,
+                "uptime": round(time.time() - server.started_at, 1),
+                "requests": server.requests,
+                "in_flight": server.in_flight,
+            }
+        elif op == "stop":
+            response = {"stopped": True}
+        else:
+            response = {"error": f"unknown op: {op}"}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+        if op == "stop":
+            # 先回复再退出；shutdown 会等待 serve_forever 返回，不能在处理线程中同步调用
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+
+def _require_socket_path() -> Path:
+    path = socket_path()
+    if path is None:
+        print("Error: SWANLAB_API_KEY not found.", file=sys.stderr)
+        sys.exit(1)
+    return path
+
+
+def _status(path: Path) -> Optional[dict]:
+    if not path.exists():
+        return None
+    try:
+        return _request(path, {"op": "status"}, timeout=CONNECT_TIMEOUT)
+    except (OSError, ValueError):
+        return None
+
+
+def cmd_daemon_serve(args):
+    """在前台运行 daemon（`daemon start` 在后台启动的就是这个命令）。"""
+    from .batch import _ThreadLocalStream
+    from .swanlab_cli import HANDLERS, build_parser, get_handler
+    from .utils import get_api
+
+    path = _require_socket_path()
+    if _status(path) is not None:
+        print(f"Error: daemon is already running on {path}", file=sys.stderr)
+        sys.exit(1)
+
+    # 预热：导入 swanlab、完成认证，并提前加载所有命令模块
+    get_api()
+    for command, subcommand in HANDLERS:
+        get_handler(command, subcommand)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    previous_umask = os.umask(0o177)
+    try:
+        server = _DaemonServer(path, build_parser(), (_ThreadLocalStream(sys.stdout), _ThreadLocalStream(sys.stderr)))
+    finally:
+        os.umask(previous_umask)
+
+    if args.idle_timeout > 0:
+
+        def watch_idle():
+            while True:
+                time.sleep(min(args.idle_timeout, 10))
+                if server.is_idle(args.idle_timeout):
+                    server.shutdown()
+                    return
+
+        threading.Thread(target=watch_idle, daemon=True).start()
+
+    sys.stdout, sys.stderr = server.streams
+    print(f"SwanLab CLI daemon listening on {path} (pid {os.getpid()})", file=sys.__stderr__, flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+
+
+def cmd_daemon_start(args):
+    """在后台启动 daemon，等待其就绪后输出状态。"""
+    path = _require_socket_path()
+    status = _status(path)
+    if status is None:
+        log_path = path.with_suffix(".log")
+        package_root = Path(__file__).resolve().parent.parent
+        with open(log_path, "ab") as log:
+            process = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    f"{__package__}.swanlab_cli",
+                    "daemon",
+                    "serve",
+                    "--idle-timeout",
+                    str(args.idle_timeout),
+                ],
+                cwd=package_root,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=log,
+                start_new_session=True,
+                env={**os.environ, "SWANLAB_CLI_NO_DAEMON": "1"},
+            )
+        deadline = time.time() + START_TIMEOUT
+        while status is None and time.time() < deadline and process.poll() is None:
+            time.sleep(0.1)
+            status = _status(path)
+        if status is None:
+            print(f"Error: daemon did not start, see {log_path}", file=sys.stderr)
+            sys.exit(1)
+    print(json.dumps(status, indent=2, ensure_ascii=False))
+
+
+def cmd_daemon_stop(args):
+    """停止 daemon。"""
+    path = _require_socket_path()
+    if _status(path) is None:
+        path.unlink(missing_ok=True)
+        print(json.dumps({"stopped": False, "reason": "not running"}))
+        return
+    print(json.dumps(_request(path, {"op": "stop"}, timeout=CONNECT_TIMEOUT)))
+
+
+def cmd_daemon_status(args):
+    """查看 daemon 状态。"""
+    status = _status(_require_socket_path())
+    print(json.dumps(status if status is not None else {"running": False}, indent=2, ensure_ascii=False))
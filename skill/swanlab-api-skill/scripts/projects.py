@@ -2,12 +2,19 @@
 SwanLab API CLI - Projects 命令模块
 """
 
+import itertools
 import json
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 
+import numpy as np
+import pandas as pd
 import swanlab
 
-from .utils import get_api, get_default_username
+from .utils import get_api, get_default_username, write_records
 
 
 def _resolve_project_path(api: swanlab.Api, path: str) -> str:
@@ -25,22 +32,21 @@ def cmd_projects_list(args):
 
     try:
         projects = api.projects(path=username, sort=args.sort, search=args.search, detail=args.detail)
-        result = []
-        for proj in projects:
-            result.append(
-                {
-                    "name": proj.name,
-                    "path": proj.path,
-                    "description": proj.description,
-                    "labels": proj.labels,
-                    "created_at": proj.created_at,
-                    "updated_at": proj.updated_at,
-                    "url": proj.url,
-                    "visibility": proj.visibility,
-                    "count": proj.count,
-                }
-            )
-        print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+        result = (
+            {
+                "name": proj.name,
+                "path": proj.path,
+                "description": proj.description,
+                "labels": proj.labels,
+                "created_at": proj.created_at,
+                "updated_at": proj.updated_at,
+                "url": proj.url,
+                "visibility": proj.visibility,
+                "count": proj.count,
+            }
+            for proj in projects
+        )
+        write_records(result, args.format)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -85,25 +91,221 @@ def cmd_projects_runs(args):
 
     try:
         runs = api.runs(path=path, filters=filters if filters else None)
-        result = []
-        for run in runs:
-            result.append(
+        result = (
+            {
+                "name": run.name,
+                "path": run.path,
+                "id": run.id,
+                "state": run.state,
+                "group": run.group,
+                "labels": run.labels,
+                "created_at": run.created_at,
+                "finished_at": run.finished_at,
+                "url": run.url,
+                "job_type": run.job_type,
+                "show": run.show,
+                "user": run.user,
+            }
+            for run in runs
+        )
+        write_records(result, args.format)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# 导出数据集结构（与 MCP 工具 swanlab_export_project 一致）：
+#   <output>/<username>/<project>/project.json
+#   <output>/<username>/<project>/runs.parquet
+#   <output>/<username>/<project>/metrics/run_id=<id>/part-0.parquet
+#   <output>/<username>/<project>/_manifest.json
+EXPORT_MANIFEST = "_manifest.json"
+# 非标量指标类型，导出时跳过
+MEDIA_COLUMN_TYPES = {"IMAGE", "AUDIO", "TEXT", "VIDEO", "OBJECT3D", "MOLECULE", "ECHARTS"}
+# 临时文件名序号，同一文件的并发写入各自使用不同的临时文件
+_tmp_counter = itertools.count()
+
+
+def _write_atomic(target: Path, write):
+    """先写临时文件再替换，中断时不会留下半个文件。"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.{next(_tmp_counter)}.tmp")
+    write(tmp)
+    os.replace(tmp, target)
+
+
+def _partition_path(root: Path, run_id: str) -> Path:
+    return root / "metrics" / f"run_id={run_id}" / "part-0.parquet"
+
+
+def _run_record(run) -> dict:
+    """run 字段 + config（展开为 config.* 列）+ metadata（JSON 字符串）。"""
+    profile = run.profile
+    return {
+        "id": run.id,
+        "name": run.name,
+        "path": run.path,
+        "description": run.description,
+        "state": run.state,
+        "group": run.group,
+        "labels": run.labels,
+        "created_at": run.created_at,
+        "finished_at": run.finished_at,
+        "url": run.url,
+        "job_type": run.job_type,
+        "user": run.user,
+        "config": getattr(profile, "config", None) or {},
+        "metadata": json.dumps(getattr(profile, "metadata", None) or {}, ensure_ascii=False, default=str),
+    }
+
+
+def _runs_frame(records: list) -> pd.DataFrame:
+    df = pd.json_normalize(records, sep=".")
+    # Parquet 列必须类型一致：混合类型或嵌套结构的列序列化为字符串
+    for column in df.select_dtypes(include="object").columns:
+        kinds = {type(v) for v in df[column] if v is not None and not (isinstance(v, float) and np.isnan(v))}
+        if len(kinds) > 1 or kinds & {dict}:
+            df[column] = df[column].map(
+                lambda v: v if v is None or isinstance(v, str) else json.dumps(v, ensure_ascii=False, default=str)
+            )
+    return df
+
+
+def _export_run(run, root: Path) -> dict:
+    """导出单个 run 的全部标量指标为长表：key, step, value, timestamp。"""
+    columns_resp, _ = run._client.get(f"/experiment/{run.id}/column", params={"all": True})
+    keys = [
+        col["key"]
+        for col in columns_resp.get("list", [])
+        if col.get("key") and not col.get("error") and str(col.get("type", "")).upper() not in MEDIA_COLUMN_TYPES
+    ]
+    frames = []
+    errors = {}
+    for key in keys:
+        try:
+            df = run.metrics(keys=[key])
+        except Exception as e:
+            errors[key] = str(e) or type(e).__name__
+            continue
+        if df.empty or key not in df.columns:
+            continue
+        steps = df["step"] if "step" in df.columns else df.index
+        ts_col = f"{key}_timestamp"
+        frames.append(
+            pd.DataFrame(
                 {
-                    "name": run.name,
-                    "path": run.path,
-                    "id": run.id,
-                    "state": run.state,
-                    "group": run.group,
-                    "labels": run.labels,
-                    "created_at": run.created_at,
-                    "finished_at": run.finished_at,
-                    "url": run.url,
-                    "job_type": run.job_type,
-                    "show": run.show,
-                    "user": run.user,
+                    "key": key,
+                    "step": pd.to_numeric(pd.Series(steps), errors="coerce").to_numpy(dtype=np.int64),
+                    "value": pd.to_numeric(df[key], errors="coerce").to_numpy(dtype=np.float64),
+                    "timestamp": (
+                        pd.to_numeric(df[ts_col], errors="coerce").to_numpy(dtype=np.float64)
+                        if ts_col in df.columns
+                        else np.full(len(df), np.nan)
+                    ),
                 }
             )
-        print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+        )
+    if frames:
+        long = pd.concat(frames, ignore_index=True)
+    else:
+        long = pd.DataFrame({"key": [], "step": [], "value": [], "timestamp": []}).astype(
+            {"step": np.int64, "value": np.float64, "timestamp": np.float64}
+        )
+    long["key"] = long["key"].astype("category")
+    _write_atomic(_partition_path(root, run.id), lambda tmp: long.to_parquet(tmp, index=False))
+    return {"state": run.state, "exported_at": time.time(), "rows": len(long), "keys": len(frames), "errors": errors}
+
+
+def cmd_projects_export(args):
+    """并发导出 project 为分区 Parquet 数据集，支持断点续传。"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("Error: Parquet export requires pyarrow: pip install pyarrow", file=sys.stderr)
+        sys.exit(1)
+
+    api = get_api()
+    path = _resolve_project_path(api, args.path)
+
+    filters = {}
+    if args.filter:
+        for f in args.filter:
+            if "=" in f:
+                key, value = f.split("=", 1)
+                filters[key] = value
+
+    root = Path(args.output).expanduser().joinpath(*path.split("/"))
+    manifest_path = root / EXPORT_MANIFEST
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        manifest = {}
+
+    def save_manifest():
+        _write_atomic(
+            manifest_path,
+            lambda tmp: tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8"),
+        )
+
+    try:
+        proj = api.project(path=path)
+        runs = list(api.runs(path=path, filters=filters if filters else None))
+        _write_atomic(
+            root / "project.json",
+            lambda tmp: tmp.write_text(
+                json.dumps(
+                    {"name": proj.name, "path": proj.path, "description": proj.description, "labels": proj.labels},
+                    ensure_ascii=False,
+                    default=str,
+                ),
+                encoding="utf-8",
+            ),
+        )
+        table = _runs_frame([_run_record(run) for run in runs])
+        _write_atomic(root / "runs.parquet", lambda tmp: table.to_parquet(tmp, index=False))
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+
+    # 已导出且已结束的 run 不会再变化，直接跳过
+    pending = []
+    skipped = []
+    for run in runs:
+        done = manifest.get(run.id)
+        # 有 key 获取失败的 run 视为未完成，下次导出时重新获取
+        complete = done and done.get("state") == "FINISHED" and not done.get("errors")
+        if complete and _partition_path(root, run.id).exists():
+            skipped.append(run.path)
+        else:
+            pending.append(run)
+
+    exported = []
+    errors = {}
+    rows = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {pool.submit(_export_run, run, root): run for run in pending}
+        for future in as_completed(futures):
+            run = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                errors[run.path] = str(e) or type(e).__name__
+                print(f"Failed: {run.path}: {errors[run.path]}", file=sys.stderr)
+                continue
+            # 每完成一个 run 立即写入 manifest，中断后可从这里继续
+            manifest[run.id] = entry
+            save_manifest()
+            exported.append(run.path)
+            rows += entry["rows"]
+            errors.update({f"{run.path}:{key}": message for key, message in entry["errors"].items()})
+            print(f"Exported: {run.path} ({entry['rows']} rows)", file=sys.stderr)
+
+    result = {
+        "output_dir": str(root),
+        "total": len(runs),
+        "exported": exported,
+        "skipped": skipped,
+        "rows": rows,
+        "errors": errors,
+    }
+    print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
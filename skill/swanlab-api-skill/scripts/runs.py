@@ -2,9 +2,12 @@
 SwanLab API CLI - Runs/Experiments 命令模块
 """
 
+import hashlib
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 import pandas as pd
 import swanlab
@@ -143,6 +146,147 @@ def cmd_runs_metric_keys(args):
         sys.exit(1)
 
 
+def _metric_json(df: pd.DataFrame, lines: bool = False, indent: int = 0) -> str:
+    """用 pandas 的 JSON 编码器整块序列化 index/data/timestamp 三列，不逐行构造字典；NaN 输出为 null。
+
+    浮点数保留 15 位有效数字（to_json 的上限），时间类型输出为 ISO 8601 字符串。
+    """
+    return df[["index", "data", "timestamp"]].to_json(
+        orient="records",
+        lines=lines,
+        indent=indent,
+        force_ascii=False,
+        double_precision=15,
+        date_format="iso",
+        default_handler=str,
+    )
+
+
+# 压缩方式 -> 文件后缀
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def _compressor(compression: str):
+    """返回 bytes -> bytes 的压缩函数；zstd 需要安装 zstandard。"""
+    if compression == "gzip":
+        import gzip
+
+        # mtime=0 保证相同数据生成相同字节，校验和可复现
+        return lambda data: gzip.compress(data, mtime=0)
+    if compression == "zstd":
+        import zstandard
+
+        # ZstdCompressor 不是线程安全的，每个分片单独创建
+        return lambda data: zstandard.ZstdCompressor().compress(data)
+    return lambda data: data
+
+
+def _chunk_entry(chunk: pd.DataFrame, file: str, offset: int, data: bytes) -> dict:
+    """生成 manifest 中单个分片的描述：位置、step 范围、行数和校验和。"""
+    return {
+        "file": file,
+        "offset": offset,
+        "bytes": len(data),
+        "rows": len(chunk),
+        "step_min": int(chunk["index"].min()),
+        "step_max": int(chunk["index"].max()),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def _save_metric_frame(
+    df: pd.DataFrame,
+    output_dir: str,
+    name: str,
+    output_format: str,
+    chunk_size: int,
+    compression: str = "none",
+    pretty: bool = False,
+    pool: Optional[ThreadPoolExecutor] = None,
+) -> list:
+    """按输出格式保存单个 key 的指标，并写入 `{name}.manifest.json` 索引，返回保存的文件路径列表。
+
+    manifest 记录每个分片的文件、字节偏移、step 范围、行数和 sha256，读取方可以直接定位到某个 step 窗口。
+    json 每个分片一个文件；ndjson 的每个分片是同一文件中独立的压缩帧，可按偏移单独解压；
+    parquet 使用自身的列压缩，按 chunk_size 划分 row group。
+    """
+    bounds = range(0, len(df), chunk_size)
+    chunks = [df[i : i + chunk_size] for i in bounds]
+    compress = _compressor(compression)
+    suffix = COMPRESSION_SUFFIXES[compression]
+    indent = 2 if pretty else 0
+    map_chunks = pool.map if pool is not None else map
+    saved_files = []
+
+    if output_format == "parquet":
+        file = f"{name}.parquet"
+        output_path = os.path.join(output_dir, file)
+        if df["data"].dtype == object:
+            # Parquet 列必须类型一致，含非数值的列整体保存为字符串
+            df = df.assign(data=df["data"].astype(str))
+        df.to_parquet(
+            output_path,
+            index=False,
+            compression=None if compression == "none" else compression,
+            row_group_size=chunk_size,
+        )
+        with open(output_path, "rb") as f:
+            entries = [_chunk_entry(df, file, 0, f.read())]
+        saved_files.append(output_path)
+    elif output_format == "ndjson":
+        file = f"{name}.ndjson{suffix}"
+        output_path = os.path.join(output_dir, file)
+
+        def encode_lines(chunk: pd.DataFrame) -> bytes:
+            lines = _metric_json(chunk, lines=True)
+            return compress((lines if lines.endswith("\n") else lines + "\n").encode("utf-8"))
+
+        # 分片并行编码压缩，按顺序拼接；gzip/zstd 均支持多帧拼接，整体仍可直接解压
+        entries, offset = [], 0
+        with open(output_path, "wb") as f:
+            for chunk, data in zip(chunks, map_chunks(encode_lines, chunks)):
+                f.write(data)
+                entries.append(_chunk_entry(chunk, file, offset, data))
+                offset += len(data)
+        saved_files.append(output_path)
+    else:
+        # 按 chunk_size 分片保存，不超过 chunk_size 时只有一个分片；各分片并行编码、压缩并写入
+        def write_chunk(item) -> dict:
+            chunk_idx, chunk = item
+            file = f"{name}-{chunk_idx}.json{suffix}"
+            records = _metric_json(chunk, indent=indent)
+            if pretty:
+                # 记录数组整体缩进一层，嵌入 metrics 字段；JSON 字符串中不含原始换行，可直接替换
+                payload = '{\n  "metrics": ' + records.replace("\n", "\n  ") + "\n}"
+            else:
+                payload = '{"metrics":' + records + "}"
+            data = compress(payload.encode("utf-8"))
+            with open(os.path.join(output_dir, file), "wb") as f:
+                f.write(data)
+            return _chunk_entry(chunk, file, 0, data)
+
+        entries = list(map_chunks(write_chunk, enumerate(chunks)))
+        saved_files.extend(os.path.join(output_dir, entry["file"]) for entry in entries)
+
+    manifest = {
+        "key": name,
+        "format": output_format,
+        "compression": compression,
+        "chunk_size": chunk_size,
+        "rows": len(df),
+        "step_min": int(df["index"].min()),
+        "step_max": int(df["index"].max()),
+        "chunks": entries,
+    }
+    manifest_path = os.path.join(output_dir, f"{name}.manifest.json")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    saved_files.append(manifest_path)
+    for output_path in saved_files:
+        print(f"Saved to: {output_path}")
+    return saved_files
+
+
 def cmd_runs_metrics(args):
     """获取 run 的 metrics 数据。"""
     api = get_api()
@@ -153,6 +297,19 @@ def cmd_runs_metrics(args):
 
     keys = [k.strip() for k in args.keys.split(",")] if args.keys else []
 
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("Error: Parquet output requires pyarrow: pip install pyarrow", file=sys.stderr)
+            sys.exit(1)
+    if args.compress == "zstd" and args.format != "parquet":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            print("Error: zstd compression requires zstandard: pip install zstandard", file=sys.stderr)
+            sys.exit(1)
+
     try:
         run = api.run(path=path)
         metrics_df = run.metrics(keys=keys, x_axis=args.x_axis, sample=args.sample)
@@ -197,63 +354,54 @@ def cmd_runs_metrics(args):
         os.makedirs(output_dir, exist_ok=True)
 
         saved_files = []
+        pool = ThreadPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
 
-        for key_name in metric_keys:
-            # 构建该 key 的数据列表
-            metrics_list = []
+        # index 使用 step 值，缺失时回退到行号
+        if index_col:
+            index_series = metrics_df[index_col].where(metrics_df[index_col].notna(), metrics_df.index.to_series())
+        else:
+            index_series = metrics_df.index.to_series()
 
+        for key_name in metric_keys:
             # 将 key_name 中的 / 替换为 _，避免路径问题
             safe_key_name = key_name.replace("/", "_")
 
-            # 获取对应的时间戳列名
-            ts_col = timestamp_map.get(key_name)
-
-            for idx, row in metrics_df.iterrows():
-                # index 使用行号或 step 值
-                index_val = int(row[index_col]) if index_col and not pd.isna(row[index_col]) else idx
-                data_val = row[key_name]
-
-                # 跳过 NaN 值
-                if pd.isna(data_val):
-                    continue
-
-                # 尝试转换为数值
-                try:
-                    data_val = float(data_val)
-                except (ValueError, TypeError):
-                    pass
-
-                # 获取时间戳（如果存在）
-                timestamp_val = None
-                if ts_col and not pd.isna(row[ts_col]):
-                    timestamp_val = row[ts_col]
-
-                metrics_list.append({"index": index_val, "data": data_val, "timestamp": timestamp_val})
-
-            if not metrics_list:
+            # 按列整体处理：跳过 NaN，批量转换为数值
+            raw = metrics_df[key_name]
+            mask = raw.notna().to_numpy()
+            if not mask.any():
                 continue
-
-            # 按 chunk_size 分片保存
-            chunk_size = args.chunk_size
-            if len(metrics_list) <= chunk_size:
-                # 单文件保存
-                output_data = {"metrics": metrics_list}
-                output_path = os.path.join(output_dir, f"{safe_key_name}-0.json")
-                with open(output_path, "w", encoding="utf-8") as f:
-                    json.dump(output_data, f, indent=2, ensure_ascii=False, default=str)
-                saved_files.append(output_path)
-                print(f"Saved to: {output_path}")
+            raw = raw[mask]
+            numeric = pd.to_numeric(raw, errors="coerce")
+            if numeric.notna().all():
+                data = numeric.astype("float64")
             else:
-                # 分片保存
-                for i in range(0, len(metrics_list), chunk_size):
-                    chunk = metrics_list[i : i + chunk_size]
-                    chunk_idx = i // chunk_size
-                    output_data = {"metrics": chunk}
-                    output_path = os.path.join(output_dir, f"{safe_key_name}-{chunk_idx}.json")
-                    with open(output_path, "w", encoding="utf-8") as f:
-                        json.dump(output_data, f, indent=2, ensure_ascii=False, default=str)
-                    saved_files.append(output_path)
-                    print(f"Saved to: {output_path}")
+                # 无法转换为数值的值保留原样
+                data = numeric.astype(object).where(numeric.notna(), raw)
+            indexes = index_series[mask].astype("int64")
+
+            # 获取对应的时间戳列（如果存在）
+            ts_col = timestamp_map.get(key_name)
+            timestamps = metrics_df[ts_col][mask] if ts_col else pd.Series(None, index=raw.index, dtype=object)
+
+            key_df = pd.DataFrame(
+                {"index": indexes.to_numpy(), "data": data.to_numpy(), "timestamp": timestamps.to_numpy()}
+            )
+            saved_files.extend(
+                _save_metric_frame(
+                    key_df,
+                    output_dir,
+                    safe_key_name,
+                    args.format,
+                    args.chunk_size,
+                    compression=args.compress,
+                    pretty=args.pretty,
+                    pool=pool,
+                )
+            )
+
+        if pool is not None:
+            pool.shutdown()
 
         if not saved_files:
             print("No metrics data to save.")
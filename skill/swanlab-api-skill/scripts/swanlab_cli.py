@@ -14,26 +14,21 @@ SwanLab API CLI Tool
 
 规则:
     - 未指定 username 时，自动获取 personal workspace 作为默认 path 前缀
-    - 只有 runs metrics 命令会保存 JSON 文件，其他命令只输出到控制台
+    - 只有 runs metrics 和 projects export 命令会保存文件，其他命令只输出到控制台
 """
 
 import argparse
+import importlib
+import os
 import sys
+from typing import Callable, Optional
 
-from .projects import cmd_projects_get, cmd_projects_list, cmd_projects_runs
-from .runs import (
-    cmd_runs_config,
-    cmd_runs_get,
-    cmd_runs_list,
-    cmd_runs_metadata,
-    cmd_runs_metric_keys,
-    cmd_runs_metrics,
-    cmd_runs_requirements,
-)
-from .workspaces import cmd_workspaces_get, cmd_workspaces_list, cmd_workspaces_projects
+from .batch import DEFAULT_BATCH_WORKERS
+from .daemon import DEFAULT_IDLE_TIMEOUT, forward
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行解析器（batch 模式复用同一个解析器解析每一行输入）。"""
     parser = argparse.ArgumentParser(
         description="SwanLab API CLI Tool",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -45,7 +40,7 @@ def main():
 规则:
   - 未指定 username 时，自动获取 personal workspace 作为默认
   - path 格式支持简写：project_name/exp_id 会自动补全 username
-  - 只有 runs metrics 命令会保存 JSON 文件，其他命令只输出到控制台
+  - 只有 runs metrics 和 projects export 命令会保存文件，其他命令只输出到控制台
 
 示例:
   # 列出所有 workspaces
@@ -59,6 +54,12 @@ def main():
 
   # 获取 metrics（保存到 .cache/metrics.json）
   python -m scripts.swanlab_cli runs metrics myproject/exp_123 "loss,accuracy" -o metrics
+
+  # 批量执行多条命令（共享一次认证，按完成顺序输出 NDJSON）
+  printf 'runs config myproject/exp_1\nruns config myproject/exp_2\n' | python -m scripts.swanlab_cli batch
+
+  # 导出整个 project 为 Parquet 数据集（中断后重新执行即可续传）
+  python -m scripts.swanlab_cli projects export myproject -o swanlab_export
         """,
     )
 
@@ -75,6 +76,9 @@ def main():
 
     ws_proj = workspaces_sub.add_parser("projects", help="获取 workspace 下的 projects")
     ws_proj.add_argument("username", nargs="?", help="Workspace username（可选，默认 personal）")
+    ws_proj.add_argument(
+        "--format", choices=["json", "ndjson"], default="json", help="输出格式：json（默认）或 ndjson（逐条流式输出）"
+    )
 
     # Projects commands
     projects_parser = subparsers.add_parser("projects", help="Project 相关操作")
@@ -85,6 +89,9 @@ def main():
     proj_list.add_argument("--sort", choices=["created_at", "updated_at"], help="排序方式")
     proj_list.add_argument("--search", help="搜索关键词")
     proj_list.add_argument("--detail", type=bool, default=True, help="是否返回详细信息")
+    proj_list.add_argument(
+        "--format", choices=["json", "ndjson"], default="json", help="输出格式：json（默认）或 ndjson（逐条流式输出）"
+    )
 
     proj_get = projects_sub.add_parser("get", help="获取指定 project 信息")
     proj_get.add_argument("path", help="Project path（如 username/project_name 或 project_name）")
@@ -92,6 +99,15 @@ def main():
     proj_runs = projects_sub.add_parser("runs", help="获取 project 下的 runs")
     proj_runs.add_argument("path", help="Project path（如 username/project_name 或 project_name）")
     proj_runs.add_argument("--filter", action="append", help="筛选条件，如 state=FINISHED")
+    proj_runs.add_argument(
+        "--format", choices=["json", "ndjson"], default="json", help="输出格式：json（默认）或 ndjson（逐条流式输出）"
+    )
+
+    proj_export = projects_sub.add_parser("export", help="并发导出 project 为分区 Parquet 数据集（支持断点续传）")
+    proj_export.add_argument("path", help="Project path（如 username/project_name 或 project_name）")
+    proj_export.add_argument("--filter", action="append", help="筛选条件，如 state=FINISHED")
+    proj_export.add_argument("-o", "--output", default="swanlab_export", help="导出根目录（默认: swanlab_export）")
+    proj_export.add_argument("--workers", type=int, default=4, help="并发导出的 run 数（默认: 4）")
 
     # Runs commands
     runs_parser = subparsers.add_parser("runs", help="Run/Experiment 相关操作")
@@ -100,6 +116,9 @@ def main():
     runs_list = runs_sub.add_parser("list", help="列出 runs")
     runs_list.add_argument("path", help="Project path（如 username/project_name 或 project_name）")
     runs_list.add_argument("--filter", action="append", help="筛选条件，如 state=FINISHED")
+    runs_list.add_argument(
+        "--format", choices=["json", "ndjson"], default="json", help="输出格式：json（默认）或 ndjson（逐条流式输出）"
+    )
 
     runs_get = runs_sub.add_parser("get", help="获取指定 run 信息")
     runs_get.add_argument("path", help="Run path（如 username/project_name/exp_id 或 project_name/exp_id）")
@@ -122,32 +141,101 @@ def main():
     runs_metrics.add_argument("--x-axis", default="step", help="X轴维度（默认: step）")
     runs_metrics.add_argument("--sample", type=int, help="采样数量")
     runs_metrics.add_argument("--chunk-size", type=int, default=8192, help="分片大小（默认: 8192）")
+    runs_metrics.add_argument(
+        "--format",
+        choices=["json", "ndjson", "parquet"],
+        default="json",
+        help="输出格式：json（分片 JSON，默认）、ndjson（每行一条记录）、parquet（需要 pyarrow）",
+    )
+    runs_metrics.add_argument(
+        "--compress",
+        choices=["none", "gzip", "zstd"],
+        default="none",
+        help="压缩方式（默认: none；zstd 需要 zstandard），parquet 使用列压缩",
+    )
+    runs_metrics.add_argument("--pretty", action="store_true", help="JSON 分片缩进输出（默认紧凑格式）")
+    runs_metrics.add_argument("--workers", type=int, default=4, help="并行写入分片的线程数（默认: 4）")
     runs_metrics.add_argument("-o", "--output", help="输出文件路径（不含扩展名，默认保存到 .cache/ 目录）")
 
+    # Batch command
+    batch_parser = subparsers.add_parser("batch", help="在同一进程中并发执行多条命令，按完成顺序输出 NDJSON")
+    batch_parser.add_argument("input", nargs="?", default="-", help="命令文件，每行一条命令（默认从 stdin 读取）")
+    batch_parser.add_argument(
+        "--workers", type=int, default=DEFAULT_BATCH_WORKERS, help=f"并发数（默认: {DEFAULT_BATCH_WORKERS}）"
+    )
+    batch_parser.set_defaults(subcommand=None)
+
+    # Daemon commands
+    daemon_parser = subparsers.add_parser("daemon", help="常驻后台进程：保持 Api、连接和缓存，其他命令自动转发")
+    daemon_sub = daemon_parser.add_subparsers(dest="subcommand")
+    for name, help_text in [("start", "在后台启动 daemon"), ("serve", "在前台运行 daemon")]:
+        daemon_cmd = daemon_sub.add_parser(name, help=help_text)
+        daemon_cmd.add_argument(
+            "--idle-timeout",
+            type=float,
+            default=DEFAULT_IDLE_TIMEOUT,
+            help=f"空闲多少秒后自动退出，0 表示不退出（默认: {DEFAULT_IDLE_TIMEOUT:g}）",
+        )
+    daemon_sub.add_parser("stop", help="停止 daemon")
+    daemon_sub.add_parser("status", help="查看 daemon 状态")
+
+    return parser
+
+
+# Route to appropriate handler
+# 处理函数按 "模块:函数名" 延迟导入，转发到 daemon 的命令不需要加载 swanlab 和 pandas
+HANDLERS = {
+    ("workspaces", "list"): "workspaces:cmd_workspaces_list",
+    ("workspaces", "get"): "workspaces:cmd_workspaces_get",
+    ("workspaces", "projects"): "workspaces:cmd_workspaces_projects",
+    ("projects", "list"): "projects:cmd_projects_list",
+    ("projects", "get"): "projects:cmd_projects_get",
+    ("projects", "runs"): "projects:cmd_projects_runs",
+    ("projects", "export"): "projects:cmd_projects_export",
+    ("runs", "list"): "runs:cmd_runs_list",
+    ("runs", "get"): "runs:cmd_runs_get",
+    ("runs", "config"): "runs:cmd_runs_config",
+    ("runs", "metadata"): "runs:cmd_runs_metadata",
+    ("runs", "requirements"): "runs:cmd_runs_requirements",
+    ("runs", "metric-keys"): "runs:cmd_runs_metric_keys",
+    ("runs", "metrics"): "runs:cmd_runs_metrics",
+    ("batch", None): "batch:cmd_batch",
+    ("daemon", "start"): "daemon:cmd_daemon_start",
+    ("daemon", "serve"): "daemon:cmd_daemon_serve",
+    ("daemon", "stop"): "daemon:cmd_daemon_stop",
+    ("daemon", "status"): "daemon:cmd_daemon_status",
+}
+
+# 不转发到 daemon 的命令：batch 读取本进程的 stdin，daemon 命令管理 daemon 本身
+LOCAL_COMMANDS = {"batch", "daemon"}
+
+
+def get_handler(command: str, subcommand: Optional[str]) -> Optional[Callable]:
+    """返回命令对应的处理函数，未知命令返回 None。"""
+    target = HANDLERS.get((command, subcommand))
+    if target is None:
+        return None
+    module, name = target.split(":")
+    return getattr(importlib.import_module(f".{module}", __package__), name)
+
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
-    # Route to appropriate handler
-    handlers = {
-        ("workspaces", "list"): cmd_workspaces_list,
-        ("workspaces", "get"): cmd_workspaces_get,
-        ("workspaces", "projects"): cmd_workspaces_projects,
-        ("projects", "list"): cmd_projects_list,
-        ("projects", "get"): cmd_projects_get,
-        ("projects", "runs"): cmd_projects_runs,
-        ("runs", "list"): cmd_runs_list,
-        ("runs", "get"): cmd_runs_get,
-        ("runs", "config"): cmd_runs_config,
-        ("runs", "metadata"): cmd_runs_metadata,
-        ("runs", "requirements"): cmd_runs_requirements,
-        ("runs", "metric-keys"): cmd_runs_metric_keys,
-        ("runs", "metrics"): cmd_runs_metrics,
-    }
-
-    handler = handlers.get((args.command, args.subcommand))
+    # daemon 运行时透明转发，失败（未启动或已退出）时在本进程执行
+    # ndjson 输出需要边获取边输出，daemon 的响应是一次性返回的，因此在本进程执行
+    forwardable = args.command not in LOCAL_COMMANDS and getattr(args, "format", None) != "ndjson"
+    if forwardable and not os.environ.get("SWANLAB_CLI_NO_DAEMON"):
+        code = forward(sys.argv[1:])
+        if code is not None:
+            sys.exit(code)
+
+    handler = get_handler(args.command, args.subcommand)
     if handler:
         handler(args)
     else:
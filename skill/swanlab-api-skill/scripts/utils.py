@@ -4,16 +4,31 @@ SwanLab API CLI 辅助函数模块
 提供 API 初始化、默认用户获取、文件保存等通用功能。
 """
 
+import hashlib
+import json
 import netrc
 import os
 import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Tuple
 
-import swanlab
+# swanlab 导入较慢，只在真正访问 API 时导入，转发到 daemon 的命令无需加载
+if TYPE_CHECKING:
+    import swanlab
 
 NETRC_PATH = Path.home() / ".swanlab" / "netrc"
 
+# 默认 workspace 缓存：按 host 和 API Key 指纹区分，过期时间可通过 SWANLAB_CLI_CACHE_TTL（秒）调整
+DEFAULT_USERNAME_CACHE_PATH = Path.home() / ".swanlab" / "cli_default_username.json"
+DEFAULT_USERNAME_CACHE_TTL = 24 * 60 * 60
+
+# 进程内缓存：cache key -> username
+_default_usernames = {}
+
+# 进程内共享的 Api 实例（batch 模式下所有命令复用同一次认证）
+_api = None
+
 
 def _get_api_key_from_netrc() -> Optional[str]:
     """从 ~/.swanlab/netrc 文件中读取 api_key。
@@ -42,22 +57,34 @@ def _get_api_key_from_netrc() -> Optional[str]:
         return None
 
 
-def get_api() -> swanlab.Api:
-    """初始化并返回 SwanLab API 客户端。
+def get_credentials() -> Tuple[str, Optional[str]]:
+    """返回 (host, api_key)，不访问网络。
 
     API Key 读取优先级：
     1. 环境变量 SWANLAB_API_KEY
     2. ~/.swanlab/netrc 文件中的 password 字段
     """
     host = os.environ.get("SWANLAB_HOST", "https://swanlab.cn")
+    return host, os.environ.get("SWANLAB_API_KEY") or _get_api_key_from_netrc()
 
-    # 1. 优先从环境变量读取
-    api_key = os.environ.get("SWANLAB_API_KEY")
 
-    # 2. 如果环境变量没有，尝试从 netrc 读取
-    if not api_key:
-        api_key = _get_api_key_from_netrc()
+def credentials_fingerprint(host: str, api_key: str) -> str:
+    """host + API Key 的指纹，用于区分缓存和 daemon（不暴露 API Key 本身）。"""
+    return hashlib.sha256(f"{host}#{api_key}".encode("utf-8")).hexdigest()[:16]
+
+
+def get_api() -> "swanlab.Api":
+    """初始化并返回 SwanLab API 客户端。
 
+    API Key 读取顺序见 `get_credentials`。同一进程内只认证一次，之后返回同一个实例。
+    """
+    global _api
+    if _api is not None:
+        return _api
+
+    import swanlab
+
+    host, api_key = get_credentials()
     if not api_key:
         print(
             "Error: SWANLAB_API_KEY not found.\n"
@@ -68,11 +95,46 @@ def get_api() -> swanlab.Api:
         )
         sys.exit(1)
 
-    return swanlab.Api(api_key=api_key, host=host)
+    _api = swanlab.Api(api_key=api_key, host=host)
+    return _api
+
+
+def _default_username_cache_key(api: "swanlab.Api") -> str:
+    """host + API Key 指纹（不保存 API Key 本身）。"""
+    login_info = api._login_info
+    fingerprint = hashlib.sha256(str(login_info.api_key).encode("utf-8")).hexdigest()[:16]
+    return f"{login_info.api_host}#{fingerprint}"
+
+
+def _default_username_cache_ttl() -> float:
+    try:
+        return float(os.environ.get("SWANLAB_CLI_CACHE_TTL", DEFAULT_USERNAME_CACHE_TTL))
+    except ValueError:
+        return DEFAULT_USERNAME_CACHE_TTL
+
+
+def _read_default_username_cache() -> dict:
+    try:
+        return json.loads(DEFAULT_USERNAME_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
 
 
-def get_default_username(api: swanlab.Api) -> str:
-    """获取默认的 personal workspace username。"""
+def _write_default_username_cache(key: str, username: str):
+    """写入磁盘缓存；失败（如目录只读）时忽略，不影响命令执行。"""
+    try:
+        entries = _read_default_username_cache()
+        entries[key] = {"username": username, "cached_at": time.time()}
+        DEFAULT_USERNAME_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = DEFAULT_USERNAME_CACHE_PATH.with_name(f".{DEFAULT_USERNAME_CACHE_PATH.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entries), encoding="utf-8")
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, DEFAULT_USERNAME_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def _fetch_default_username(api: "swanlab.Api") -> str:
     try:
         workspaces = api.workspaces()
         for ws in workspaces:
@@ -89,6 +151,43 @@ def get_default_username(api: swanlab.Api) -> str:
     sys.exit(1)
 
 
+def get_default_username(api: "swanlab.Api") -> str:
+    """获取默认的 personal workspace username。
+
+    查询顺序：进程内缓存 -> ~/.swanlab 下的磁盘缓存（未过期）-> api.workspaces()。
+    """
+    key = _default_username_cache_key(api)
+    username = _default_usernames.get(key)
+    if username:
+        return username
+
+    ttl = _default_username_cache_ttl()
+    entry = _read_default_username_cache().get(key) if ttl > 0 else None
+    if entry and entry.get("username") and time.time() - entry.get("cached_at", 0) < ttl:
+        username = entry["username"]
+    else:
+        username = _fetch_default_username(api)
+        if ttl > 0:
+            _write_default_username_cache(key, username)
+
+    _default_usernames[key] = username
+    return username
+
+
+def write_records(records, output_format: str = "json"):
+    """输出记录列表到 stdout。
+
+    json：收集全部记录后整体输出（缩进格式）；
+    ndjson：每得到一条记录立即输出一行，内存占用不随记录数增长，首条结果无需等待所有分页。
+    """
+    if output_format == "ndjson":
+        for record in records:
+            sys.stdout.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            sys.stdout.flush()
+    else:
+        print(json.dumps(list(records), indent=2, ensure_ascii=False, default=str))
+
+
 DEFAULT_OUTPUT_DIR = ".cache"
 
 
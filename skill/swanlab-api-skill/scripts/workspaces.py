@@ -8,7 +8,7 @@ from typing import Optional
 
 import swanlab
 
-from .utils import get_api, get_default_username
+from .utils import get_api, get_default_username, write_records
 
 
 def cmd_workspaces_list(args):
@@ -61,22 +61,21 @@ def cmd_workspaces_projects(args):
     try:
         ws = api.workspace(username=username)
         projects = ws.projects()
-        result = []
-        for proj in projects:
-            result.append(
-                {
-                    "name": proj.name,
-                    "path": proj.path,
-                    "description": proj.description,
-                    "labels": proj.labels,
-                    "created_at": proj.created_at,
-                    "updated_at": proj.updated_at,
-                    "url": proj.url,
-                    "visibility": proj.visibility,
-                    "count": proj.count,
-                }
-            )
-        print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+        result = (
+            {
+                "name": proj.name,
+                "path": proj.path,
+                "description": proj.description,
+                "labels": proj.labels,
+                "created_at": proj.created_at,
+                "updated_at": proj.updated_at,
+                "url": proj.url,
+                "visibility": proj.visibility,
+                "count": proj.count,
+            }
+            for proj in projects
+        )
+        write_records(result, args.format)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
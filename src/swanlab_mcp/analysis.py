@@ -0,0 +1,240 @@
+"""Metric series analysis.
+
+对完整分辨率的指标序列做向量化分析（异常检测、基于时间戳的吞吐量统计），
+只返回精简的事件和统计结果，而不是原始数据行。
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .series import normalize_series, timestamp_seconds
+
+DEFAULT_ANOMALY_WINDOW = 50
+DEFAULT_SPIKE_SIGMA = 6.0
+DEFAULT_PLATEAU_TOLERANCE = 0.01
+DEFAULT_DIVERGENCE_RATIO = 0.5
+DEFAULT_MAX_EVENTS_PER_KEY = 20
+
+DEFAULT_THROUGHPUT_POINTS = 50
+DEFAULT_STALL_FACTOR = 5.0
+# 近期吞吐量使用最后 1/N 的记录点
+RECENT_RATE_FRACTION = 10
+
+# 平台期比较的跨度（窗口数）：跨度过短时，缓慢但持续的变化也会被误判为平台期
+PLATEAU_SPAN_WINDOWS = 10
+
+# 相对变化的分母下限，避免指标值接近 0 时除零
+_EPS = 1e-12
+# 基线窗口的标准差不超过 |均值| 的该比例时视为常数段（如固定学习率），不做尖峰检测：
+# 此时任何微小变化或阶跃都会得到无穷大或极大的 z 分数
+SPIKE_MIN_RELATIVE_STD = 1e-6
+
+
+def _true_runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """Return `[start, stop)` index pairs of consecutive True values."""
+    padded = np.concatenate(([0], mask.astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+
+def _event(
+    key: str, kind: str, steps: np.ndarray, start: int, stop: int, value: float, score: Any = None
+) -> Dict[str, Any]:
+    return {
+        "key": key,
+        "kind": kind,
+        "step": int(steps[start]),
+        "end_step": int(steps[stop - 1]),
+        "value": float(value),
+        "score": None if score is None or not np.isfinite(score) else float(score),
+        "count": stop - start,
+    }
+
+
+def detect_anomalies(
+    df: pd.DataFrame,
+    key: str,
+    window: int = DEFAULT_ANOMALY_WINDOW,
+    sigma: float = DEFAULT_SPIKE_SIGMA,
+    plateau_tolerance: float = DEFAULT_PLATEAU_TOLERANCE,
+    divergence_ratio: float = DEFAULT_DIVERGENCE_RATIO,
+    max_events: int = DEFAULT_MAX_EVENTS_PER_KEY,
+    maximize: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Scan one metric series for training anomalies.
+
+    检测的事件类型：
+    - nan_onset / inf_onset: 第一次出现 NaN / ±Inf 的 step，count 为出现次数
+    - spike: 偏离前 `window` 个点滚动均值超过 `sigma` 倍滚动标准差的连续区间，score 为峰值 z-score
+    - plateau: 相隔 10 个窗口的滚动均值相对变化小于 `plateau_tolerance` 的连续区间，score 为区间内平均相对变化
+    - divergence: 滚动均值相对历史最优值的退步超过 `divergence_ratio` 且直到序列结束都未恢复的起点，
+      默认越低越好，`maximize` 时越高越好；退步按 max(|最优值|, 从起点到最优值的改善幅度) 归一化，
+      最优值为负数或接近 0 时同样适用；score 为结束时的相对退步
+
+    Args:
+        df: 单个 key 的序列，索引为 step
+        key: 要分析的值列
+        window: 滚动统计的窗口大小（点数）
+        sigma: 尖峰阈值（标准差倍数）
+        plateau_tolerance: 平台期阈值（相对变化）
+        divergence_ratio: 发散阈值（相对历史最优值的退步）
+        max_events: 每种事件最多返回的数量，尖峰保留 |z-score| 最大的，平台期保留最长的
+        maximize: 指标是否越高越好（如 acc、reward）
+
+    Returns:
+        按 step 排序的事件字典列表
+    """
+    df = normalize_series(df)
+    steps = df.index.to_numpy()
+    values = df[key].to_numpy(dtype=np.float64)
+    events: List[Dict[str, Any]] = []
+    if not len(values):
+        return events
+
+    nan_mask = np.isnan(values)
+    inf_mask = np.isinf(values)
+    for kind, mask in (("nan_onset", nan_mask), ("inf_onset", inf_mask)):
+        hits = np.flatnonzero(mask)
+        if len(hits):
+            event = _event(key, kind, steps, hits[0], hits[-1] + 1, values[hits[0]])
+            event["count"] = len(hits)
+            events.append(event)
+
+    # 其余检测只在有限值上进行，NaN/Inf 点直接跳过
+    finite_mask = ~(nan_mask | inf_mask)
+    steps = steps[finite_mask]
+    values = values[finite_mask]
+    if len(values) < 2:
+        events.sort(key=lambda e: e["step"])
+        return events
+    series = pd.Series(values)
+
+    # 尖峰：与前一个窗口（不含当前点）的均值和标准差比较
+    baseline = series.rolling(window, min_periods=max(2, window // 2))
+    mean = baseline.mean().shift(1).to_numpy()
+    std = baseline.std().shift(1).to_numpy()
+    flat = std <= SPIKE_MIN_RELATIVE_STD * np.maximum(np.abs(mean), _EPS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(flat, np.nan, (values - mean) / std)
+    spikes = []
+    for start, stop in _true_runs(np.abs(z) > sigma):
+        peak = start + int(np.nanargmax(np.abs(z[start:stop])))
+        spikes.append(_event(key, "spike", steps, start, stop, values[peak], z[peak]))
+    spikes.sort(key=lambda e: abs(e["score"]), reverse=True)
+    events.extend(spikes[:max_events])
+
+    # 平台期：相隔 span 个点的两个滚动均值几乎不变；间隔小于 span 的区间合并，只保留不短于 span 的区间
+    span = window * PLATEAU_SPAN_WINDOWS
+    rolling_mean = series.rolling(window).mean().to_numpy()
+    previous = np.full_like(rolling_mean, np.nan)
+    previous[span:] = rolling_mean[:-span]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = np.abs(rolling_mean - previous) / np.maximum(np.abs(previous), _EPS)
+    segments: List[Tuple[int, int]] = []
+    for start, stop in _true_runs(change < plateau_tolerance):
+        if segments and start - segments[-1][1] < span:
+            segments[-1] = (segments[-1][0], stop)
+        else:
+            segments.append((start, stop))
+    plateaus = [
+        _event(key, "plateau", steps, start, stop, rolling_mean[stop - 1], np.nanmean(change[start:stop]))
+        for start, stop in segments
+        if stop - start >= span
+    ]
+    plateaus.sort(key=lambda e: e["count"], reverse=True)
+    events.extend(plateaus[:max_events])
+
+    # 发散：滚动均值相对历史最优值持续退步，直到序列结束；越高越好的指标取反后按越低越好处理
+    smoothed = series.rolling(window, min_periods=1).mean().to_numpy()
+    if maximize:
+        smoothed = -smoothed
+    best = np.minimum.accumulate(smoothed)
+    scale = np.maximum(np.maximum(np.abs(best), smoothed[0] - best), _EPS)
+    regression = (smoothed - best) / scale
+    diverged = regression > divergence_ratio
+    if diverged[-1]:
+        recovered = np.flatnonzero(~diverged)
+        onset = int(recovered[-1]) + 1 if len(recovered) else 0
+        score = regression[-1]
+        events.append(_event(key, "divergence", steps, onset, len(values), values[onset], score))
+
+    events.sort(key=lambda e: e["step"])
+    return events
+
+
+def throughput_stats(
+    df: pd.DataFrame,
+    key: str,
+    points: int = DEFAULT_THROUGHPUT_POINTS,
+    stall_factor: float = DEFAULT_STALL_FACTOR,
+    max_stalls: int = DEFAULT_MAX_EVENTS_PER_KEY,
+) -> Dict[str, Any]:
+    """
+    Compute training throughput from the `<key>_timestamp` column of a series.
+
+    Args:
+        df: 单个 key 的序列，索引为 step，包含 `<key>_timestamp` 列
+        key: 指标名
+        points: 吞吐量曲线的时间分段数
+        stall_factor: 单步耗时超过中位数该倍数的记录间隔视为停顿
+        max_stalls: 最多返回的停顿数量，按时长保留最长的
+
+    Returns:
+        包含整体/近期吞吐量、按时间分段的 steps/sec 曲线和停顿列表的字典
+    """
+    df = normalize_series(df)
+    steps = df.index.to_numpy(dtype=np.float64)
+    times = timestamp_seconds(df[f"{key}_timestamp"].to_numpy())
+    keep = np.isfinite(times)
+    steps, times = steps[keep], times[keep]
+    stats: Dict[str, Any] = {"rate": [], "stalls": [], "stall_seconds": 0.0}
+    if len(steps) < 2:
+        return stats
+
+    start, end = float(times[0]), float(times[-1])
+    elapsed = end - start
+    stats.update(
+        first_step=int(steps[0]),
+        last_step=int(steps[-1]),
+        started_at=start,
+        last_logged_at=end,
+        elapsed_seconds=elapsed,
+        steps_per_second=(steps[-1] - steps[0]) / elapsed if elapsed > 0 else None,
+    )
+
+    # 近期吞吐量：最后 10% 的记录点（至少 2 个），用于估算剩余时间
+    tail = max(2, len(steps) // RECENT_RATE_FRACTION)
+    recent_elapsed = times[-1] - times[-tail]
+    stats["recent_steps_per_second"] = (steps[-1] - steps[-tail]) / recent_elapsed if recent_elapsed > 0 else None
+
+    # 吞吐量曲线：把时间等分为 points 段，用线性插值得到分段边界处的 step
+    if elapsed > 0:
+        edges = np.linspace(start, end, points + 1)
+        step_at_edges = np.interp(edges, times, steps)
+        rates = np.diff(step_at_edges) / np.diff(edges)
+        stats["rate"] = np.column_stack([edges[:-1] - start, rates]).tolist()
+
+    # 停顿：相邻两次记录之间的单步耗时远超中位数
+    dt = np.diff(times)
+    ds = np.diff(steps)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        seconds_per_step = dt / ds
+    typical = float(np.nanmedian(seconds_per_step[ds > 0])) if np.any(ds > 0) else 0.0
+    expected = typical * ds
+    stalled = np.flatnonzero((dt > stall_factor * expected) & (dt > 0) & (typical > 0))
+    stats["stall_seconds"] = float(np.sum(dt[stalled] - expected[stalled]))
+    longest = stalled[np.argsort(dt[stalled])[::-1][:max_stalls]]
+    stats["stalls"] = [
+        {
+            "step": int(steps[i]),
+            "end_step": int(steps[i + 1]),
+            "started_at": float(times[i] - start),
+            "duration_seconds": float(dt[i]),
+            "expected_seconds": float(expected[i]),
+        }
+        for i in np.sort(longest)
+    ]
+    return stats
@@ -0,0 +1,138 @@
+"""SwanLab API lifecycle management.
+
+在后台预热 SwanLab 后端：导入 SDK、完成认证、建立连接池并预取工作空间列表。
+离线模式下直接打开本地快照，不导入 SDK。
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from .backends import Backend, CachedBackend, create_backend
+from .cache import track_staleness
+from .config import SwanLabConfig
+from .constants import PREFETCH_CONCURRENCY, WARMUP_RETRY_SECONDS
+from .prefetch import Prefetcher
+
+logger = logging.getLogger(__name__)
+
+WARMUP_IDLE = "idle"
+WARMUP_WARMING = "warming"
+WARMUP_READY = "ready"
+WARMUP_FAILED = "failed"
+
+
+class LazyApi:
+    """Lazily constructed SwanLab backend shared by all tools.
+
+    服务启动后调用 `start()` 在后台完成预热；工具调用通过 `get()` 等待同一个预热任务，
+    不会重复导入、认证或建立连接。预热失败后的 `WARMUP_RETRY_SECONDS` 秒内调用直接返回同一个错误，
+    之后的调用重新预热；连续失败只在第一次记录错误日志。
+    """
+
+    def __init__(self, config: SwanLabConfig):
+        self.config = config
+        self._task: Optional[asyncio.Task] = None
+        self._backend: Optional[Backend] = None
+        self._error: Optional[BaseException] = None
+        self._failed_at = 0.0
+        self._failures = 0
+        self._workspaces: Optional[List[Dict[str, Any]]] = None
+        self._prefetcher = Prefetcher(config.prefetch_runs, PREFETCH_CONCURRENCY)
+
+    @property
+    def state(self) -> str:
+        """Current warm-up state: idle, warming, ready or failed."""
+        if self._task is None:
+            return WARMUP_IDLE
+        if not self._task.done():
+            return WARMUP_WARMING
+        return WARMUP_FAILED if self._error is not None else WARMUP_READY
+
+    def start(self) -> asyncio.Task:
+        """Start the warm-up task on the running event loop if it has not started yet or may be retried."""
+        if self._error is not None and time.monotonic() - self._failed_at >= WARMUP_RETRY_SECONDS:
+            self._task = None
+            self._error = None
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._warm_up())
+        return self._task
+
+    async def get(self) -> Backend:
+        """
+        Wait for the warm-up and return the shared backend.
+
+        同时开始记录当前请求中返回的过期数据，由 `JsonSerializer.tool_result` 标记在结果中。
+
+        Returns:
+            The ready backend instance
+
+        Raises:
+            RuntimeError: If the warm-up failed; a later call retries it once `WARMUP_RETRY_SECONDS` have passed.
+        """
+        track_staleness()
+        # 错误取自等待的那次预热，不受之后重新预热的影响
+        error = await asyncio.shield(self.start())
+        if error is not None:
+            raise RuntimeError(f"SwanLab API is unavailable: {error}") from error
+        assert self._backend is not None
+        return self._backend
+
+    def take_workspaces(self) -> Optional[List[Dict[str, Any]]]:
+        """Return the workspaces prefetched during warm-up once, then forget them.
+
+        预取结果只使用一次，之后的调用重新请求，避免返回过期数据。
+        """
+        workspaces, self._workspaces = self._workspaces, None
+        return workspaces
+
+    def prefetch_runs(self, paths: List[str]) -> None:
+        """Warm the caches of the first runs of a listing in the background.
+
+        需要开启预取（`PREFETCH_RUNS` 大于 0）和指标缓存，否则不做任何事。
+        """
+        if self.config.prefetch_runs > 0 and isinstance(self._backend, CachedBackend):
+            self._prefetcher.schedule(self._backend, paths)
+
+    def stats(self) -> Dict[str, Any]:
+        """Warm-up state and upstream request counters of the shared backend."""
+        stats: Dict[str, Any] = {"warmup": self.state, "backend": self._backend.name if self._backend else None}
+        if self._backend is not None:
+            stats.update(self._backend.stats())
+        return stats
+
+    async def aclose(self) -> None:
+        """Stop prefetching and close the backend connections if the warm-up succeeded."""
+        await self._prefetcher.aclose()
+        if self._backend is not None:
+            await self._backend.aclose()
+
+    async def _warm_up(self) -> Optional[BaseException]:
+        try:
+            api = None if self.config.offline_dir else await asyncio.to_thread(self._connect)
+            self._backend = create_backend(api, self.config)
+        except Exception as e:
+            if not self._failures:
+                logger.error("SwanLab API warm-up failed, retrying on later calls: %s", e)
+            else:
+                logger.debug("SwanLab API warm-up failed again (%d): %s", self._failures + 1, e)
+            self._failures += 1
+            self._failed_at = time.monotonic()
+            self._error = e
+            return e
+        if self._failures:
+            logger.info("SwanLab API warm-up succeeded after %d failures", self._failures)
+            self._failures = 0
+        try:
+            # 预取工作空间列表，同时建立到上游的连接
+            self._workspaces = await self._backend.workspaces()
+        except Exception as e:
+            # 预取失败不影响后端可用性，工具调用时会重新请求
+            logger.warning("SwanLab workspace prefetch failed: %s", e)
+        return None
+
+    def _connect(self) -> Any:
+        from swanlab import Api
+
+        return Api(api_key=self.config.api_key, host=self.config.host)
@@ -0,0 +1,71 @@
+"""SwanLab data backends."""
+
+import logging
+from typing import TYPE_CHECKING, Optional
+
+from ..config import SwanLabConfig
+from ..upstream import AdaptiveLimiter, Upstream
+from .base import Backend
+from .cached import CachedBackend
+from .sdk import SdkBackend
+
+if TYPE_CHECKING:
+    from swanlab import Api
+
+logger = logging.getLogger(__name__)
+
+
+def create_backend(api: Optional["Api"], config: SwanLabConfig) -> Backend:
+    """
+    Create the backend selected by the configuration.
+
+    配置了离线目录时从本地快照读取，不访问 SwanLab。
+    REST 后端依赖 httpx；不可用或初始化失败时回退到同步 SDK 后端。
+    在线后端的所有上游请求经过同一个 `Upstream` 策略：自适应限流（`UPSTREAM_RATE_LIMIT`、`MAX_CONNECTIONS`）、
+    暂时性错误重试（`UPSTREAM_RETRIES`）、按接口的熔断器和可选的请求对冲（`UPSTREAM_HEDGE_RATIO`）。
+    启用指标缓存时（`METRIC_CACHE_TTL` 大于 0），外层包装 `CachedBackend`，上游失败时返回过期数据（`STALE_TTL`）。
+
+    Args:
+        api: Authenticated SwanLab Api instance, None in offline mode
+        config: Server configuration
+
+    Returns:
+        Backend instance used by all tools
+    """
+    backend: Backend | None = None
+    upstream = Upstream(
+        AdaptiveLimiter(config.upstream_rate_limit, config.max_connections),
+        retries=config.upstream_retries,
+        failure_threshold=config.circuit_failure_threshold,
+        reset_timeout=config.circuit_reset_seconds,
+        hedge_ratio=config.hedge_ratio,
+    )
+    if config.offline_dir:
+        from .offline import OfflineBackend
+
+        backend = OfflineBackend(config.offline_dir)
+    elif config.backend == "rest":
+        try:
+            from .rest import RestBackend
+
+            backend = RestBackend.from_api(
+                api,
+                timeout=config.timeout,
+                max_connections=config.max_connections,
+                upstream=upstream,
+            )
+        except Exception as e:
+            logger.warning("REST backend unavailable, falling back to the SwanLab SDK: %s", e)
+    if backend is None:
+        backend = SdkBackend(api, max_connections=config.max_connections, upstream=upstream)
+    if config.metric_cache_ttl > 0:
+        backend = CachedBackend(
+            backend,
+            ttl=config.metric_cache_ttl,
+            max_bytes=config.metric_cache_mb * 1024 * 1024,
+            stale_ttl=config.stale_ttl,
+        )
+    return backend
+
+
+__all__ = ["Backend", "CachedBackend", "SdkBackend", "create_backend"]
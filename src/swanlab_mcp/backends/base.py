@@ -0,0 +1,100 @@
+"""Backend interface shared by all SwanLab data sources.
+
+工具层只依赖这里定义的异步接口；各后端负责把上游数据转换为与模型字段一致的普通字典。
+"""
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class Backend(ABC):
+    """Asynchronous access to SwanLab workspaces, projects, runs and metrics."""
+
+    name: str = ""
+
+    @abstractmethod
+    async def workspaces(self, username: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List workspaces of a user, defaulting to the current user."""
+
+    @abstractmethod
+    async def workspace(self, username: Optional[str] = None) -> Dict[str, Any]:
+        """Get one workspace, defaulting to the current user."""
+
+    @abstractmethod
+    async def projects(
+        self,
+        path: Optional[str] = None,
+        sort: Optional[str] = None,
+        search: Optional[str] = None,
+        detail: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """List projects in a workspace."""
+
+    @abstractmethod
+    async def project(self, path: str) -> Dict[str, Any]:
+        """Get one project by `username/project_name`."""
+
+    @abstractmethod
+    async def runs(self, path: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """List runs in a project by `username/project_name`."""
+
+    @abstractmethod
+    async def run(self, path: str) -> Dict[str, Any]:
+        """Get one run, including its profile, by `username/project_name/experiment_id`."""
+
+    @abstractmethod
+    async def metric_columns(self, path: str) -> List[Dict[str, Any]]:
+        """List the raw metric column entries (key/type/class/error) of a run."""
+
+    @abstractmethod
+    async def metric_series(self, path: str, key: str) -> "pd.DataFrame":
+        """Fetch the full series of one metric key as a DataFrame indexed by step.
+
+        返回的列为 `<key>` 和 `<key>_timestamp`。
+        """
+
+    @abstractmethod
+    async def metric_summary(self, path: str) -> Dict[str, Dict[str, Any]]:
+        """Get the latest step/value and the min/max of every metric key of a run in one request.
+
+        返回 `{key: {"step", "value", "min": {"step", "value"}, "max": {"step", "value"}}}`。
+        """
+
+    def invalidate(self, path: str) -> None:
+        """Drop locally cached data of a run after it has changed upstream."""
+
+    def forget_run(self, path: str) -> None:
+        """Drop cached details of a run so the next `run()` reads its current state."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and limits of upstream requests, keyed by component."""
+        return {}
+
+    async def aclose(self) -> None:
+        """Release network resources held by the backend."""
+
+
+def summary_request(run: Dict[str, Any], project_id: str) -> List[Dict[str, Any]]:
+    """Build the `/house/metrics/summaries` request body for a raw run, following clones to their root run."""
+    body = {"experimentId": run.get("cuid", ""), "projectId": project_id}
+    if run.get("rootExpId") and run.get("rootProId"):
+        body["rootExpId"] = run["rootExpId"]
+        body["rootProId"] = run["rootProId"]
+    return [body]
+
+
+def parse_summary(resp: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Convert a `/house/metrics/summaries` response to the format returned by `Backend.metric_summary`."""
+    summaries = next(iter(resp.values()), None) if resp else None
+
+    def point(raw: Any) -> Dict[str, Any]:
+        raw = raw or {}
+        return {"step": raw.get("index"), "value": raw.get("data")}
+
+    return {
+        key: {"step": v.get("step"), "value": v.get("value"), "min": point(v.get("min")), "max": point(v.get("max"))}
+        for key, v in (summaries or {}).items()
+    }
@@ -0,0 +1,150 @@
+"""Backend wrapper caching run and metric data.
+
+指标序列在完整拉取一次后缓存在内存中，之后的窗口查询、不同 x 轴或采样参数都直接复用，
+不再重新下载整个实验。实验详情和指标列列表也按相同的过期时间缓存。
+工作空间、项目、实验列表和指标概要每次都请求上游，只保留最近一次结果；
+上游暂时不可用（重试用尽或熔断器打开）时，所有数据在 `stale_ttl` 内以过期数据返回。
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from ..cache import TTLCache
+from ..series import normalize_series
+from ..upstream import CircuitOpenError, is_transient
+from .base import Backend
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 指标列列表、实验详情的最大缓存条目数
+METRIC_COLUMNS_CACHE_ENTRIES = 1024
+RUN_CACHE_ENTRIES = 1024
+# 仅用于失败时返回过期数据的列表、概要类结果的最大条目数
+LISTING_CACHE_ENTRIES = 1024
+
+
+def _frame_bytes(df: "pd.DataFrame") -> int:
+    return int(df.memory_usage(index=True, deep=False).sum())
+
+
+def _serve_stale(error: BaseException) -> bool:
+    # 只有上游暂时不可用时才返回过期数据；404 等错误说明数据本身已变化
+    return isinstance(error, CircuitOpenError) or (isinstance(error, Exception) and is_transient(error))
+
+
+class CachedBackend(Backend):
+    """Backend that caches run details, metric columns and full metric series of another backend.
+
+    同时统计正在进行的上游请求数，后台预取通过 `wait_idle()` 让位于实时请求。
+    """
+
+    def __init__(self, inner: Backend, ttl: float, max_bytes: int, stale_ttl: float = 0):
+        self.inner = inner
+        self.name = inner.name
+        self.series = TTLCache(ttl, max_bytes, sizeof=_frame_bytes, stale_ttl=stale_ttl)
+        self.columns = TTLCache(ttl, METRIC_COLUMNS_CACHE_ENTRIES, stale_ttl=stale_ttl)
+        self.run_details = TTLCache(ttl, RUN_CACHE_ENTRIES, stale_ttl=stale_ttl)
+        # 过期时间为 0：每次都重新请求，只在失败时使用
+        self.listings = TTLCache(0, LISTING_CACHE_ENTRIES, stale_ttl=stale_ttl)
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @asynccontextmanager
+    async def _track(self) -> AsyncIterator[None]:
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._idle.set()
+
+    async def wait_idle(self) -> None:
+        """Wait until no upstream request is in flight."""
+        await self._idle.wait()
+
+    async def _load(self, cache: TTLCache, key: Any, load: Callable[[], Awaitable[Any]]) -> Any:
+        async def tracked() -> Any:
+            async with self._track():
+                return await load()
+
+        if cache.ttl <= 0 and cache.stale_ttl <= 0:
+            return await tracked()
+        stale_ok = _serve_stale if cache.stale_ttl > 0 else None
+        return await cache.get_or_load(key, tracked, serve_stale=stale_ok)
+
+    async def workspaces(self, username: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await self._load(self.listings, ("workspaces", username), lambda: self.inner.workspaces(username))
+
+    async def workspace(self, username: Optional[str] = None) -> Dict[str, Any]:
+        return await self._load(self.listings, ("workspace", username), lambda: self.inner.workspace(username))
+
+    async def projects(
+        self,
+        path: Optional[str] = None,
+        sort: Optional[str] = None,
+        search: Optional[str] = None,
+        detail: bool = True,
+    ) -> List[Dict[str, Any]]:
+        return await self._load(
+            self.listings,
+            ("projects", path, sort, search, detail),
+            lambda: self.inner.projects(path, sort=sort, search=search, detail=detail),
+        )
+
+    async def project(self, path: str) -> Dict[str, Any]:
+        return await self._load(self.listings, ("project", path), lambda: self.inner.project(path))
+
+    async def runs(self, path: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        async def load() -> List[Dict[str, Any]]:
+            runs = await self.inner.runs(path, filters)
+            # 列表中已包含完整的实验详情，顺带写入缓存（过期的列表不写入）
+            for run in runs:
+                if run.get("path") and run.get("profile") is not None:
+                    self.run_details.put(run["path"], run)
+            return runs
+
+        return await self._load(self.listings, ("runs", path, json.dumps(filters, sort_keys=True, default=str)), load)
+
+    async def run(self, path: str) -> Dict[str, Any]:
+        return await self._load(self.run_details, path, lambda: self.inner.run(path))
+
+    async def metric_columns(self, path: str) -> List[Dict[str, Any]]:
+        return await self._load(self.columns, path, lambda: self.inner.metric_columns(path))
+
+    async def metric_series(self, path: str, key: str) -> "pd.DataFrame":
+        async def load() -> "pd.DataFrame":
+            # 缓存前整理为有序且唯一的 step 索引，窗口查询可直接二分切片
+            return normalize_series(await self.inner.metric_series(path, key))
+
+        return await self._load(self.series, (path, key), load)
+
+    async def metric_summary(self, path: str) -> Dict[str, Dict[str, Any]]:
+        return await self._load(self.listings, ("summary", path), lambda: self.inner.metric_summary(path))
+
+    def invalidate(self, path: str) -> None:
+        self.run_details.discard(path)
+        self.columns.discard(path)
+        self.series.discard_where(lambda key: key[0] == path)
+        self.listings.discard(("summary", path))
+        self.inner.invalidate(path)
+
+    def forget_run(self, path: str) -> None:
+        self.run_details.discard(path)
+        self.inner.forget_run(path)
+
+    def stats(self) -> Dict[str, Any]:
+        caches = (self.series, self.columns, self.run_details, self.listings)
+        return {**self.inner.stats(), "stale_served": sum(cache.stale_served for cache in caches)}
+
+    async def aclose(self) -> None:
+        self.series.clear()
+        self.columns.clear()
+        self.run_details.clear()
+        self.listings.clear()
+        await self.inner.aclose()
@@ -0,0 +1,234 @@
+"""Backend serving a local project snapshot without network access.
+
+读取 `swanlab_export_project` / skill CLI `projects export` 导出的 Parquet 数据集，
+所有工具返回与在线后端相同结构的数据，用于离线分析、复现和基准测试。
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..export import PROJECT_FILE, RUNS_FILE, partition_path, require_parquet
+from ..utils import resolve_inside
+from .base import Backend
+
+# 特殊筛选条件：用户侧 key -> 快照中的字段，与 REST 后端的映射保持一致
+SPECIAL_RUN_FILTERS = {"group": "group", "tags": "labels", "name": "name", "username": "user", "job_type": "job_type"}
+
+
+def _plain(value: Any) -> Any:
+    # Parquet 读回的列表为 ndarray、缺失值为 NaN，还原为普通 Python 值
+    if isinstance(value, np.ndarray):
+        return [_plain(v) for v in value.tolist()]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def _nest(flat: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild a nested dict from `a.b.c` keys produced by `pandas.json_normalize`."""
+    nested: Dict[str, Any] = {}
+    for name, value in flat.items():
+        node = nested
+        *parents, leaf = name.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    return nested
+
+
+def _run_dict(record: Dict[str, Any]) -> Dict[str, Any]:
+    fields = {name: _plain(value) for name, value in record.items()}
+    config = {name[len("config.") :]: v for name, v in fields.items() if name.startswith("config.") and v is not None}
+    user = {name[len("user.") :]: v for name, v in fields.items() if name.startswith("user.")}
+    run = {name: v for name, v in fields.items() if not name.startswith(("config.", "user.")) and name != "metadata"}
+    try:
+        metadata = json.loads(fields.get("metadata") or "{}")
+    except ValueError:
+        metadata = {}
+    run["user"] = {"username": user.get("username") or "", "is_self": bool(user.get("is_self"))}
+    run["profile"] = {"config": _nest(config), "metadata": metadata, "requirements": "", "conda": ""}
+    return run
+
+
+def _matches(run: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    for key, expected in filters.items():
+        if key in SPECIAL_RUN_FILTERS:
+            actual = run.get(SPECIAL_RUN_FILTERS[key])
+            if key == "username":
+                actual = (actual or {}).get("username")
+            if key == "tags":
+                wanted = expected if isinstance(expected, (list, tuple)) else [expected]
+                if not set(map(str, wanted)) & set(map(str, actual or [])):
+                    return False
+                continue
+        elif key.startswith("config."):
+            actual = run["profile"]["config"]
+            for part in key.split(".")[1:]:
+                actual = actual.get(part) if isinstance(actual, dict) else None
+        else:
+            actual = run.get(key)
+        if actual is None or str(actual) != str(expected):
+            return False
+    return True
+
+
+class OfflineBackend(Backend):
+    """Backend reading workspaces, projects, runs and metrics from an exported snapshot directory.
+
+    目录结构为 `<root>/<username>/<project>/`；工作空间和项目由目录推断。
+    快照按文件修改时间缓存，导出任务更新快照后自动重新读取。
+    """
+
+    name = "offline"
+
+    def __init__(self, root: str):
+        require_parquet()
+        self.root = Path(root).expanduser()
+        if not self.root.is_dir():
+            raise FileNotFoundError(f"Offline snapshot directory not found: {self.root}")
+        self._runs: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
+    def _snapshot_dir(self, path: str) -> Path:
+        """Directory of a `username[/project]` path, rejecting paths that would leave the snapshot root."""
+        return resolve_inside(self.root, path)
+
+    def _project_root(self, path: str) -> Path:
+        root = self._snapshot_dir(path)
+        if not (root / RUNS_FILE).exists():
+            raise FileNotFoundError(f"Project '{path}' is not in the offline snapshot {self.root}")
+        return root
+
+    def _usernames(self) -> List[str]:
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+    def _workspace_dict(self, username: str) -> Dict[str, Any]:
+        return {"username": username, "name": username, "workspace_type": "", "role": "", "profile": {}, "comment": None}
+
+    def _project_dict(self, path: str) -> Dict[str, Any]:
+        root = self._project_root(path)
+        try:
+            project = json.loads((root / PROJECT_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            project = {}
+        return {**project, "name": project.get("name") or root.name, "path": path}
+
+    def _load_runs(self, path: str) -> List[Dict[str, Any]]:
+        runs_file = self._project_root(path) / RUNS_FILE
+        mtime = runs_file.stat().st_mtime
+        cached = self._runs.get(path)
+        if cached is None or cached[0] != mtime:
+            records = pd.read_parquet(runs_file).to_dict("records")
+            cached = self._runs[path] = (mtime, [_run_dict(record) for record in records])
+        return cached[1]
+
+    def _find_run(self, path: str) -> Dict[str, Any]:
+        project_path, experiment_id = path.rsplit("/", 1)
+        for run in self._load_runs(project_path):
+            if run.get("id") == experiment_id:
+                return run
+        raise FileNotFoundError(f"Run '{path}' is not in the offline snapshot {self.root}")
+
+    def _metrics(self, path: str, key: Optional[str] = None) -> pd.DataFrame:
+        run = self._find_run(path)
+        target = partition_path(self._project_root(path.rsplit("/", 1)[0]), run["id"])
+        if not target.exists():
+            raise FileNotFoundError(f"Metrics of run '{path}' are not in the offline snapshot {self.root}")
+        filters = [("key", "==", key)] if key is not None else None
+        return pd.read_parquet(target, filters=filters)
+
+    async def workspaces(self, username: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [self._workspace_dict(name) for name in await asyncio.to_thread(self._usernames)]
+
+    async def workspace(self, username: Optional[str] = None) -> Dict[str, Any]:
+        usernames = await asyncio.to_thread(self._usernames)
+        if username is None and usernames:
+            username = usernames[0]
+        if username not in usernames:
+            raise FileNotFoundError(f"Workspace '{username}' is not in the offline snapshot {self.root}")
+        return self._workspace_dict(username)
+
+    async def projects(
+        self,
+        path: Optional[str] = None,
+        sort: Optional[str] = None,
+        search: Optional[str] = None,
+        detail: bool = True,
+    ) -> List[Dict[str, Any]]:
+        def load() -> List[Dict[str, Any]]:
+            usernames = [path] if path else self._usernames()
+            paths = sorted(
+                f"{username}/{p.name}"
+                for username in usernames
+                for p in self._snapshot_dir(username).glob("*")
+                if (p / RUNS_FILE).exists()
+            )
+            projects = [self._project_dict(project_path) for project_path in paths]
+            if search:
+                projects = [p for p in projects if search.lower() in str(p.get("name", "")).lower()]
+            if sort:
+                projects.sort(key=lambda p: str(p.get(sort) or ""), reverse=True)
+            return projects
+
+        return await asyncio.to_thread(load)
+
+    async def project(self, path: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._project_dict, path)
+
+    async def runs(self, path: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        runs = await asyncio.to_thread(self._load_runs, path)
+        return [run for run in runs if _matches(run, filters or {})]
+
+    async def run(self, path: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._find_run, path)
+
+    async def metric_columns(self, path: str) -> List[Dict[str, Any]]:
+        def load() -> List[Dict[str, Any]]:
+            keys = self._metrics(path)["key"].unique()
+            return [{"key": str(key), "type": "FLOAT", "class": "CUSTOM", "error": None} for key in keys]
+
+        return await asyncio.to_thread(load)
+
+    async def metric_series(self, path: str, key: str) -> pd.DataFrame:
+        def load() -> pd.DataFrame:
+            long = self._metrics(path, key)
+            if long.empty:
+                raise KeyError(f"Metric '{key}' is not in the offline snapshot of run '{path}'")
+            return pd.DataFrame(
+                {key: long["value"].to_numpy(), f"{key}_timestamp": long["timestamp"].to_numpy()},
+                index=pd.Index(long["step"].to_numpy(), name="step"),
+            )
+
+        return await asyncio.to_thread(load)
+
+    async def metric_summary(self, path: str) -> Dict[str, Dict[str, Any]]:
+        def load() -> Dict[str, Dict[str, Any]]:
+            long = self._metrics(path).dropna(subset=["value"])
+            summary: Dict[str, Dict[str, Any]] = {}
+            for key, group in long.groupby("key", observed=True, sort=False):
+                values = group["value"].to_numpy()
+                steps = group["step"].to_numpy()
+                finite = np.flatnonzero(np.isfinite(values))
+
+                def point(index: Optional[int]) -> Dict[str, Any]:
+                    if index is None:
+                        return {"step": None, "value": None}
+                    return {"step": int(steps[index]), "value": float(values[index])}
+
+                summary[str(key)] = {
+                    **point(int(np.argmax(steps))),
+                    "min": point(int(finite[np.argmin(values[finite])]) if finite.size else None),
+                    "max": point(int(finite[np.argmax(values[finite])]) if finite.size else None),
+                }
+            return summary
+
+        return await asyncio.to_thread(load)
+
+    def invalidate(self, path: str) -> None:
+        self._runs.pop(path.rsplit("/", 1)[0], None)
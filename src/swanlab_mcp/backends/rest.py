@@ -0,0 +1,381 @@
+"""Backend talking to the SwanLab REST API with an asyncio HTTP client.
+
+使用 httpx.AsyncClient（安装 h2 时启用 HTTP/2）直接请求工具用到的接口，
+单线程即可并发处理大量上游请求。认证复用 SDK 的登录结果，与 SDK Client 一样在 sid 临近过期时
+用 API key 重新登录；请求返回 401 时也会重新登录并重试一次。
+"""
+
+import asyncio
+import importlib.util
+import io
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+import httpx
+import pandas as pd
+
+from ..constants import SID_REFRESH_SECONDS
+from ..upstream import AdaptiveLimiter, Upstream
+from .base import Backend, parse_summary, summary_request
+
+if TYPE_CHECKING:
+    from swanlab import Api
+    from swanlab.core_python.auth import LoginInfo
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# SDK 使用的分页大小
+PROJECT_PAGE_SIZE = 20
+
+# 特殊筛选条件：用户侧 key -> 后端 key 和操作符，与 SDK 保持一致
+SPECIAL_RUN_FILTERS = {
+    "group": ("cluster", "EQ"),
+    "tags": ("labels", "IN"),
+    "name": ("name", "EQ"),
+    "username": ("user.username", "EQ"),
+    "job_type": ("job", "EQ"),
+}
+
+
+# 接口路径中的固定段；其余段（用户名、项目名、实验 id）替换为 *，同一接口共享一个熔断器
+API_PATH_SEGMENTS = {
+    "user",
+    "groups",
+    "group",
+    "project",
+    "runs",
+    "shows",
+    "experiment",
+    "column",
+    "csv",
+    "house",
+    "metrics",
+    "summaries",
+}
+# 预签名的指标 CSV 下载地址
+DOWNLOAD_ENDPOINT = "GET <metric csv>"
+
+
+def _endpoint(method: str, url: str) -> str:
+    """Endpoint name of a request URL, e.g. `GET /project/*/*/runs/*`."""
+    return f"{method} /" + "/".join(part if part in API_PATH_SEGMENTS else "*" for part in url.strip("/").split("/"))
+
+
+def _sid_expiry(expired_at: Optional[str]) -> Optional[float]:
+    """Parse the `expiredAt` of a login response to a unix timestamp, None if absent or malformed."""
+    if not expired_at:
+        return None
+    try:
+        return datetime.strptime(expired_at, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+
+def _to_camel_case(name: str) -> str:
+    return "".join(w.capitalize() if i > 0 else w for i, w in enumerate(name.split("_")))
+
+
+def _column_type(key: str) -> str:
+    prefix = key.split(".", 1)[0]
+    if prefix == "summary":
+        return "SCALAR"
+    if prefix == "config":
+        return "CONFIG"
+    return "STABLE"
+
+
+def _run_filters(filters: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Translate user filters to the request body format expected by `/runs/shows`."""
+    parsed: List[Dict[str, Any]] = []
+    for key, value in (filters or {}).items():
+        if key in SPECIAL_RUN_FILTERS:
+            backend_key, op = SPECIAL_RUN_FILTERS[key]
+            values = list(value) if key == "tags" and isinstance(value, (list, tuple)) else [value]
+            parsed.append({"key": backend_key, "active": True, "value": values, "op": op, "type": "STABLE"})
+        else:
+            column_type = _column_type(key)
+            parsed.append(
+                {
+                    "key": _to_camel_case(key) if column_type == "STABLE" else key.split(".", 1)[-1],
+                    "active": True,
+                    "value": [value],
+                    "op": "EQ",
+                    "type": column_type,
+                }
+            )
+    return parsed
+
+
+def _flatten_runs(runs: Any) -> List[Dict[str, Any]]:
+    """Flatten grouped run listings (nested dicts of lists) into a single list."""
+    if isinstance(runs, list):
+        return runs
+    flat: List[Dict[str, Any]] = []
+    for group in runs.values():
+        flat.extend(_flatten_runs(group))
+    return flat
+
+
+def _clean_config_field(value: Any) -> Any:
+    """Unwrap `{'desc', 'sort', 'value'}` config entries the same way the SDK does."""
+    if isinstance(value, dict):
+        if "value" in value:
+            return _clean_config_field(value["value"])
+        return {k: _clean_config_field(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clean_config_field(item) for item in value]
+    return value
+
+
+def _label_names(labels: Any) -> List[str]:
+    return [label["name"] for label in labels or []]
+
+
+class RestBackend(Backend):
+    """Backend issuing REST requests through a pooled `httpx.AsyncClient`."""
+
+    name = "rest"
+
+    def __init__(
+        self,
+        *,
+        api_host: str,
+        web_host: str,
+        sid: str,
+        username: str,
+        timeout: float,
+        max_connections: int,
+        upstream: Optional[Upstream] = None,
+        sid_expires_at: Optional[float] = None,
+        login: Optional[Callable[[], "LoginInfo"]] = None,
+    ):
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.client = httpx.AsyncClient(
+            base_url=api_host,
+            headers={"cookie": f"sid={sid}"},
+            timeout=timeout,
+            limits=limits,
+            http2=HTTP2_AVAILABLE,
+        )
+        # 指标 CSV 为预签名地址，使用不携带凭证的独立客户端下载
+        self.files = httpx.AsyncClient(timeout=timeout, limits=limits, http2=HTTP2_AVAILABLE, follow_redirects=True)
+        self.web_host = web_host
+        self.username = username
+        # 所有上游请求共享的限流、重试和熔断策略
+        self.upstream = upstream or Upstream(AdaptiveLimiter(0, max_connections))
+        self._run_ids: Dict[str, str] = {}
+        self._summary_requests: Dict[str, List[Dict[str, Any]]] = {}
+        # 重新登录：同步的 SDK 登录函数，在线程中调用；并发请求只触发一次登录
+        self._sid = sid
+        self._sid_expires_at = sid_expires_at
+        self._login = login
+        self._login_lock = asyncio.Lock()
+
+    @classmethod
+    def from_api(
+        cls, api: "Api", timeout: float, max_connections: int, upstream: Optional[Upstream] = None
+    ) -> "RestBackend":
+        """Reuse the credentials of an authenticated SDK Api, re-logging in with its API key when the sid expires."""
+        from swanlab.core_python import auth
+
+        login_info = api._login_info
+        api_key = login_info.api_key
+        return cls(
+            api_host=login_info.api_host,
+            web_host=login_info.web_host,
+            sid=login_info.sid,
+            username=login_info.username,
+            timeout=timeout,
+            max_connections=max_connections,
+            upstream=upstream,
+            sid_expires_at=_sid_expiry(login_info.expired_at),
+            login=(lambda: auth.login_by_key(api_key, timeout=int(timeout), save=False)) if api_key else None,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return self.upstream.stats()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+        await self.files.aclose()
+
+    async def _relogin(self, stale_sid: str) -> None:
+        """Log in again unless another request already replaced `stale_sid`."""
+        async with self._login_lock:
+            if self._sid != stale_sid:
+                return
+            login_info = await asyncio.to_thread(self._login)
+            if login_info.is_fail or not login_info.sid:
+                raise RuntimeError(f"SwanLab re-login failed: {login_info}")
+            self._sid = login_info.sid
+            self._sid_expires_at = _sid_expiry(login_info.expired_at)
+            self.client.headers["cookie"] = f"sid={self._sid}"
+
+    async def _request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None, json: Any = None) -> Any:
+        if params:
+            # 与 requests 的编码保持一致：丢弃 None，布尔值编码为 True/False
+            params = {k: str(v) if isinstance(v, bool) else v for k, v in params.items() if v is not None}
+
+        async def send() -> httpx.Response:
+            sid = self._sid
+            expires_at = self._sid_expires_at
+            if self._login is not None and expires_at is not None and expires_at - time.time() <= SID_REFRESH_SECONDS:
+                await self._relogin(sid)
+                sid = self._sid
+            resp = await self.client.request(method, url, params=params, json=json)
+            if resp.status_code == 401 and self._login is not None:
+                # sid 被提前吊销或已过期：重新登录后重试一次
+                await self._relogin(sid)
+                resp = await self.client.request(method, url, params=params, json=json)
+            resp.raise_for_status()
+            return resp
+
+        return (await self.upstream.call(_endpoint(method, url), send)).json()
+
+    async def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        return await self._request("GET", url, params=params)
+
+    def _workspace_dict(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "username": raw.get("username"),
+            "name": raw.get("name"),
+            "workspace_type": raw.get("type"),
+            "role": raw.get("role"),
+            "profile": raw.get("profile") or {},
+            "comment": raw.get("comment"),
+        }
+
+    def _project_dict(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": raw.get("name"),
+            "path": raw.get("path"),
+            "description": raw.get("description"),
+            "labels": _label_names(raw.get("projectLabels")),
+            "visibility": raw.get("visibility"),
+            "created_at": raw.get("createdAt"),
+            "updated_at": raw.get("updatedAt"),
+            "url": f"{self.web_host}/@{raw.get('path')}",
+            "count": raw.get("_count") or {},
+        }
+
+    def _run_dict(self, raw: Dict[str, Any], project_path: str) -> Dict[str, Any]:
+        cuid = raw.get("cuid", "")
+        username = (raw.get("user") or {}).get("username", "")
+        profile = raw.get("profile")
+        if isinstance(profile, dict):
+            profile = {
+                "config": {k: _clean_config_field(v) for k, v in (profile.get("config") or {}).items()},
+                "metadata": profile.get("metadata") or {},
+                "requirements": profile.get("requirements") or "",
+                "conda": profile.get("conda") or "",
+            }
+        return {
+            "id": cuid,
+            "name": raw.get("name"),
+            "path": f"{project_path}/{cuid}",
+            "description": raw.get("description"),
+            "state": raw.get("state"),
+            "group": raw.get("cluster"),
+            "labels": _label_names(raw.get("labels")),
+            "created_at": raw.get("createdAt"),
+            "finished_at": raw.get("finishedAt"),
+            "url": f"{self.web_host}/@{project_path}/runs/{cuid}/chart",
+            "job_type": raw.get("job"),
+            "show": raw.get("show", True),
+            "user": {"username": username, "is_self": username == self.username},
+            "profile": profile,
+        }
+
+    async def workspaces(self, username: Optional[str] = None) -> List[Dict[str, Any]]:
+        username = username or self.username
+        groups = await self._get(f"/user/{username}/groups")
+        spaces = [username] + [group["username"] for group in groups]
+        data = await asyncio.gather(*(self._get(f"/group/{space}") for space in spaces))
+        return [self._workspace_dict(raw) for raw in data]
+
+    async def workspace(self, username: Optional[str] = None) -> Dict[str, Any]:
+        return self._workspace_dict(await self._get(f"/group/{username or self.username}"))
+
+    async def projects(
+        self,
+        path: Optional[str] = None,
+        sort: Optional[str] = None,
+        search: Optional[str] = None,
+        detail: bool = True,
+    ) -> List[Dict[str, Any]]:
+        url = f"/project/{path or self.username}"
+        params = {"size": PROJECT_PAGE_SIZE, "sort": sort, "search": search, "detail": detail}
+        first = await self._get(url, {**params, "page": 1})
+        # 第一页返回总页数后，其余页并发获取
+        rest = await asyncio.gather(
+            *(self._get(url, {**params, "page": page}) for page in range(2, int(first.get("pages", 1)) + 1))
+        )
+        return [self._project_dict(raw) for resp in (first, *rest) for raw in resp.get("list", [])]
+
+    async def project(self, path: str) -> Dict[str, Any]:
+        return self._project_dict(await self._get(f"/project/{path}"))
+
+    async def runs(self, path: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        resp = await self._request("POST", f"/project/{path}/runs/shows", json={"filters": _run_filters(filters)})
+        raw_runs = _flatten_runs(resp)
+        # 列表接口不含 profile，与 SDK 行为保持一致，并发补全每个实验的详情
+        missing = [raw for raw in raw_runs if "profile" not in raw]
+        details = await asyncio.gather(*(self._get(f"/project/{path}/runs/{raw['cuid']}") for raw in missing))
+        for raw, detail in zip(missing, details):
+            raw.update(detail)
+        return [self._run_dict(raw, path) for raw in raw_runs]
+
+    async def _get_run(self, path: str) -> Dict[str, Any]:
+        project_path, experiment_id = path.rsplit("/", 1)
+        raw = await self._get(f"/project/{project_path}/runs/{experiment_id}")
+        self._run_ids[path] = raw.get("cuid", experiment_id)
+        return raw
+
+    async def _run_id(self, path: str) -> str:
+        run_id = self._run_ids.get(path)
+        if run_id is None:
+            run_id = (await self._get_run(path)).get("cuid", "")
+        return run_id
+
+    async def run(self, path: str) -> Dict[str, Any]:
+        return self._run_dict(await self._get_run(path), path.rsplit("/", 1)[0])
+
+    async def metric_columns(self, path: str) -> List[Dict[str, Any]]:
+        run_id = await self._run_id(path)
+        resp = await self._get(f"/experiment/{run_id}/column", {"all": True})
+        return resp.get("list", [])
+
+    async def _metric_frame(self, run_id: str, key: str) -> pd.DataFrame:
+        resp = await self._get(f"/experiment/{run_id}/column/csv", {"key": key})
+
+        async def download_csv() -> httpx.Response:
+            download = await self.files.get(resp.get("url", ""))
+            download.raise_for_status()
+            return download
+
+        download = await self.upstream.call(DOWNLOAD_ENDPOINT, download_csv)
+        df = await asyncio.to_thread(pd.read_csv, io.BytesIO(download.content), index_col=0)
+        # 列名形如 "<prefix><key>_step"，去掉前缀和 _step 后缀，与 SDK 保持一致
+        first_col = str(df.columns[0]) if len(df.columns) else ""
+        suffix = f"{key}_"
+        prefix = first_col.split(suffix)[0] if suffix in first_col else ""
+        columns = []
+        for col in map(str, df.columns):
+            if prefix and col.startswith(prefix):
+                col = col[len(prefix) :]
+            columns.append(col[: -len("_step")] if col.endswith("_step") else col)
+        df.columns = columns
+        return df
+
+    async def metric_series(self, path: str, key: str) -> pd.DataFrame:
+        return await self._metric_frame(await self._run_id(path), key)
+
+    async def metric_summary(self, path: str) -> Dict[str, Dict[str, Any]]:
+        body = self._summary_requests.get(path)
+        if body is None:
+            # 实验和项目的 cuid 不会变化，只在第一次查询时获取
+            project_path = path.rsplit("/", 1)[0]
+            project, run = await asyncio.gather(self._get(f"/project/{project_path}"), self._get_run(path))
+            body = self._summary_requests[path] = summary_request(run, project.get("cuid", ""))
+        return parse_summary(await self._request("POST", "/house/metrics/summaries", json=body))
@@ -0,0 +1,136 @@
+"""Backend built on the synchronous SwanLab SDK.
+
+通过 `swanlab.Api` 访问数据，阻塞调用放到线程池中执行，避免阻塞事件循环。
+作为 REST 后端不可用时的回退方案。
+SDK 会话自带 urllib3 重试（429/5xx 最多 5 次），会与 `Upstream` 的重试叠加，
+且重试耗尽的 429 以不带状态码的 RetryError 抛出，限流器无法据此降速；
+因此关闭 SDK 会话的重试，429/5xx 以原始响应返回，重试和退避统一由 `Upstream` 负责。
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, TypeVar
+
+from ..upstream import AdaptiveLimiter, Upstream
+from ..utils import to_plain_dict, to_plain_dicts
+from .base import Backend, parse_summary, summary_request
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from swanlab import Api
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def disable_sdk_retries(api: "Api") -> bool:
+    """
+    Turn off the urllib3 retries of the SDK client's HTTP session.
+
+    Returns:
+        是否成功关闭；SDK 内部结构变化、找不到会话时返回 False
+    """
+    from urllib3.util.retry import Retry
+
+    # Client 的会话是名称改写后的私有属性
+    session = getattr(getattr(api, "_client", None), "_Client__session", None)
+    adapters = getattr(session, "adapters", None)
+    if not adapters:
+        return False
+    for adapter in adapters.values():
+        # 不设置 status_forcelist：429/5xx 原样返回，由 SDK 抛出带响应的 ApiError
+        adapter.max_retries = Retry(total=0, redirect=False, raise_on_status=False)
+    return True
+
+
+class SdkBackend(Backend):
+    """Backend that delegates every call to `swanlab.Api` in a worker thread."""
+
+    name = "sdk"
+
+    def __init__(self, api: "Api", max_connections: int, upstream: Optional[Upstream] = None):
+        self.api = api
+        self.upstream = upstream or Upstream(AdaptiveLimiter(0, max_connections))
+        if not disable_sdk_retries(api):
+            logger.warning("Could not disable the SwanLab SDK's own retries; they stack on UPSTREAM_RETRIES")
+        self._runs: Dict[str, Any] = {}
+
+    async def _call(self, endpoint: str, fetch: Callable[[], T]) -> T:
+        # 一次 SDK 调用可能包含多个请求，按一次计入限流；熔断器按 SDK 方法区分。
+        # 线程中的调用无法取消，不做对冲
+        return await self.upstream.call(endpoint, lambda: asyncio.to_thread(fetch), hedge=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.upstream.stats()
+
+    async def workspaces(self, username: Optional[str] = None) -> List[Dict[str, Any]]:
+        def fetch() -> List[Dict[str, Any]]:
+            workspaces = self.api.workspaces(username=username) if username else self.api.workspaces()
+            return to_plain_dicts(workspaces)
+
+        return await self._call("sdk.workspaces", fetch)
+
+    async def workspace(self, username: Optional[str] = None) -> Dict[str, Any]:
+        def fetch() -> Dict[str, Any]:
+            ws = self.api.workspace(username=username) if username else self.api.workspace()
+            return to_plain_dict(ws)
+
+        return await self._call("sdk.workspace", fetch)
+
+    async def projects(
+        self,
+        path: Optional[str] = None,
+        sort: Optional[str] = None,
+        search: Optional[str] = None,
+        detail: bool = True,
+    ) -> List[Dict[str, Any]]:
+        kwargs: Dict[str, Any] = {"detail": detail}
+        if path:
+            kwargs["path"] = path
+        if sort:
+            kwargs["sort"] = sort
+        if search:
+            kwargs["search"] = search
+        return await self._call("sdk.projects", lambda: to_plain_dicts(self.api.projects(**kwargs)))
+
+    async def project(self, path: str) -> Dict[str, Any]:
+        return await self._call("sdk.project", lambda: to_plain_dict(self.api.project(path=path)))
+
+    async def runs(self, path: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        kwargs: Dict[str, Any] = {"path": path}
+        if filters:
+            kwargs["filters"] = filters
+        return await self._call("sdk.runs", lambda: to_plain_dicts(self.api.runs(**kwargs)))
+
+    async def run(self, path: str) -> Dict[str, Any]:
+        return await self._call("sdk.run", lambda: to_plain_dict(self.api.run(path=path)))
+
+    async def metric_columns(self, path: str) -> List[Dict[str, Any]]:
+        def fetch() -> List[Dict[str, Any]]:
+            run = self.api.run(path=path)
+            columns_resp, _ = run._client.get(f"/experiment/{run.id}/column", params={"all": True})
+            return columns_resp.get("list", [])
+
+        return await self._call("sdk.metric_columns", fetch)
+
+    def _experiment(self, path: str) -> Any:
+        # 拉取指标只需要实验 id，缓存实验对象，避免每个 key 都重新请求实验详情
+        run = self._runs.get(path)
+        if run is None:
+            run = self._runs[path] = self.api.run(path=path)
+        return run
+
+    async def metric_series(self, path: str, key: str) -> "pd.DataFrame":
+        return await self._call("sdk.metric_series", lambda: self._experiment(path).metrics(keys=[key]))
+
+    async def metric_summary(self, path: str) -> Dict[str, Dict[str, Any]]:
+        def fetch() -> Dict[str, Dict[str, Any]]:
+            run = self._experiment(path)
+            project_path, experiment_id = path.rsplit("/", 1)
+            project, _ = run._client.get(f"/project/{project_path}")
+            raw, _ = run._client.get(f"/project/{project_path}/runs/{experiment_id}")
+            resp, _ = run._client.post("/house/metrics/summaries", summary_request(raw, project.get("cuid", "")))
+            return parse_summary(resp)
+
+        return await self._call("sdk.metric_summary", fetch)
@@ -0,0 +1,188 @@
+"""In-memory caching for upstream data.
+
+带过期时间和容量上限的 LRU 缓存；同一个 key 的并发加载只会请求一次上游。
+过期条目在 `stale_ttl` 内继续保留，上游失败时作为过期数据返回，并记录到当前工具调用的 `Staleness` 中。
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class Staleness:
+    """Age of the oldest stale data served while answering one tool call."""
+
+    def __init__(self) -> None:
+        self.age: Optional[float] = None
+
+    def mark(self, age: float) -> None:
+        self.age = max(self.age or 0.0, age)
+
+
+# 保存可变对象而不是值本身：asyncio.gather 的子任务复制上下文后仍写入同一个 Staleness
+_staleness: ContextVar[Optional[Staleness]] = ContextVar("swanlab_staleness", default=None)
+
+
+def track_staleness() -> Staleness:
+    """Start recording stale data served in the current request, reusing the tracker of the request if any."""
+    staleness = _staleness.get()
+    if staleness is None:
+        staleness = Staleness()
+        _staleness.set(staleness)
+    return staleness
+
+
+def stale_age() -> Optional[float]:
+    """Seconds since the oldest stale data served in the current request was fetched, None if all data was fresh."""
+    staleness = _staleness.get()
+    return staleness.age if staleness is not None else None
+
+
+def _unit_size(_: Any) -> int:
+    return 1
+
+
+class TTLCache:
+    """LRU cache whose entries expire `ttl` seconds after they were stored.
+
+    容量按 `sizeof` 计算（默认每个条目计 1），超出 `max_size` 时淘汰最久未使用的条目。
+    过期后的 `stale_ttl` 秒内条目仍保留，仅在重新加载失败时由 `get_or_load` 返回。
+    """
+
+    def __init__(self, ttl: float, max_size: int, sizeof: Callable[[Any], int] = _unit_size, stale_ttl: float = 0):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self.stale_ttl = stale_ttl
+        self.stale_served = 0
+        self.size = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._loading: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, size, value = entry
+        age = time.monotonic() - stored_at
+        if age > self.ttl:
+            if age > self.ttl + self.stale_ttl:
+                self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get_stale(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        """Return `(age, value)` of an entry that is fresh or within its stale window, else None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        age = time.monotonic() - entry[0]
+        if age > self.ttl + self.stale_ttl:
+            self._discard(key)
+            return None
+        return age, entry[2]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting least recently used entries beyond the size limit."""
+        self._discard(key)
+        size = self.sizeof(value)
+        if size > self.max_size:
+            return
+        self._entries[key] = (time.monotonic(), size, value)
+        self.size += size
+        while self.size > self.max_size:
+            self._discard(next(iter(self._entries)))
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+        serve_stale: Optional[Callable[[BaseException], bool]] = None,
+    ) -> Any:
+        """
+        Return the cached value, loading it once for all concurrent callers on a miss.
+
+        Args:
+            key: 缓存 key
+            load: 未命中时调用的异步加载函数
+            serve_stale: 判断加载错误是否可以用过期数据代替；返回 True 且存在过期条目时返回该条目
+
+        Returns:
+            缓存或新加载的值；加载失败时异常会传递给所有等待者，且不会被缓存。
+            发起加载的调用被取消时，其余等待者不会随之取消，而是重新加载
+        """
+        while True:
+            value = self.get(key)
+            if value is not None:
+                return value
+            pending = self._loading.get(key)
+            if pending is None:
+                return await self._load(key, load, serve_stale)
+            try:
+                value, age = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # 只有发起加载的调用被取消（当前任务本身没有被取消）时重试
+                if pending.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+            if age is not None:
+                track_staleness().mark(age)
+            return value
+
+    async def _load(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+        serve_stale: Optional[Callable[[BaseException], bool]],
+    ) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            stale = self.get_stale(key) if serve_stale is not None and serve_stale(e) else None
+            if stale is None:
+                future.set_exception(e)
+                # 没有其他等待者时避免 "exception was never retrieved" 警告
+                future.exception()
+                raise
+            age, value = stale
+            self.stale_served += 1
+            track_staleness().mark(age)
+            future.set_result((value, age))
+            return value
+        else:
+            self.put(key, value)
+            future.set_result((value, None))
+            return value
+        finally:
+            del self._loading[key]
+
+    def discard(self, key: Hashable) -> None:
+        """Drop one entry if it is cached."""
+        self._discard(key)
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop every entry whose key matches the predicate."""
+        for key in [key for key in self._entries if predicate(key)]:
+            self._discard(key)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+        self.size = 0
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
@@ -16,6 +16,7 @@ def create_parser() -> argparse.ArgumentParser:
 Examples:
   %(prog)s                        # Run with stdio transport (default)
   %(prog)s --transport stdio      # Run with stdio transport
+  %(prog)s --offline ./export     # Serve tools from an exported snapshot
         """,
     )
 
@@ -26,6 +27,12 @@ Examples:
         help="Transport type (default: stdio)",
     )
 
+    parser.add_argument(
+        "--offline",
+        metavar="DIR",
+        help="Serve all tools from a snapshot exported by swanlab_export_project instead of the SwanLab API",
+    )
+
     parser.add_argument(
         "--version",
         action="version",
@@ -42,7 +49,7 @@ def main() -> None:
 
     # Create and configure the MCP server
     try:
-        mcp = create_mcp_server()
+        mcp = create_mcp_server(offline_dir=args.offline)
         print(f"MCP server created successfully on transport {args.transport}")
     except Exception as e:
         print(f"Error creating MCP server: {e}", file=sys.stderr)
@@ -1,9 +1,29 @@
 """Configuration management for SwanLab MCP Server."""
 
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from .constants import DEFAULT_API_TIMEOUT_SECONDS, DEFAULT_SWANLAB_HOST
+from .constants import (
+    DEFAULT_API_TIMEOUT_SECONDS,
+    DEFAULT_BACKEND,
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+    DEFAULT_CIRCUIT_RESET_SECONDS,
+    DEFAULT_EXPORT_DIR,
+    DEFAULT_HEDGE_RATIO,
+    DEFAULT_JSON_INF_NAN,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_METRIC_CACHE_MB,
+    DEFAULT_METRIC_CACHE_TTL_SECONDS,
+    DEFAULT_METRIC_REQUEST_MB,
+    DEFAULT_PREFETCH_RUNS,
+    DEFAULT_RUN_WATCH_INTERVAL_SECONDS,
+    DEFAULT_STALE_TTL_SECONDS,
+    DEFAULT_SWANLAB_HOST,
+    DEFAULT_UPSTREAM_RATE_LIMIT,
+    DEFAULT_UPSTREAM_RETRIES,
+)
 
 
 class SwanLabConfig(BaseSettings):
@@ -30,6 +50,119 @@ class SwanLabConfig(BaseSettings):
         validation_alias="API_TIMEOUT",
     )
 
+    # Backend settings
+    backend: Literal["rest", "sdk"] = Field(
+        default=DEFAULT_BACKEND,
+        description="Data backend: rest (async HTTP client) or sdk (synchronous SwanLab SDK)",
+        validation_alias="SWANLAB_BACKEND",
+    )
+
+    max_connections: int = Field(
+        default=DEFAULT_MAX_CONNECTIONS,
+        description="Maximum number of concurrent upstream connections",
+        validation_alias="MAX_CONNECTIONS",
+    )
+
+    upstream_rate_limit: float = Field(
+        default=DEFAULT_UPSTREAM_RATE_LIMIT,
+        description="Maximum upstream requests per second; 0 disables the rate limit",
+        validation_alias="UPSTREAM_RATE_LIMIT",
+        ge=0,
+    )
+
+    upstream_retries: int = Field(
+        default=DEFAULT_UPSTREAM_RETRIES,
+        description="Retries of a read request failing with 429, 5xx or a network error, with exponential backoff",
+        validation_alias="UPSTREAM_RETRIES",
+        ge=0,
+    )
+
+    circuit_failure_threshold: int = Field(
+        default=DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+        description="Consecutive transient failures after which requests to an upstream endpoint are rejected",
+        validation_alias="CIRCUIT_FAILURE_THRESHOLD",
+        ge=1,
+    )
+
+    circuit_reset_seconds: float = Field(
+        default=DEFAULT_CIRCUIT_RESET_SECONDS,
+        description="Seconds an open circuit rejects requests before a probe request is let through",
+        validation_alias="CIRCUIT_RESET_SECONDS",
+        gt=0,
+    )
+
+    hedge_ratio: float = Field(
+        default=DEFAULT_HEDGE_RATIO,
+        description="Hedge reads slower than their endpoint's running p95 latency, sending at most this fraction "
+        "of extra requests; 0 disables hedging",
+        validation_alias="UPSTREAM_HEDGE_RATIO",
+        ge=0,
+        le=1,
+    )
+
+    # Cache settings
+    metric_cache_ttl: float = Field(
+        default=DEFAULT_METRIC_CACHE_TTL_SECONDS,
+        description="Seconds a fetched metric series is reused before it is refetched; 0 disables the cache",
+        validation_alias="METRIC_CACHE_TTL",
+    )
+
+    metric_cache_mb: int = Field(
+        default=DEFAULT_METRIC_CACHE_MB,
+        description="Memory budget of the metric series cache in MiB",
+        validation_alias="METRIC_CACHE_MB",
+    )
+
+    metric_request_mb: int = Field(
+        default=DEFAULT_METRIC_REQUEST_MB,
+        description="Memory cap in MiB of the rows of one swanlab_get_run_metrics response",
+        validation_alias="METRIC_REQUEST_MAX_MB",
+        gt=0,
+    )
+
+    stale_ttl: float = Field(
+        default=DEFAULT_STALE_TTL_SECONDS,
+        description="Seconds expired cached data may still be served, marked stale, when the upstream fails",
+        validation_alias="STALE_TTL",
+        ge=0,
+    )
+
+    prefetch_runs: int = Field(
+        default=DEFAULT_PREFETCH_RUNS,
+        description="Number of runs of a run listing whose details and metric keys are prefetched; 0 disables it",
+        validation_alias="PREFETCH_RUNS",
+        ge=0,
+    )
+
+    # Subscription settings
+    run_watch_interval: float = Field(
+        default=DEFAULT_RUN_WATCH_INTERVAL_SECONDS,
+        description="Seconds between upstream polls of a subscribed run resource",
+        validation_alias="RUN_WATCH_INTERVAL",
+        gt=0,
+    )
+
+    # Offline settings
+    offline_dir: str | None = Field(
+        default=None,
+        description="Serve all tools from an exported snapshot directory instead of the SwanLab API",
+        validation_alias="SWANLAB_OFFLINE_DIR",
+    )
+
+    # Export settings
+    export_dir: str = Field(
+        default=DEFAULT_EXPORT_DIR,
+        description="Root directory swanlab_export_project writes into; its output_dir is resolved inside it",
+        validation_alias="SWANLAB_EXPORT_DIR",
+    )
+
+    # Output settings
+    json_inf_nan: Literal["null", "strings"] = Field(
+        default=DEFAULT_JSON_INF_NAN,
+        description="How NaN/Inf values are written in tool outputs: null, or 'NaN'/'Infinity' strings",
+        validation_alias="JSON_INF_NAN",
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -37,10 +170,13 @@ class SwanLabConfig(BaseSettings):
     )
 
 
-def get_config() -> SwanLabConfig:
+def get_config(offline_dir: str | None = None) -> SwanLabConfig:
     """
     Get the SwanLab configuration.
 
+    Args:
+        offline_dir: Snapshot directory overriding `SWANLAB_OFFLINE_DIR`
+
     Returns:
         SwanLabConfig instance with settings loaded from environment.
 
@@ -48,6 +184,9 @@ def get_config() -> SwanLabConfig:
         ValueError: If required settings (like api_key) are not set.
     """
     config = SwanLabConfig()
-    if not config.api_key:
+    if offline_dir:
+        config.offline_dir = offline_dir
+    # 离线模式不访问 SwanLab，无需 API Key
+    if not config.api_key and not config.offline_dir:
         raise ValueError("SWANLAB_API_KEY environment variable must be set")
     return config
@@ -2,3 +2,32 @@
 
 DEFAULT_SWANLAB_HOST = "https://swanlab.cn"
 DEFAULT_API_TIMEOUT_SECONDS = 10
+SID_REFRESH_SECONDS = 24 * 60 * 60
+DEFAULT_JSON_INF_NAN = "null"
+DEFAULT_BACKEND = "rest"
+DEFAULT_MAX_CONNECTIONS = 64
+METRIC_FETCH_CONCURRENCY = 8
+DEFAULT_METRIC_CACHE_TTL_SECONDS = 60
+DEFAULT_METRIC_CACHE_MB = 256
+DEFAULT_METRIC_REQUEST_MB = 64
+DEFAULT_COMPARE_POINTS = 200
+DEFAULT_RUN_WATCH_INTERVAL_SECONDS = 15
+DEFAULT_PREFETCH_RUNS = 0
+PREFETCH_CONCURRENCY = 2
+DEFAULT_UPSTREAM_RATE_LIMIT = 50
+LIMITER_DECREASE_FACTOR = 0.5
+LIMITER_LATENCY_SMOOTHING = 0.2
+MAX_RETRY_AFTER_SECONDS = 60
+DEFAULT_UPSTREAM_RETRIES = 2
+RETRY_BASE_DELAY_SECONDS = 0.2
+RETRY_MAX_DELAY_SECONDS = 5.0
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 5
+DEFAULT_CIRCUIT_RESET_SECONDS = 30
+DEFAULT_STALE_TTL_SECONDS = 3600
+DEFAULT_HEDGE_RATIO = 0.0
+HEDGE_QUANTILE = 0.95
+HEDGE_LATENCY_WINDOW = 256
+HEDGE_MIN_SAMPLES = 20
+HEDGE_BURST = 10
+DEFAULT_EXPORT_DIR = "swanlab_export"
+WARMUP_RETRY_SECONDS = 5
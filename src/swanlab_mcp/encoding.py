@@ -0,0 +1,127 @@
+"""Compact encodings of metric columns.
+
+指标数据的可选紧凑编码：数值按有效数字取整；整数 x 轴编码为等差数列（start、stride、count）
+或首项加差分；连续重复的值（包括稀疏列中成段的 null）编码为 [值, 次数] 游程。
+"""
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+# float64 可区分的最大有效数字位数
+MAX_SIGNIFICANT_DIGITS = 17
+# 游程数不超过值个数的该比例时才使用游程编码，否则原样返回列表
+RLE_MAX_RUN_RATIO = 0.5
+# 10 的幂超过该指数时 float64 会溢出，对应的次正规数不取整
+MAX_DECIMAL_EXPONENT = 300
+# float64 可精确表示的整数上界，整数值的浮点 x 轴（如按 step 对齐的网格）在此范围内按整数编码
+MAX_EXACT_INTEGER = 2**53
+
+
+def validate_digits(digits: Any) -> None:
+    """Check a significant-digit limit argument.
+
+    Raises:
+        ValueError: digits 不是 1 到 17 之间的整数时
+    """
+    if digits is not None and not (isinstance(digits, int) and 1 <= digits <= MAX_SIGNIFICANT_DIGITS):
+        raise ValueError(f"`digits` must be an integer between 1 and {MAX_SIGNIFICANT_DIGITS}.")
+
+
+def round_significant(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    Round float values to `digits` significant digits.
+
+    按数量级分组向量化取整，结果是离十进制取整值最近的 float64，序列化后只保留这些有效数字；
+    NaN、±Inf、0 和非浮点数组原样返回。
+    """
+    if values.dtype.kind != "f":
+        return values
+    out = values.astype(np.float64, copy=True)
+    flat = out.reshape(-1)
+    index = np.flatnonzero(np.isfinite(flat) & (flat != 0))
+    if not len(index):
+        return out
+    decimals = digits - 1 - np.floor(np.log10(np.abs(flat[index]))).astype(np.int64)
+    for exponent in np.unique(decimals):
+        if exponent > MAX_DECIMAL_EXPONENT:
+            continue
+        group = index[decimals == exponent]
+        if exponent >= 0:
+            scale = 10.0**exponent
+            flat[group] = np.rint(flat[group] * scale) / scale
+        else:
+            scale = 10.0**-exponent
+            flat[group] = np.rint(flat[group] / scale) * scale
+    return out
+
+
+def run_lengths(values: np.ndarray) -> List[List[Any]]:
+    """Encode consecutive equal values as `[value, count]` pairs; NaN runs count as equal."""
+    if not len(values):
+        return []
+    same = values[1:] == values[:-1]
+    if values.dtype.kind == "f":
+        same |= np.isnan(values[1:]) & np.isnan(values[:-1])
+    starts = np.concatenate(([0], np.flatnonzero(~same) + 1))
+    counts = np.diff(np.append(starts, len(values)))
+    return [[value, count] for value, count in zip(values[starts].tolist(), counts.tolist())]
+
+
+def encode_values(values: np.ndarray) -> Any:
+    """Encode one value column as a plain list, or as `{"rle": [[value, count], ...]}` when that is shorter."""
+    if len(values) > 1:
+        runs = run_lengths(values)
+        if len(runs) <= len(values) * RLE_MAX_RUN_RATIO:
+            return {"rle": runs}
+    return values.tolist()
+
+
+def encode_axis(values: np.ndarray) -> Dict[str, Any]:
+    """
+    Encode the x axis column.
+
+    - 等间距整数：`{"start", "stride", "count"}`
+    - 其他整数：`{"start", "count", "deltas"}`，deltas 为相邻差分，同样按 `encode_values` 编码
+    - 非整数（如以浮点指标为 x 轴）：`{"count", "values"}`
+    """
+    count = len(values)
+    if values.dtype.kind == "f" and count and (np.abs(values) < MAX_EXACT_INTEGER).all():
+        if (values == np.rint(values)).all():
+            values = values.astype(np.int64)
+    if values.dtype.kind not in "iu" or not count:
+        return {"count": count, "values": encode_values(values)}
+    start = int(values[0])
+    if count == 1:
+        return {"start": start, "stride": 0, "count": 1}
+    deltas = np.diff(values.astype(np.int64))
+    if (deltas == deltas[0]).all():
+        return {"start": start, "stride": int(deltas[0]), "count": count}
+    return {"start": start, "count": count, "deltas": encode_values(deltas)}
+
+
+def encode_columns(columns: Sequence[str], arrays: Sequence[np.ndarray]) -> Dict[str, Any]:
+    """
+    Encode a columnar table whose first column is the x axis.
+
+    Returns:
+        `{"x": 轴列名, "axis": encode_axis(...), "values": {列名: encode_values(...)}}`
+    """
+    return {
+        "x": columns[0],
+        "axis": encode_axis(arrays[0]),
+        "values": {name: encode_values(array) for name, array in zip(columns[1:], arrays[1:])},
+    }
+
+
+def encoded_cells(encoded: Dict[str, Any]) -> int:
+    """Number of scalars in an encoded table, used to estimate its serialized size."""
+
+    def cells(value: Any) -> int:
+        if isinstance(value, dict):
+            return sum(cells(item) for item in value.values())
+        if isinstance(value, list):
+            return sum(cells(item) for item in value) if value and isinstance(value[0], list) else len(value)
+        return 1
+
+    return cells(encoded["axis"]) + cells(encoded["values"])
@@ -0,0 +1,249 @@
+"""Project snapshot export to a partitioned Parquet dataset.
+
+导出目录结构（与 skill CLI 的 `projects export` 一致）::
+
+    <output_dir>/<username>/<project>/
+        project.json                          项目信息
+        runs.parquet                          实验表，config 展开为 `config.<name>` 列，metadata 为 JSON 字符串
+        metrics/run_id=<id>/part-0.parquet    长表格式的标量指标：key, step, value, timestamp
+        _manifest.json                        每个实验的导出记录，用于断点续传
+
+已导出、状态为 FINISHED 且没有失败 key 的实验不会重复导出；每个实验的分区写完后才记入 manifest，
+中断后重新执行会从未完成的实验继续。
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .backends import Backend, CachedBackend
+from .utils import resolve_inside
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "_manifest.json"
+RUNS_FILE = "runs.parquet"
+PROJECT_FILE = "project.json"
+METRICS_DIR = "metrics"
+PARTITION_FILE = "part-0.parquet"
+
+# 非标量指标类型，导出时跳过
+MEDIA_COLUMN_TYPES = {"IMAGE", "AUDIO", "TEXT", "VIDEO", "OBJECT3D", "MOLECULE", "ECHARTS"}
+
+EXPORT_RUN_CONCURRENCY = 4
+EXPORT_KEY_CONCURRENCY = 8
+
+# 临时文件名序号，同一文件的并发写入各自使用不同的临时文件
+_tmp_counter = itertools.count()
+
+
+def require_parquet() -> None:
+    """Raise a helpful error if the Parquet engine is missing."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("Parquet export requires pyarrow: pip install 'swanlab-mcp[parquet]'") from e
+
+
+def project_dir(output_dir: str, path: str) -> Path:
+    """Directory of one exported project, which must stay inside `output_dir`."""
+    return resolve_inside(Path(output_dir), path)
+
+
+def partition_path(root: Path, run_id: str) -> Path:
+    """Parquet file holding the metrics of one run."""
+    return root / METRICS_DIR / f"run_id={run_id}" / PARTITION_FILE
+
+
+def read_manifest(root: Path) -> Dict[str, Dict[str, Any]]:
+    """Read the export manifest, returning an empty one if it is missing or corrupt."""
+    try:
+        return json.loads((root / MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(target: Path, write) -> None:
+    # 先写临时文件再替换，中断时不会留下半个文件
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.{next(_tmp_counter)}.tmp")
+    write(tmp)
+    os.replace(tmp, target)
+
+
+def _write_manifest(root: Path, manifest: Dict[str, Dict[str, Any]]) -> None:
+    _write_atomic(
+        root / MANIFEST_FILE,
+        lambda tmp: tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8"),
+    )
+
+
+def metrics_long_frame(series: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Stack per-key series into one long table with `key, step, value, timestamp` columns."""
+    frames = []
+    for key, df in series.items():
+        timestamps = df[f"{key}_timestamp"] if f"{key}_timestamp" in df.columns else np.nan
+        frames.append(
+            pd.DataFrame(
+                {
+                    "key": key,
+                    "step": df.index.to_numpy(dtype=np.int64),
+                    "value": pd.to_numeric(df[key], errors="coerce").to_numpy(dtype=np.float64),
+                    "timestamp": pd.to_numeric(pd.Series(timestamps, index=df.index), errors="coerce").to_numpy(
+                        dtype=np.float64
+                    ),
+                }
+            )
+        )
+    if not frames:
+        return pd.DataFrame({"key": [], "step": [], "value": [], "timestamp": []}).astype(
+            {"key": "category", "step": np.int64, "value": np.float64, "timestamp": np.float64}
+        )
+    long = pd.concat(frames, ignore_index=True)
+    long["key"] = long["key"].astype("category")
+    return long
+
+
+def runs_frame(runs: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build the run table: run fields, `config.<name>` columns and metadata as a JSON string."""
+    records = []
+    for run in runs:
+        profile = run.get("profile") or {}
+        record = {k: v for k, v in run.items() if k != "profile"}
+        record["config"] = profile.get("config") or {}
+        record["metadata"] = json.dumps(profile.get("metadata") or {}, ensure_ascii=False, default=str)
+        records.append(record)
+    df = pd.json_normalize(records, sep=".")
+    # Parquet 列必须类型一致：混合类型或嵌套结构的列序列化为字符串
+    for column in df.select_dtypes(include="object").columns:
+        kinds = {type(v) for v in df[column] if v is not None and not (isinstance(v, float) and np.isnan(v))}
+        if len(kinds) > 1 or kinds & {dict}:
+            df[column] = df[column].map(
+                lambda v: v if v is None or isinstance(v, str) else json.dumps(v, ensure_ascii=False, default=str)
+            )
+    return df
+
+
+async def _export_run(backend: Backend, root: Path, run: Dict[str, Any], slots: asyncio.Semaphore) -> Dict[str, Any]:
+    path = run["path"]
+    columns = await backend.metric_columns(path)
+    keys = [
+        col["key"]
+        for col in columns
+        if col.get("key") and not col.get("error") and str(col.get("type", "")).upper() not in MEDIA_COLUMN_TYPES
+    ]
+
+    async def fetch(key: str) -> pd.DataFrame:
+        async with slots:
+            return await backend.metric_series(path, key)
+
+    results = await asyncio.gather(*(fetch(key) for key in keys), return_exceptions=True)
+    series: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, str] = {}
+    for key, result in zip(keys, results):
+        if isinstance(result, Exception):
+            errors[key] = str(result) or type(result).__name__
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            series[key] = result
+
+    def write() -> int:
+        long = metrics_long_frame(series)
+        _write_atomic(partition_path(root, run["id"]), lambda tmp: long.to_parquet(tmp, index=False))
+        return len(long)
+
+    rows = await asyncio.to_thread(write)
+    return {"state": run.get("state"), "exported_at": time.time(), "rows": rows, "keys": len(series), "errors": errors}
+
+
+async def export_project(
+    backend: Backend,
+    path: str,
+    output_dir: str,
+    filters: Optional[Dict[str, Any]] = None,
+    concurrency: int = EXPORT_RUN_CONCURRENCY,
+) -> Dict[str, Any]:
+    """
+    Export a project (run table, configs, metadata and all scalar metrics) to a partitioned Parquet dataset.
+
+    Args:
+        backend: 数据后端；带缓存的后端会绕过缓存直接请求，避免导出挤占缓存
+        path: 项目路径，格式为 username/project_name
+        output_dir: 导出根目录
+        filters: 实验筛选条件，同 `Backend.runs`
+        concurrency: 同时导出的实验数
+
+    Returns:
+        导出结果字典：output_dir、total、exported、skipped、rows、errors
+    """
+    require_parquet()
+    if isinstance(backend, CachedBackend):
+        backend = backend.inner
+    root = project_dir(output_dir, path)
+    project, runs = await asyncio.gather(backend.project(path), backend.runs(path, filters))
+
+    def write_tables() -> None:
+        _write_atomic(
+            root / PROJECT_FILE,
+            lambda tmp: tmp.write_text(json.dumps(project, ensure_ascii=False, default=str), encoding="utf-8"),
+        )
+        table = runs_frame(runs)
+        _write_atomic(root / RUNS_FILE, lambda tmp: table.to_parquet(tmp, index=False))
+
+    await asyncio.to_thread(write_tables)
+
+    manifest = read_manifest(root)
+    pending = []
+    skipped = []
+    for run in runs:
+        done = manifest.get(run["id"])
+        # 有 key 获取失败的实验视为未完成，下次导出时重新获取
+        complete = done and done.get("state") == "FINISHED" and not done.get("errors")
+        if complete and partition_path(root, run["id"]).exists():
+            skipped.append(run["path"])
+        else:
+            pending.append(run)
+
+    run_slots = asyncio.Semaphore(concurrency)
+    key_slots = asyncio.Semaphore(EXPORT_KEY_CONCURRENCY)
+    exported: List[str] = []
+    errors: Dict[str, str] = {}
+    rows = 0
+    # manifest 的写入依次进行，后写入的总是包含之前所有已完成的实验
+    manifest_lock = asyncio.Lock()
+
+    async def export(run: Dict[str, Any]) -> None:
+        nonlocal rows
+        async with run_slots:
+            try:
+                entry = await _export_run(backend, root, run, key_slots)
+                # 分区写完后立即记入 manifest，中断后可从这里继续
+                async with manifest_lock:
+                    manifest[run["id"]] = entry
+                    await asyncio.to_thread(_write_manifest, root, dict(manifest))
+            except Exception as e:
+                errors[run["path"]] = str(e) or type(e).__name__
+                return
+        exported.append(run["path"])
+        rows += entry["rows"]
+        errors.update({f"{run['path']}:{key}": message for key, message in entry["errors"].items()})
+
+    await asyncio.gather(*(export(run) for run in pending))
+    logger.info("Exported %d runs of %s to %s (%d skipped)", len(exported), path, root, len(skipped))
+    return {
+        "output_dir": str(root),
+        "total": len(runs),
+        "exported": exported,
+        "skipped": skipped,
+        "rows": rows,
+        "errors": errors,
+    }
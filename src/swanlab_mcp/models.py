@@ -6,7 +6,7 @@
 from collections.abc import Mapping
 from typing import Any, Dict, List, Optional
 
-from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_validator
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter, field_validator
 
 from .utils import _normalize_to_dict, _normalize_to_list, _normalize_to_str
 
@@ -206,6 +206,152 @@ class MetricTable(BaseModel):
     keys: List[str] = Field(default_factory=list, description="请求的指标 key 列表")
     x_axis: str = Field(default="step", description="指标数据的 X 轴字段")
     sample: Optional[int] = Field(default=None, description="采样数量")
+    step_min: Optional[int] = Field(default=None, description="step 窗口下界（含）")
+    step_max: Optional[int] = Field(default=None, description="step 窗口上界（含）")
+    transform: Optional[str] = Field(default=None, description="指标值变换：ema、rolling_mean、rolling_median、diff")
+    transform_param: Optional[float] = Field(default=None, description="变换参数：ema 平滑权重或滚动窗口大小")
+    digits: Optional[int] = Field(default=None, description="数值保留的有效数字位数")
     columns: List[str] = Field(default_factory=list, description="返回数据的列名")
     rows: List[Dict[str, Any]] = Field(default_factory=list, description="指标数据行列表")
+    encoded: Optional[Dict[str, Any]] = Field(
+        default=None, description="紧凑编码的数据（x 轴为等差数列或差分，重复值为游程），设置时 rows 为空"
+    )
     total: int = Field(default=0, description="指标数据总行数")
+    errors: Dict[str, str] = Field(default_factory=dict, description="获取失败的指标 key 及错误信息，其余 key 正常返回")
+
+    # 列式行数据（`series.MetricRows`）；设置后 rows 为空，由 `JsonSerializer` 序列化时按块生成
+    _row_source: Any = PrivateAttr(default=None)
+
+    def stream_rows(self, rows: Any) -> "MetricTable":
+        """Attach column arrays whose rows are generated while serializing instead of stored in `rows`."""
+        self._row_source = rows
+        self.total = len(rows)
+        return self
+
+
+class MetricEvent(BaseModel):
+    """Anomaly event detected in a metric series.
+
+    指标序列中检测到的异常事件。
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    key: str = Field(default="", description="指标名称")
+    kind: str = Field(default="", description="事件类型：nan_onset、inf_onset、spike、plateau、divergence")
+    step: int = Field(default=0, description="事件开始的 step")
+    end_step: int = Field(default=0, description="事件结束的 step（含）")
+    value: Optional[float] = Field(default=None, description="事件的代表值，如尖峰峰值、平台期均值")
+    score: Optional[float] = Field(default=None, description="事件强度，如尖峰 z-score、相对变化")
+    count: int = Field(default=0, description="事件覆盖的数据点数")
+
+
+class MetricAnomalyReport(BaseModel):
+    """Anomaly detection result for a run.
+
+    实验指标异常检测结果。
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    path: str = Field(default="", description="实验路径，格式为 username/project_name/experiment_id")
+    keys: List[str] = Field(default_factory=list, description="检测的指标 key 列表")
+    maximize: List[str] = Field(default_factory=list, description="按越高越好判断发散的指标 key")
+    events: List[MetricEvent] = Field(default_factory=list, description="按 step 排序的异常事件列表")
+    total: int = Field(default=0, description="事件总数")
+    errors: Dict[str, str] = Field(default_factory=dict, description="获取失败的指标 key 及错误信息")
+
+
+class RunComparison(BaseModel):
+    """Metrics of several runs aligned on one axis.
+
+    多个实验的指标对齐结果：rows 为紧凑矩阵，每行第一列为对齐坐标，其余列依次对应 columns 中的 "<path>:<key>"。
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    paths: List[str] = Field(default_factory=list, description="参与对比的实验路径列表")
+    keys: List[str] = Field(default_factory=list, description="对比的指标 key 列表")
+    align: str = Field(default="step", description="对齐坐标：step、time（距实验开始的秒数）或 epoch")
+    points: int = Field(default=0, description="降采样网格点数")
+    tolerance: Optional[float] = Field(default=None, description="as-of join 的最大距离，超过时为 null")
+    digits: Optional[int] = Field(default=None, description="数值保留的有效数字位数")
+    columns: List[str] = Field(default_factory=list, description="矩阵列名，第一列为对齐坐标")
+    rows: List[List[Optional[float]]] = Field(default_factory=list, description="对齐后的指标矩阵")
+    encoded: Optional[Dict[str, Any]] = Field(
+        default=None, description="紧凑编码的矩阵（对齐坐标为等差数列或差分，重复值为游程），设置时 rows 为空"
+    )
+    total: int = Field(default=0, description="矩阵行数")
+    errors: Dict[str, str] = Field(default_factory=dict, description='获取失败的实验或 "<path>:<key>" 及错误信息')
+
+
+class ThroughputStall(BaseModel):
+    """Gap between two logged steps that took much longer than usual.
+
+    记录间隔异常长的停顿区间。
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    step: int = Field(default=0, description="停顿开始的 step")
+    end_step: int = Field(default=0, description="停顿结束后的下一个记录 step")
+    started_at: float = Field(default=0.0, description="停顿开始时间（距实验开始的秒数）")
+    duration_seconds: float = Field(default=0.0, description="两次记录之间的实际耗时（秒）")
+    expected_seconds: float = Field(default=0.0, description="按单步耗时中位数估计的正常耗时（秒）")
+
+
+class RunThroughput(BaseModel):
+    """Throughput and wall-clock analytics of a run.
+
+    基于指标时间戳计算的训练吞吐量统计。
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    path: str = Field(default="", description="实验路径，格式为 username/project_name/experiment_id")
+    key: str = Field(default="", description="用于计算的指标 key")
+    state: str = Field(default="", description="实验状态：FINISHED、RUNNING、CRASHED、ABORTED")
+    first_step: Optional[int] = Field(default=None, description="第一个记录的 step")
+    last_step: Optional[int] = Field(default=None, description="最后一个记录的 step")
+    started_at: Optional[float] = Field(default=None, description="第一个记录的 Unix 时间戳（秒）")
+    last_logged_at: Optional[float] = Field(default=None, description="最后一个记录的 Unix 时间戳（秒）")
+    elapsed_seconds: Optional[float] = Field(default=None, description="第一个到最后一个记录的耗时（秒）")
+    steps_per_second: Optional[float] = Field(default=None, description="整体平均吞吐量（steps/sec）")
+    recent_steps_per_second: Optional[float] = Field(default=None, description="最后 10% 记录点的吞吐量")
+    rate_columns: List[str] = Field(default_factory=lambda: ["time", "steps_per_second"], description="吞吐量曲线的列名")
+    rate: List[List[float]] = Field(default_factory=list, description="按时间等分的吞吐量曲线，time 为距实验开始的秒数")
+    stalls: List[ThroughputStall] = Field(default_factory=list, description="按时间排序的停顿列表")
+    stall_seconds: float = Field(default=0.0, description="所有停顿超出正常耗时的总秒数")
+    target_step: Optional[int] = Field(default=None, description="目标 step")
+    eta_seconds: Optional[float] = Field(
+        default=None, description="按近期吞吐量估算到达目标 step 的剩余秒数（仅 RUNNING）"
+    )
+    estimated_finish_at: Optional[float] = Field(default=None, description="预计到达目标 step 的 Unix 时间戳（秒）")
+    idle_seconds: Optional[float] = Field(
+        default=None, description="距最后一次记录的秒数（仅 RUNNING），过大可能表示卡住"
+    )
+
+
+class ProjectExport(BaseModel):
+    """Result of a project export to a Parquet dataset.
+
+    项目导出结果，已导出且状态为 FINISHED 的实验会被跳过。
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    path: str = Field(default="", description="项目路径，格式为 username/project_name")
+    output_dir: str = Field(default="", description="项目导出目录")
+    total: int = Field(default=0, description="匹配的实验总数")
+    exported: List[str] = Field(default_factory=list, description="本次导出的实验路径")
+    skipped: List[str] = Field(default_factory=list, description="已导出且已结束、本次跳过的实验路径")
+    rows: int = Field(default=0, description="本次写入的指标记录数")
+    errors: Dict[str, str] = Field(
+        default_factory=dict, description="导出失败的实验或指标（`path` 或 `path:key`）-> 错误信息"
+    )
+
+
+# 批量列表的校验器：整个列表一次性校验和导出，避免逐条构造模型再 model_dump()
+WORKSPACE_LIST_ADAPTER = TypeAdapter(List[Workspace])
+PROJECT_LIST_ADAPTER = TypeAdapter(List[Project])
+RUN_LIST_ADAPTER = TypeAdapter(List[Run])
@@ -0,0 +1,61 @@
+"""Background prefetching of likely follow-up requests.
+
+列出实验后，智能体通常会接着查询前几个实验的配置和指标键名。
+预取器在后台为前 K 个实验预热实验详情和指标列缓存，且只在没有实时请求时发起上游请求。
+"""
+
+import asyncio
+import logging
+from typing import List, Set
+
+from .backends import CachedBackend
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """Warm run and metric column caches for the first runs of a listing."""
+
+    def __init__(self, top_k: int, concurrency: int):
+        self.top_k = top_k
+        self.concurrency = concurrency
+        self._pending: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def schedule(self, backend: CachedBackend, paths: List[str]) -> None:
+        """
+        Start warming the caches of the first `top_k` runs in the background.
+
+        Args:
+            backend: 带缓存的后端
+            paths: 按列表顺序排列的实验路径
+        """
+        paths = [path for path in paths[: self.top_k] if path not in self._pending]
+        if not paths:
+            return
+        self._pending.update(paths)
+        task = asyncio.get_running_loop().create_task(self._warm(backend, paths))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def aclose(self) -> None:
+        """Cancel prefetches that are still running."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _warm(self, backend: CachedBackend, paths: List[str]) -> None:
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def warm(path: str) -> None:
+            async with slots:
+                # 低优先级：等待实时请求全部完成后再请求上游
+                await backend.wait_idle()
+                try:
+                    await asyncio.gather(backend.run(path), backend.metric_columns(path))
+                except Exception as e:
+                    logger.debug("Prefetching %s failed: %s", path, e)
+                finally:
+                    self._pending.discard(path)
+
+        await asyncio.gather(*(warm(path) for path in paths))
@@ -0,0 +1,218 @@
+"""Subscribable MCP resources for live runs.
+
+实验以 `swanlab://run/{username}/{project}/{experiment_id}/metrics` 资源的形式提供。
+每个被订阅的实验只有一个后台 watcher 按固定间隔轮询上游的指标概要（一次请求），
+仅在出现新的 step 或状态变化时向所有订阅者发送 `notifications/resources/updated`。
+`swanlab://server/upstream` 报告上游限流、重试、熔断、过期数据和请求对冲的计数。
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.session import ServerSession
+from pydantic import AnyUrl
+
+from .api import LazyApi
+from .serialization import JsonSerializer
+from .utils import validate_run_path
+
+logger = logging.getLogger(__name__)
+
+RUN_METRICS_URI = "swanlab://run/{username}/{project}/{experiment_id}/metrics"
+RUN_METRICS_URI_PATTERN = re.compile(r"^swanlab://run/([^/]+)/([^/]+)/([^/]+)/metrics$")
+UPSTREAM_STATS_URI = "swanlab://server/upstream"
+
+# 进入这些状态后实验不会再产生新数据，watcher 停止轮询
+FINAL_RUN_STATES = {"FINISHED", "CRASHED", "ABORTED"}
+
+
+def run_path_from_uri(uri: str) -> str:
+    """Extract `username/project/experiment_id` from a run metrics resource URI."""
+    match = RUN_METRICS_URI_PATTERN.match(uri)
+    if match is None:
+        raise ValueError(f"Unsupported resource URI '{uri}', expected {RUN_METRICS_URI}")
+    return validate_run_path("/".join(match.groups()))
+
+
+class RunWatcher:
+    """Background poller of one run shared by all of its subscribers."""
+
+    def __init__(self, uri: str, path: str):
+        self.uri = uri
+        self.path = path
+        self.sessions: Set[ServerSession] = set()
+        self.task: Optional[asyncio.Task] = None
+        self.snapshot: Optional[Dict[str, Any]] = None
+
+
+class RunSubscriptions:
+    """Manage resource subscriptions with one watcher per subscribed run.
+
+    N 个订阅者只对应一次上游轮询；没有订阅者时 watcher 自动停止。
+    """
+
+    def __init__(self, api: LazyApi, interval: float):
+        self.api = api
+        self.interval = interval
+        self._watchers: Dict[str, RunWatcher] = {}
+
+    async def snapshot(self, path: str, fresh: bool = False) -> Dict[str, Any]:
+        """
+        Fetch the current state and the latest value of every metric of a run.
+
+        Args:
+            path: 实验路径，格式为 username/project_name/experiment_id
+            fresh: 是否丢弃缓存的实验详情，直接读取上游的当前状态
+
+        Returns:
+            包含实验状态、最新 step 和各指标最新值/最小值/最大值的字典
+        """
+        backend = await self.api.get()
+        if fresh:
+            backend.forget_run(path)
+        run_data, summary = await asyncio.gather(backend.run(path), backend.metric_summary(path))
+        steps = [entry["step"] for entry in summary.values() if entry.get("step") is not None]
+        return {
+            "path": path,
+            "state": run_data.get("state") or "",
+            "last_step": max(steps) if steps else None,
+            "metrics": summary,
+            "checked_at": time.time(),
+        }
+
+    async def subscribe(self, uri: str, session: ServerSession) -> None:
+        """Add a subscriber, starting the run's watcher if it is the first one."""
+        path = run_path_from_uri(uri)
+        watcher = self._watchers.get(uri)
+        if watcher is None:
+            watcher = self._watchers[uri] = RunWatcher(uri, path)
+        watcher.sessions.add(session)
+        if watcher.task is None or watcher.task.done():
+            watcher.task = asyncio.get_running_loop().create_task(self._watch(watcher))
+
+    async def unsubscribe(self, uri: str, session: ServerSession) -> None:
+        """Remove a subscriber, stopping the run's watcher once nobody listens."""
+        watcher = self._watchers.get(uri)
+        if watcher is None:
+            return
+        watcher.sessions.discard(session)
+        if not watcher.sessions:
+            self._stop(watcher)
+
+    async def aclose(self) -> None:
+        """Stop all watchers."""
+        for watcher in list(self._watchers.values()):
+            self._stop(watcher)
+
+    def _stop(self, watcher: RunWatcher) -> None:
+        self._watchers.pop(watcher.uri, None)
+        if watcher.task is not None:
+            watcher.task.cancel()
+
+    @staticmethod
+    def _fingerprint(snapshot: Dict[str, Any]) -> Tuple[Any, ...]:
+        steps = tuple(sorted((key, entry.get("step")) for key, entry in snapshot["metrics"].items()))
+        return snapshot["state"], steps
+
+    async def _watch(self, watcher: RunWatcher) -> None:
+        previous: Optional[Tuple[Any, ...]] = None
+        try:
+            while watcher.sessions:
+                try:
+                    # 实验详情按 TTL 缓存：每次轮询都读取当前状态，否则不产生新 step 的状态变化要等缓存过期才能发现
+                    snapshot = await self.snapshot(watcher.path, fresh=True)
+                    fingerprint = self._fingerprint(snapshot)
+                    watcher.snapshot = snapshot
+                    if previous is not None and fingerprint != previous:
+                        # 新数据到达：丢弃本地缓存的旧序列，再通知订阅者重新读取
+                        (await self.api.get()).invalidate(watcher.path)
+                        await self._notify(watcher)
+                    previous = fingerprint
+                    if snapshot["state"] in FINAL_RUN_STATES:
+                        break
+                except Exception as e:
+                    logger.warning("Polling %s failed: %s", watcher.uri, e)
+                await asyncio.sleep(self.interval)
+        finally:
+            # 实验结束或订阅者全部断开后移除 watcher；重新订阅时会创建新的 watcher
+            if self._watchers.get(watcher.uri) is watcher:
+                del self._watchers[watcher.uri]
+
+    async def _notify(self, watcher: RunWatcher) -> None:
+        uri = AnyUrl(watcher.uri)
+        for session in list(watcher.sessions):
+            try:
+                await session.send_resource_updated(uri)
+            except Exception as e:
+                # 会话已关闭，移除订阅者
+                logger.debug("Dropping subscriber of %s: %s", watcher.uri, e)
+                watcher.sessions.discard(session)
+
+
+def register_run_resources(mcp: FastMCP, subscriptions: RunSubscriptions, serializer: JsonSerializer) -> None:
+    """
+    Register run resources and the subscribe/unsubscribe handlers.
+
+    Args:
+        mcp: FastMCP server instance
+        subscriptions: Shared subscription manager
+        serializer: JSON serializer for resource contents
+    """
+    server = mcp._mcp_server
+
+    @mcp.resource(
+        RUN_METRICS_URI,
+        name="swanlab_run_metrics",
+        description="Live state and latest metric values of a run (experiment). Subscribe to get notified when new "
+        "steps are logged or the run state changes, then read it again or call swanlab_get_run_metrics. "
+        "实验的实时状态和各指标最新值。订阅后在记录新的 step 或状态变化时收到通知。",
+        mime_type="application/json",
+    )
+    async def run_metrics(username: str, project: str, experiment_id: str) -> str:
+        snapshot = await subscriptions.snapshot(validate_run_path(f"{username}/{project}/{experiment_id}"))
+        return serializer.dumps(snapshot).decode()
+
+    @server.subscribe_resource()
+    async def subscribe(uri: AnyUrl) -> None:
+        await subscriptions.subscribe(str(uri), server.request_context.session)
+
+    @server.unsubscribe_resource()
+    async def unsubscribe(uri: AnyUrl) -> None:
+        await subscriptions.unsubscribe(str(uri), server.request_context.session)
+
+    # FastMCP 固定声明 resources.subscribe=False，注册订阅处理函数后改为声明支持订阅
+    get_capabilities = server.get_capabilities
+
+    def get_capabilities_with_subscribe(*args: Any, **kwargs: Any) -> Any:
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    server.get_capabilities = get_capabilities_with_subscribe
+
+
+def register_server_resources(mcp: FastMCP, api: LazyApi, serializer: JsonSerializer) -> None:
+    """
+    Register resources reporting the state of the server itself.
+
+    Args:
+        mcp: FastMCP server instance
+        api: Shared lazily warmed SwanLab Api
+        serializer: JSON serializer for resource contents
+    """
+
+    @mcp.resource(
+        UPSTREAM_STATS_URI,
+        name="swanlab_upstream_stats",
+        description="Upstream request metrics: current adaptive concurrency limit, rate limit, in-flight requests, "
+        "throttled (429/5xx) responses, retries, open circuits, stale results served and request hedging. "
+        "上游请求指标：当前自适应并发上限、速率上限、进行中的请求数、被限流次数、重试次数、熔断状态、过期数据返回次数和请求对冲。",
+        mime_type="application/json",
+    )
+    async def upstream_stats() -> str:
+        return serializer.dumps(api.stats()).decode()
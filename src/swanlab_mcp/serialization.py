@@ -0,0 +1,95 @@
+"""JSON serialization for tool outputs.
+
+工具输出的快速 JSON 序列化：直接由 pydantic-core 序列化模型，不经过 model_dump() 中间字典，
+并严格处理 NaN/±Inf（标准 JSON 不支持这些值）。
+结果中含有上游失败时返回的过期缓存数据时，附加 `stale: true` 标记。
+带有列式行数据（`_row_source`）的模型按块生成 rows 并直接写入输出缓冲区，不构造完整的行字典列表。
+"""
+
+from typing import Any, Dict, Literal, Tuple
+
+from mcp.types import CallToolResult, TextContent
+from pydantic import BaseModel
+from pydantic_core import SchemaSerializer, core_schema, to_json
+
+from .cache import stale_age
+
+InfNanMode = Literal["null", "strings"]
+
+# 流式序列化时每块的行数
+ROW_CHUNK_SIZE = 4096
+# 模型中 rows 为空列表时的序列化结果；JSON 字符串中的引号总是被转义，该片段只可能是 rows 字段本身
+EMPTY_ROWS = b'"rows":[]'
+
+
+class JsonSerializer:
+    """Serialize tool outputs to compact JSON.
+
+    NaN/±Inf 的处理方式由 `inf_nan_mode` 决定：
+    - null: 输出为 null（默认）
+    - strings: 输出为 "NaN"、"Infinity"、"-Infinity" 哨兵字符串
+    """
+
+    def __init__(self, inf_nan_mode: InfNanMode = "null"):
+        self.inf_nan_mode = inf_nan_mode
+        self._serializers: Dict[Tuple[type, bool], SchemaSerializer] = {}
+
+    def _serializer_for(self, model_cls: type, many: bool) -> SchemaSerializer:
+        # 用模型自身的 core schema 构建序列化器，并覆盖 NaN/Inf 处理配置
+        key = (model_cls, many)
+        serializer = self._serializers.get(key)
+        if serializer is None:
+            schema = model_cls.__pydantic_core_schema__
+            if many:
+                schema = core_schema.list_schema(schema)
+            serializer = SchemaSerializer(schema, {"ser_json_inf_nan": self.inf_nan_mode})
+            self._serializers[key] = serializer
+        return serializer
+
+    def dumps(self, value: Any) -> bytes:
+        """Serialize a pydantic model, a list of models or plain data to JSON bytes."""
+        if isinstance(value, BaseModel):
+            data = self._serializer_for(type(value), False).to_json(value, fallback=str)
+            row_source = getattr(value, "_row_source", None)
+            return data if row_source is None else self._splice_rows(data, row_source)
+        if isinstance(value, list) and value and all(type(item) is type(value[0]) for item in value):
+            if isinstance(value[0], BaseModel):
+                return self._serializer_for(type(value[0]), True).to_json(value, fallback=str)
+        return to_json(value, inf_nan_mode=self.inf_nan_mode, fallback=str)
+
+    def _splice_rows(self, data: bytes, rows: Any) -> bytes:
+        """Serialize streamed rows chunk by chunk into the `rows` field of an already serialized model.
+
+        Raises:
+            ValueError: 输出超过 `rows.max_bytes` 时
+        """
+        position = data.index(EMPTY_ROWS) + len(EMPTY_ROWS) - 1
+        out = bytearray(data[:position])
+        first = True
+        for chunk in rows.chunks(ROW_CHUNK_SIZE):
+            encoded = to_json(chunk, inf_nan_mode=self.inf_nan_mode, fallback=str)
+            if not first:
+                out += b","
+            out += encoded[1:-1]
+            first = False
+            if rows.max_bytes is not None and len(out) > rows.max_bytes:
+                raise ValueError(
+                    f"Metric rows exceed the per-request limit of {rows.max_bytes // (1024 * 1024)} MiB; "
+                    "narrow the query with step_min/step_max, sample or fewer keys"
+                )
+        out += data[position:]
+        return bytes(out)
+
+    def tool_result(self, value: Any) -> CallToolResult:
+        """Wrap a tool output as a JSON text content block.
+
+        当前请求返回了过期数据时，在 `_meta` 和第二个文本块中附加
+        `{"stale": true, "stale_age_seconds": ...}`，结果本身的结构不变。
+        """
+        content = [TextContent(type="text", text=self.dumps(value).decode())]
+        age = stale_age()
+        if age is None:
+            return CallToolResult(content=content)
+        marker = {"stale": True, "stale_age_seconds": round(age, 1)}
+        content.append(TextContent(type="text", text=self.dumps(marker).decode()))
+        return CallToolResult(content=content, _meta=marker)
@@ -0,0 +1,312 @@
+"""Metric series processing.
+
+指标序列的合并与整理：每个 key 的序列单独获取，再以 step 为索引做向量化的有序外连接；
+平滑、差分等变换在合并和采样之前对完整序列计算；多个实验按 step、相对时间或 epoch 对齐。
+查询结果以列式数组（`MetricRows`）交给序列化，按块生成行，不展开为完整的记录列表。
+"""
+
+from typing import Any, Dict, Iterator, List, Literal, Optional, Sequence, Tuple, get_args
+
+import numpy as np
+import pandas as pd
+
+from .encoding import encode_columns, round_significant
+
+STEP_INDEX = "step"
+
+MetricTransform = Literal["ema", "rolling_mean", "rolling_median", "diff"]
+METRIC_TRANSFORMS = get_args(MetricTransform)
+
+AlignAxis = Literal["step", "time", "epoch"]
+
+# 大于该值的时间戳视为毫秒（约为 1973 年的秒级时间戳）
+MILLISECOND_TIMESTAMP_THRESHOLD = 1e11
+
+# 估算 JSON 大小时每个单元格值的字节数；取偏小的值，只提前拒绝明显超限的请求，精确限制由序列化时检查
+JSON_CELL_BYTES = 8
+
+# TensorBoard 平滑滑块的默认值
+DEFAULT_EMA_WEIGHT = 0.6
+DEFAULT_ROLLING_WINDOW = 10
+
+
+def normalize_series(df: pd.DataFrame) -> pd.DataFrame:
+    """Make the step index sorted and unique so frames can be aligned without hashing."""
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind="stable")
+    if df.index.has_duplicates:
+        # 同一 step 重复记录时保留最后一次写入的值
+        df = df[~df.index.duplicated(keep="last")]
+    return df.rename_axis(STEP_INDEX)
+
+
+def window_series(df: pd.DataFrame, step_min: Optional[int] = None, step_max: Optional[int] = None) -> pd.DataFrame:
+    """
+    Slice a series to the closed step range `[step_min, step_max]`.
+
+    在有序 step 索引上二分查找边界，不扫描整个序列；边界为 None 表示不限制。
+    """
+    if step_min is None and step_max is None:
+        return df
+    df = normalize_series(df)
+    start = 0 if step_min is None else int(df.index.searchsorted(step_min, side="left"))
+    stop = len(df) if step_max is None else int(df.index.searchsorted(step_max, side="right"))
+    return df.iloc[start:stop]
+
+
+def merge_series(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Outer-join per-key metric frames on their step index.
+
+    所有序列的 step 先合并为一个有序索引，再将各序列对齐到该索引后按列拼接；
+    step 完全相同的序列直接复用，不做重新索引。
+
+    Args:
+        frames: 每个 key 一个 DataFrame，索引为 step
+
+    Returns:
+        按 step 升序排列的合并结果，缺失值为 NaN
+    """
+    if not frames:
+        return pd.DataFrame(index=pd.Index([], name=STEP_INDEX))
+    normalized: List[pd.DataFrame] = [normalize_series(df) for df in frames]
+    index = normalized[0].index
+    for df in normalized[1:]:
+        if not index.equals(df.index):
+            index = index.union(df.index)
+    aligned = [df if df.index.equals(index) else df.reindex(index) for df in normalized]
+    return pd.concat(aligned, axis=1).rename_axis(STEP_INDEX)
+
+
+def head_cut(frames: Sequence[pd.DataFrame], limit: int) -> Optional[int]:
+    """
+    Largest step that can appear in the first `limit` rows of the outer join of `frames`.
+
+    合并结果的第 `limit` 个 step 不会大于任何一个序列自身的第 `limit` 个 step，
+    合并前按该 step 截断各序列，只取前几行时无需合并完整序列。
+
+    Returns:
+        截断用的 step 上界；所有序列都不足 `limit` 行时返回 None
+    """
+    cuts = [df.index[limit - 1] for df in frames if len(df) >= limit]
+    return int(min(cuts)) if cuts else None
+
+
+class MetricRows:
+    """Rows of a metric table kept as contiguous column arrays.
+
+    step 列为 int64，数值列为 float64，无法转换为数值的列保留为 object 数组；
+    `chunks()` 每次只生成一块行字典，序列化的峰值内存与数据量成正比而不是与行字典数成正比。
+    """
+
+    def __init__(self, columns: List[str], arrays: List[np.ndarray], max_bytes: Optional[int] = None):
+        self.columns = columns
+        self.arrays = arrays
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, max_bytes: Optional[int] = None) -> "MetricRows":
+        """Take the step index and every column of a merged frame without copying float columns."""
+        columns = [str(df.index.name or STEP_INDEX)]
+        arrays = [_column_array(df.index.to_numpy())]
+        for name in df.columns:
+            columns.append(str(name))
+            arrays.append(_column_array(df[name].to_numpy()))
+        return cls(columns, arrays, max_bytes)
+
+    def __len__(self) -> int:
+        return len(self.arrays[0]) if self.arrays else 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column arrays."""
+        return sum(array.nbytes for array in self.arrays)
+
+    def estimated_json_bytes(self) -> int:
+        """Conservative size of the serialized rows, used to reject oversized requests before serializing them."""
+        return len(self) * (2 + sum(len(name) + 4 + JSON_CELL_BYTES for name in self.columns))
+
+    def rounded(self, digits: int) -> "MetricRows":
+        """Copy with the value columns rounded to `digits` significant digits.
+
+        x 轴列和 `<key>_timestamp` 列保持原值：取整会把不同的时间戳合并为同一个值。
+        """
+        arrays = [
+            array if index == 0 or name.endswith("_timestamp") else round_significant(array, digits)
+            for index, (name, array) in enumerate(zip(self.columns, self.arrays))
+        ]
+        return MetricRows(self.columns, arrays, self.max_bytes)
+
+    def encoded(self) -> Dict[str, Any]:
+        """Compact encoding of the table, see `encoding.encode_columns`."""
+        return encode_columns(self.columns, self.arrays)
+
+    def chunks(self, size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the rows as dicts, at most `size` rows at a time."""
+        for start in range(0, len(self), size):
+            values = [array[start : start + size].tolist() for array in self.arrays]
+            yield [dict(zip(self.columns, row)) for row in zip(*values)]
+
+
+def _column_array(values: np.ndarray) -> np.ndarray:
+    if values.dtype.kind in "iu":
+        return values.astype(np.int64, copy=False)
+    if values.dtype.kind == "f":
+        return values.astype(np.float64, copy=False)
+    return values
+
+
+def use_x_axis(df: pd.DataFrame, x_axis: str) -> pd.DataFrame:
+    """
+    Re-key a merged frame on a metric used as the x axis, matching `Experiment.metrics`.
+
+    时间戳列会被丢弃，x 轴指标移到第一列，并去掉 x 轴为空的行。
+
+    Raises:
+        ValueError: If the x axis column is missing.
+    """
+    if x_axis not in df.columns:
+        raise ValueError(f"x_axis '{x_axis}' not found in metric data")
+    values = [c for c in df.columns if c != x_axis and not str(c).endswith("_timestamp")]
+    return df[[x_axis, *values]].dropna(subset=[x_axis])
+
+
+def _ema(values: np.ndarray, weight: float) -> np.ndarray:
+    # 与 SwanLab / TensorBoard 平滑滑块一致的去偏 EMA：非有限值不参与平滑，原样保留
+    finite = np.isfinite(values)
+    smoothed = pd.Series(np.where(finite, values, np.nan)).ewm(alpha=1 - weight, adjust=True, ignore_na=True).mean()
+    return np.where(finite, smoothed.to_numpy(), values)
+
+
+def _diff(values: np.ndarray) -> np.ndarray:
+    out = np.empty_like(values)
+    if len(values):
+        out[0] = np.nan
+        np.subtract(values[1:], values[:-1], out=out[1:])
+    return out
+
+
+def transform_series(df: pd.DataFrame, key: str, transform: str, param: Optional[float] = None) -> pd.DataFrame:
+    """
+    Apply a smoothing or derivative transform to the value column of one series.
+
+    Args:
+        df: 单个 key 的序列，索引为 step
+        key: 要变换的值列
+        transform: 变换类型，见 `METRIC_TRANSFORMS`
+        param: ema 的平滑权重（0 <= weight < 1，默认 0.6），或 rolling_* 的窗口大小（默认 10）
+
+    Returns:
+        值列被替换为变换结果的新 DataFrame，不修改传入的 DataFrame
+    """
+    df = normalize_series(df)
+    values = df[key].to_numpy(dtype=np.float64)
+    if transform == "ema":
+        weight = DEFAULT_EMA_WEIGHT if param is None else float(param)
+        if not 0 <= weight < 1:
+            raise ValueError("ema weight must be in [0, 1).")
+        result = _ema(values, weight)
+    elif transform in ("rolling_mean", "rolling_median"):
+        window = DEFAULT_ROLLING_WINDOW if param is None else param
+        if window < 1 or int(window) != window:
+            raise ValueError("rolling window must be a positive integer.")
+        rolling = pd.Series(values).rolling(int(window), min_periods=1)
+        result = (rolling.mean() if transform == "rolling_mean" else rolling.median()).to_numpy()
+    elif transform == "diff":
+        result = _diff(values)
+    else:
+        raise ValueError(f"Unknown transform '{transform}', expected one of {', '.join(METRIC_TRANSFORMS)}")
+    return df.assign(**{key: result})
+
+
+def timestamp_seconds(values: np.ndarray) -> np.ndarray:
+    """Convert logged `<key>_timestamp` values to seconds, accepting both seconds and milliseconds."""
+    values = np.asarray(values, dtype=np.float64)
+    finite = values[np.isfinite(values)]
+    if len(finite) and np.median(finite) > MILLISECOND_TIMESTAMP_THRESHOLD:
+        return values / 1000
+    return values
+
+
+def axis_values(
+    df: pd.DataFrame,
+    key: str,
+    align: AlignAxis,
+    epochs: Optional[pd.DataFrame] = None,
+    epoch_key: str = "epoch",
+) -> np.ndarray:
+    """
+    Compute the alignment coordinate of every point of a series.
+
+    Args:
+        df: 单个 key 的序列，索引为 step
+        key: 值列名
+        align: step 使用 step；time 使用 `<key>_timestamp`（秒，绝对时间）；epoch 使用 epoch 指标
+        epochs: align 为 epoch 时 epoch 指标的序列；每个点取不晚于该 step 的最近一次 epoch 记录（as-of join）
+        epoch_key: epoch 指标的列名
+
+    Returns:
+        与 df 行一一对应的 float64 坐标数组
+    """
+    if align == "step":
+        return df.index.to_numpy(dtype=np.float64)
+    if align == "time":
+        return timestamp_seconds(df[f"{key}_timestamp"].to_numpy())
+    if epochs is None:
+        raise ValueError("epoch alignment requires the epoch series")
+    left = pd.DataFrame({STEP_INDEX: df.index.to_numpy(dtype=np.float64)})
+    right = pd.DataFrame(
+        {STEP_INDEX: epochs.index.to_numpy(dtype=np.float64), "epoch": epochs[epoch_key].to_numpy(dtype=np.float64)}
+    )
+    return pd.merge_asof(left, right, on=STEP_INDEX, direction="backward")["epoch"].to_numpy()
+
+
+def align_curves(
+    curves: Sequence[Tuple[np.ndarray, np.ndarray]],
+    points: int,
+    tolerance: Optional[float] = None,
+    integer: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    As-of join several `(x, y)` curves onto one evenly spaced grid.
+
+    网格覆盖所有曲线的 x 范围，共 `points` 个点；每个网格点取各曲线中 x 最近的点，
+    距离超过 `tolerance`（默认为一个网格间距）时记为 NaN。x 重复的点先取均值。
+
+    Args:
+        curves: (x, y) 数组对列表
+        points: 网格点数，即降采样后的行数
+        tolerance: as-of join 的最大距离
+        integer: 网格是否取整（按 step 对齐时使用）
+
+    Returns:
+        (grid, matrix)，matrix 的形状为 (len(grid), len(curves))
+    """
+    cleaned = []
+    for x, y in curves:
+        keep = np.isfinite(x)
+        frame = pd.DataFrame({"x": x[keep], "y": y[keep]})
+        if frame["x"].duplicated().any():
+            frame = frame.groupby("x", as_index=False, sort=True)["y"].mean()
+        elif not frame["x"].is_monotonic_increasing:
+            frame = frame.sort_values("x", kind="stable")
+        cleaned.append(frame)
+
+    non_empty = [frame["x"] for frame in cleaned if len(frame)]
+    if not non_empty:
+        return np.empty(0), np.empty((0, len(curves)))
+    lo = min(float(x.iloc[0]) for x in non_empty)
+    hi = max(float(x.iloc[-1]) for x in non_empty)
+    grid = np.linspace(lo, hi, points) if hi > lo else np.array([lo])
+    if integer:
+        grid = np.unique(np.round(grid))
+    spacing = (hi - lo) / (points - 1) if points > 1 else hi - lo
+    tolerance = spacing if tolerance is None else tolerance
+
+    left = pd.DataFrame({"x": grid})
+    matrix = np.full((len(grid), len(curves)), np.nan)
+    for i, frame in enumerate(cleaned):
+        if len(frame):
+            joined = pd.merge_asof(left, frame, on="x", direction="nearest", tolerance=tolerance)
+            matrix[:, i] = joined["y"].to_numpy(dtype=np.float64)
+    return grid, matrix
@@ -1,19 +1,35 @@
 """SwanLab MCP Server."""
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from mcp.server.fastmcp import FastMCP
-from swanlab import Api
 
+from .api import LazyApi
 from .config import get_config
 from .meta.info import get_server_name_with_version
+from .resources import RunSubscriptions, register_run_resources, register_server_resources
+from .serialization import JsonSerializer
 from .tools import register_metric_tools, register_project_tools, register_run_tools, register_workspace_tools
 
 
-def create_mcp_server():
+def create_mcp_server(offline_dir: str | None = None):
     # Load configuration
-    config = get_config()
-
-    # Initialize SwanLab API
-    swanlab_api = Api(api_key=config.api_key, host=config.host)
+    config = get_config(offline_dir)
+
+    # SwanLab API is constructed in the background once the server starts serving
+    swanlab_api = LazyApi(config)
+    serializer = JsonSerializer(config.json_inf_nan)
+    subscriptions = RunSubscriptions(swanlab_api, config.run_watch_interval)
+
+    @asynccontextmanager
+    async def lifespan(_: FastMCP) -> AsyncIterator[None]:
+        swanlab_api.start()
+        try:
+            yield
+        finally:
+            await subscriptions.aclose()
+            await swanlab_api.aclose()
 
     # Initialize MCP server
     mcp = FastMCP(
@@ -26,14 +42,22 @@ def create_mcp_server():
         - Query project metadata and project runs
         - Query run metadata, config, requirements and environment profile
         - Query run metrics as structured tables
+        - Subscribe to swanlab://run/{username}/{project}/{experiment_id}/metrics resources for live runs
 
-        All operations require a valid SWANLAB_API_KEY set in the environment.
+        All operations require a valid SWANLAB_API_KEY set in the environment, unless the server
+        runs in offline mode, where the same tools answer from a local snapshot exported by
+        swanlab_export_project.
         """,
+        lifespan=lifespan,
     )
 
     # Register all tools
-    register_workspace_tools(mcp, swanlab_api)
-    register_project_tools(mcp, swanlab_api)
-    register_run_tools(mcp, swanlab_api)
-    register_metric_tools(mcp, swanlab_api)
+    register_workspace_tools(mcp, swanlab_api, serializer)
+    register_project_tools(mcp, swanlab_api, serializer, config.export_dir)
+    register_run_tools(mcp, swanlab_api, serializer)
+    register_metric_tools(mcp, swanlab_api, serializer)
+
+    # Register resources
+    register_run_resources(mcp, subscriptions, serializer)
+    register_server_resources(mcp, swanlab_api, serializer)
     return mcp
@@ -3,23 +3,59 @@
 指标管理工具，用于获取实验的指标数据。
 """
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
+import numpy as np
 from mcp.server.fastmcp import FastMCP
-from mcp.types import ToolAnnotations
-from swanlab import Api
+from mcp.types import CallToolResult, ToolAnnotations
 
-from ..models import MetricKey, MetricKeyList, MetricTable
+from ..analysis import (
+    DEFAULT_ANOMALY_WINDOW,
+    DEFAULT_DIVERGENCE_RATIO,
+    DEFAULT_PLATEAU_TOLERANCE,
+    DEFAULT_SPIKE_SIGMA,
+    DEFAULT_STALL_FACTOR,
+    DEFAULT_THROUGHPUT_POINTS,
+    detect_anomalies,
+    throughput_stats,
+)
+from ..api import LazyApi
+from ..backends import Backend
+from ..constants import DEFAULT_COMPARE_POINTS, METRIC_FETCH_CONCURRENCY
+from ..encoding import encode_columns, encoded_cells, round_significant, validate_digits
+from ..models import MetricAnomalyReport, MetricKey, MetricKeyList, MetricTable, RunComparison, RunThroughput
+from ..serialization import JsonSerializer
+from ..series import (
+    JSON_CELL_BYTES,
+    STEP_INDEX,
+    AlignAxis,
+    MetricRows,
+    MetricTransform,
+    align_curves,
+    axis_values,
+    head_cut,
+    merge_series,
+    normalize_series,
+    transform_series,
+    use_x_axis,
+    window_series,
+)
 from ..utils import validate_run_path
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class MetricTools:
     """SwanLab Metric (指标) management tools.
 
-    获取实验的指标数据，返回 pandas DataFrame 格式的数据。
+    获取实验的指标数据。每个 key 单独并发获取后按 step 合并，单个 key 失败不影响其余 key。
+    查询结果以列式数组返回并在序列化时按块生成行，单次请求的输出大小受 `METRIC_REQUEST_MAX_MB` 限制。
     """
 
-    def __init__(self, api: Api):
+    def __init__(self, api: LazyApi):
         self.api = api
 
     async def list_run_metric_keys(self, path: str) -> MetricKeyList:
@@ -33,10 +69,9 @@ class MetricTools:
             MetricKeyList containing all metric keys with their types and classes.
         """
         try:
+            backend = await self.api.get()
             normalized_path = validate_run_path(path)
-            run = self.api.run(path=normalized_path)
-            columns_resp, _ = run._client.get(f"/experiment/{run.id}/column", params={"all": True})
-            columns = columns_resp.get("list", [])
+            columns = await backend.metric_columns(normalized_path)
 
             metric_keys = [
                 MetricKey(
@@ -56,12 +91,49 @@ class MetricTools:
         except Exception as e:
             raise RuntimeError(f"Failed to list metric keys for run '{path}': {str(e)}") from e
 
+    async def _fetch_series(
+        self, backend: Backend, path: str, keys: List[str]
+    ) -> Tuple[Dict[str, "pd.DataFrame"], Dict[str, str]]:
+        """Fetch each key concurrently; failures are collected per key instead of failing the request."""
+        errors: Dict[str, str] = {}
+        if not keys:
+            return {}, errors
+        # 列表中标记了 error 的指标无法下载，直接记为失败，不再请求
+        column_errors = {col.get("key"): col.get("error") for col in await backend.metric_columns(path)}
+        for key in keys:
+            if column_errors.get(key):
+                errors[key] = f"Metric column has an error: {column_errors[key]}"
+
+        slots = asyncio.Semaphore(METRIC_FETCH_CONCURRENCY)
+
+        async def fetch(key: str) -> "pd.DataFrame":
+            async with slots:
+                return await backend.metric_series(path, key)
+
+        pending = [key for key in keys if key not in errors]
+        results = await asyncio.gather(*(fetch(key) for key in pending), return_exceptions=True)
+        series: Dict[str, "pd.DataFrame"] = {}
+        for key, result in zip(pending, results):
+            if isinstance(result, Exception):
+                errors[key] = str(result) or type(result).__name__
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                series[key] = result
+        return series, errors
+
     async def get_run_metrics(
         self,
         path: str,
         keys: Optional[List[str]] = None,
         x_axis: str = "step",
         sample: Optional[int] = None,
+        step_min: Optional[int] = None,
+        step_max: Optional[int] = None,
+        transform: Optional[MetricTransform] = None,
+        transform_param: Optional[float] = None,
+        digits: Optional[int] = None,
+        compact: bool = False,
     ) -> MetricTable:
         """
         Get metric data for a run (experiment).
@@ -71,54 +143,333 @@ class MetricTools:
             keys: 要获取的指标名称列表，如 ['loss', 'acc']；不传则返回空DataFrame
             x_axis: X轴维度，可选：step（步数）、指标名（如 acc）
             sample: 采样数量，限制返回的行数；不传则返回全部数据
+            step_min: 只返回 step 不小于该值的数据（含边界）
+            step_max: 只返回 step 不大于该值的数据（含边界）；指定窗口且不传 sample 时返回窗口内全部数据
+            transform: 对指标值的变换，在窗口切片和采样之前对完整序列计算：
+                ema（与 SwanLab 平滑滑块一致的 EMA）、rolling_mean、rolling_median（滚动均值/中位数）、diff（一阶差分）
+            transform_param: ema 的平滑权重（0~1，默认 0.6），或 rolling_* 的窗口大小（默认 10）
+            digits: 指标值保留的有效数字位数（1~17），不传则返回完整精度；x 轴和 `<key>_timestamp` 列不取整
+            compact: 是否返回紧凑编码：数据放在 encoded 中而不是 rows，整数 x 轴编码为 start/stride/count
+                或首项加差分，连续重复的值编码为 [值, 次数] 游程
 
         Returns:
-            MetricTable object containing query information and metric rows
+            MetricTable object containing query information, metric rows and per-key errors
         """
         try:
+            backend = await self.api.get()
             normalized_path = validate_run_path(path)
             normalized_x_axis = x_axis.strip()
             if not normalized_x_axis:
                 raise ValueError("`x_axis` cannot be empty.")
-            run = self.api.run(path=normalized_path)
-            kwargs: Dict[str, Any] = {"x_axis": normalized_x_axis}
-            if keys:
-                kwargs["keys"] = keys
-            if sample is not None:
-                if sample <= 0:
-                    raise ValueError("`sample` must be greater than 0.")
-                kwargs["sample"] = sample
-            #!TMP: sample 设定为 1000，避免一次性返回过多数据导致性能问题；后续可优化为分页查询
-            if sample is None:
-                kwargs["sample"] = 1000
-            metrics_df = run.metrics(**kwargs)
-            rows: List[Dict[str, Any]] = []
-            columns: List[str] = []
-            if metrics_df is not None and hasattr(metrics_df, "to_dict"):
-                rows = metrics_df.to_dict(orient="records")
-                if hasattr(metrics_df, "columns"):
-                    columns = [str(column) for column in metrics_df.columns]
-
-            return MetricTable(
+            if sample is not None and sample <= 0:
+                raise ValueError("`sample` must be greater than 0.")
+            if step_min is not None and step_max is not None and step_min > step_max:
+                raise ValueError("`step_min` must not be greater than `step_max`.")
+            validate_digits(digits)
+            windowed = step_min is not None or step_max is not None
+
+            requested = list(dict.fromkeys(keys or []))
+            fetch_keys = list(requested)
+            if requested and normalized_x_axis != STEP_INDEX and normalized_x_axis not in fetch_keys:
+                fetch_keys.append(normalized_x_axis)
+            series, errors = await self._fetch_series(backend, normalized_path, fetch_keys)
+            if transform is not None:
+                # x 轴指标只用于对齐，不做变换
+                for key in requested:
+                    if key in series and key != normalized_x_axis:
+                        series[key] = transform_series(series[key], key, transform, transform_param)
+
+            rows: Optional[MetricRows] = None
+            encoded: Optional[Dict[str, Any]] = None
+            if series:
+                #!TMP: sample 设定为 1000，避免一次性返回过多数据导致性能问题；后续可优化为分页查询
+                # 指定 step 窗口时默认返回窗口内的完整分辨率数据
+                limit = sample if sample is not None else None if windowed else 1000
+                # 先按 step 窗口切片再合并，窗口外的数据不参与合并和采样
+                frames = [
+                    normalize_series(window_series(series[key], step_min, step_max))
+                    for key in fetch_keys
+                    if key in series
+                ]
+                cut = head_cut(frames, limit) if limit is not None and normalized_x_axis == STEP_INDEX else None
+                if cut is not None:
+                    # 只取前 limit 行时，合并前截断各序列，避免合并完整序列
+                    frames = [window_series(df, None, cut) for df in frames]
+                metrics_df = merge_series(frames)
+                if normalized_x_axis != STEP_INDEX:
+                    if normalized_x_axis in errors:
+                        raise ValueError(f"x_axis '{normalized_x_axis}' is unavailable: {errors[normalized_x_axis]}")
+                    metrics_df = use_x_axis(metrics_df, normalized_x_axis)
+                if limit is not None:
+                    metrics_df = metrics_df.head(limit)
+                max_bytes = self.api.config.metric_request_mb * 1024 * 1024
+                rows = MetricRows.from_frame(metrics_df, max_bytes=max_bytes)
+                if digits is not None:
+                    rows = rows.rounded(digits)
+                if compact:
+                    encoded = rows.encoded()
+                    size = encoded_cells(encoded) * JSON_CELL_BYTES
+                else:
+                    size = rows.estimated_json_bytes()
+                if size > max_bytes:
+                    raise ValueError(
+                        f"{len(rows)} rows x {len(rows.columns)} columns exceed the per-request limit of "
+                        f"{self.api.config.metric_request_mb} MiB (METRIC_REQUEST_MAX_MB); "
+                        "narrow the query with step_min/step_max, sample or fewer keys"
+                    )
+
+            table = MetricTable(
                 path=normalized_path,
                 keys=keys or [],
                 x_axis=normalized_x_axis,
                 sample=sample,
+                step_min=step_min,
+                step_max=step_max,
+                transform=transform,
+                transform_param=transform_param,
+                digits=digits,
+                columns=rows.columns if rows is not None else [],
+                encoded=encoded,
+                total=len(rows) if rows is not None else 0,
+                errors=errors,
+            )
+            return table.stream_rows(rows) if rows is not None and encoded is None else table
+        except Exception as e:
+            raise RuntimeError(f"Failed to get metrics for run '{path}': {str(e)}") from e
+
+    async def detect_run_anomalies(
+        self,
+        path: str,
+        keys: List[str],
+        window: int = DEFAULT_ANOMALY_WINDOW,
+        sigma: float = DEFAULT_SPIKE_SIGMA,
+        plateau_tolerance: float = DEFAULT_PLATEAU_TOLERANCE,
+        divergence_ratio: float = DEFAULT_DIVERGENCE_RATIO,
+        step_min: Optional[int] = None,
+        step_max: Optional[int] = None,
+        maximize: Optional[List[str]] = None,
+    ) -> MetricAnomalyReport:
+        """
+        Detect NaN/Inf onsets, spikes, plateaus and divergence in the full-resolution series of a run.
+
+        Args:
+            path: 实验路径，格式为 username/project_name/experiment_id
+            keys: 要检测的指标名称列表，如 ['loss']
+            window: 滚动统计的窗口大小（点数）
+            sigma: 尖峰阈值，偏离滚动均值超过 sigma 倍标准差视为尖峰
+            plateau_tolerance: 平台期阈值，相邻窗口均值的相对变化小于该值视为平台期
+            divergence_ratio: 发散阈值，滚动均值相对历史最优值的退步超过该比例且未恢复视为发散
+            step_min: 只检测 step 不小于该值的数据（含边界）
+            step_max: 只检测 step 不大于该值的数据（含边界）
+            maximize: 越高越好的指标 key 列表（如 ['acc', 'reward']），其余 key 按越低越好判断发散
+
+        Returns:
+            MetricAnomalyReport with events sorted by step
+        """
+        try:
+            backend = await self.api.get()
+            normalized_path = validate_run_path(path)
+            requested = list(dict.fromkeys(keys or []))
+            if not requested:
+                raise ValueError("`keys` cannot be empty.")
+            if window < 2:
+                raise ValueError("`window` must be at least 2.")
+            if sigma <= 0:
+                raise ValueError("`sigma` must be greater than 0.")
+
+            maximized = set(maximize or [])
+            if maximized - set(requested):
+                raise ValueError(f"`maximize` keys must be in `keys`: {sorted(maximized - set(requested))}")
+
+            series, errors = await self._fetch_series(backend, normalized_path, requested)
+            events: List[Dict[str, Any]] = []
+            for key in requested:
+                if key in series:
+                    events.extend(
+                        detect_anomalies(
+                            window_series(series[key], step_min, step_max),
+                            key,
+                            window=window,
+                            sigma=sigma,
+                            plateau_tolerance=plateau_tolerance,
+                            divergence_ratio=divergence_ratio,
+                            maximize=key in maximized,
+                        )
+                    )
+            events.sort(key=lambda event: event["step"])
+
+            return MetricAnomalyReport(
+                path=normalized_path,
+                keys=requested,
+                maximize=[key for key in requested if key in maximized],
+                events=events,
+                total=len(events),
+                errors=errors,
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to detect anomalies for run '{path}': {str(e)}") from e
+
+    async def compare_runs(
+        self,
+        paths: List[str],
+        keys: List[str],
+        align: AlignAxis = "step",
+        points: int = DEFAULT_COMPARE_POINTS,
+        tolerance: Optional[float] = None,
+        epoch_key: str = "epoch",
+        transform: Optional[MetricTransform] = None,
+        transform_param: Optional[float] = None,
+        digits: Optional[int] = None,
+        compact: bool = False,
+    ) -> RunComparison:
+        """
+        Align the metrics of several runs on step, relative wall-clock time or epoch.
+
+        Args:
+            paths: 实验路径列表，格式为 username/project_name/experiment_id
+            keys: 要对比的指标名称列表，如 ['loss']
+            align: 对齐坐标：step、time（距实验开始的秒数，来自 `<key>_timestamp`）或 epoch
+            points: 降采样后的网格点数
+            tolerance: as-of join 的最大距离（与对齐坐标同单位），默认为一个网格间距
+            epoch_key: align 为 epoch 时使用的 epoch 指标名
+            transform: 对齐前对每条完整序列做的变换，同 get_run_metrics
+            transform_param: 变换参数，同 get_run_metrics
+            digits: 指标值保留的有效数字位数，同 get_run_metrics
+            compact: 是否返回紧凑编码，同 get_run_metrics
+
+        Returns:
+            RunComparison with one aligned matrix
+        """
+        try:
+            backend = await self.api.get()
+            normalized_paths = list(dict.fromkeys(validate_run_path(path) for path in paths or []))
+            requested = list(dict.fromkeys(keys or []))
+            if not normalized_paths:
+                raise ValueError("`paths` cannot be empty.")
+            if not requested:
+                raise ValueError("`keys` cannot be empty.")
+            if points < 2:
+                raise ValueError("`points` must be at least 2.")
+            if tolerance is not None and tolerance < 0:
+                raise ValueError("`tolerance` must not be negative.")
+            validate_digits(digits)
+            fetch_keys = requested + [epoch_key] if align == "epoch" and epoch_key not in requested else requested
+
+            async def fetch_run(path: str) -> Tuple[Dict[str, "pd.DataFrame"], Dict[str, str]]:
+                try:
+                    return await self._fetch_series(backend, path, fetch_keys)
+                except Exception as e:
+                    return {}, {"": str(e)}
+
+            results = await asyncio.gather(*(fetch_run(path) for path in normalized_paths))
+
+            columns = [align]
+            curves: List[Tuple[Any, Any]] = []
+            errors: Dict[str, str] = {}
+            for path, (series, run_errors) in zip(normalized_paths, results):
+                errors.update({f"{path}:{key}" if key else path: message for key, message in run_errors.items()})
+                epochs = series.get(epoch_key) if align == "epoch" else None
+                if align == "epoch" and epochs is None:
+                    continue
+                run_curves = []
+                for key in requested:
+                    if key not in series:
+                        continue
+                    df = series[key]
+                    if transform is not None:
+                        df = transform_series(df, key, transform, transform_param)
+                    try:
+                        x = axis_values(df, key, align, epochs, epoch_key)
+                    except Exception as e:
+                        errors[f"{path}:{key}"] = str(e)
+                        continue
+                    run_curves.append((f"{path}:{key}", x, df[key].to_numpy(dtype=np.float64)))
+                starts = [np.nanmin(x) for _, x, _ in run_curves if np.isfinite(x).any()]
+                if align == "time" and starts:
+                    # 相对时间：以实验中所有指标最早的记录时间为起点
+                    run_curves = [(name, x - min(starts), y) for name, x, y in run_curves]
+                for name, x, y in run_curves:
+                    columns.append(name)
+                    curves.append((x, y))
+
+            grid, matrix = align_curves(curves, points, tolerance, integer=align == "step")
+            if digits is not None:
+                matrix = round_significant(matrix, digits)
+            encoded = None
+            rows: List[List[Any]] = []
+            if compact:
+                encoded = encode_columns(columns, [grid, *matrix.T])
+            elif len(grid):
+                rows = np.column_stack([grid, matrix]).tolist()
+
+            return RunComparison(
+                paths=normalized_paths,
+                keys=requested,
+                align=align,
+                points=points,
+                tolerance=tolerance,
+                digits=digits,
                 columns=columns,
                 rows=rows,
-                total=len(rows),
+                encoded=encoded,
+                total=len(grid),
+                errors=errors,
             )
         except Exception as e:
-            raise RuntimeError(f"Failed to get metrics for run '{path}': {str(e)}") from e
+            raise RuntimeError(f"Failed to compare runs {paths}: {str(e)}") from e
 
+    async def get_run_throughput(
+        self,
+        path: str,
+        key: str,
+        target_step: Optional[int] = None,
+        points: int = DEFAULT_THROUGHPUT_POINTS,
+        stall_factor: float = DEFAULT_STALL_FACTOR,
+    ) -> RunThroughput:
+        """
+        Compute steps/sec over time, stalls and the projected time to a target step from metric timestamps.
+
+        Args:
+            path: 实验路径，格式为 username/project_name/experiment_id
+            key: 用于计算的指标名，应为每个训练 step 都记录的指标，如 loss
+            target_step: 目标 step；实验状态为 RUNNING 时据此估算剩余时间
+            points: 吞吐量曲线的时间分段数
+            stall_factor: 单步耗时超过中位数该倍数的记录间隔视为停顿
 
-def register_metric_tools(mcp: FastMCP, api: Api) -> None:
+        Returns:
+            RunThroughput with overall/recent rates, the rate curve, stalls and ETA
+        """
+        try:
+            backend = await self.api.get()
+            normalized_path = validate_run_path(path)
+            if points < 1:
+                raise ValueError("`points` must be greater than 0.")
+            if stall_factor <= 1:
+                raise ValueError("`stall_factor` must be greater than 1.")
+            run_data, df = await asyncio.gather(backend.run(normalized_path), backend.metric_series(normalized_path, key))
+            stats = throughput_stats(df, key, points=points, stall_factor=stall_factor)
+            state = run_data.get("state") or ""
+
+            if state == "RUNNING" and stats.get("last_logged_at") is not None:
+                stats["idle_seconds"] = max(0.0, time.time() - stats["last_logged_at"])
+                rate = stats.get("recent_steps_per_second")
+                if target_step is not None and rate and target_step > stats["last_step"]:
+                    stats["eta_seconds"] = (target_step - stats["last_step"]) / rate
+                    stats["estimated_finish_at"] = stats["last_logged_at"] + stats["eta_seconds"]
+
+            return RunThroughput(path=normalized_path, key=key, state=state, target_step=target_step, **stats)
+        except Exception as e:
+            raise RuntimeError(f"Failed to get throughput for run '{path}': {str(e)}") from e
+
+
+def register_metric_tools(mcp: FastMCP, api: LazyApi, serializer: JsonSerializer) -> None:
     """
     Register metric-related MCP tools.
 
     Args:
         mcp: FastMCP server instance
-        api: SwanLab Api instance
+        api: Shared lazily warmed SwanLab Api
+        serializer: JSON serializer for tool outputs
     """
     metric_tools = MetricTools(api)
 
@@ -132,7 +483,7 @@ def register_metric_tools(mcp: FastMCP, api: Api) -> None:
             readOnlyHint=True,
         ),
     )
-    async def list_run_metric_keys(path: str) -> Dict[str, Any]:
+    async def list_run_metric_keys(path: str) -> CallToolResult:
         """
         List all available metric keys for a run (experiment).
 
@@ -144,13 +495,20 @@ def register_metric_tools(mcp: FastMCP, api: Api) -> None:
             返回指标键列表，包含指标名、数据类型和分类信息。
         """
         metric_key_list = await metric_tools.list_run_metric_keys(path)
-        return metric_key_list.model_dump()
+        return serializer.tool_result(metric_key_list)
 
     @mcp.tool(
         name="swanlab_get_run_metrics",
         description="Get metric data for a run (experiment). Returns a list of metric records. "
         "You SHOULD call `swanlab_list_run_metric_keys` first to discover available metric keys. "
-        "获取实验的指标数据，返回指标记录列表。你应该先调用 `swanlab_list_run_metric_keys` 发现可用指标键名。",
+        "Use `step_min`/`step_max` to zoom into a step range at full resolution, and `transform` "
+        "(ema, rolling_mean, rolling_median, diff) to get a smoothed or differenced curve. "
+        "For large results, set `digits` to limit significant digits and `compact` to encode the x axis as "
+        "start/stride/count and repeated values as runs. "
+        "获取实验的指标数据，返回指标记录列表。你应该先调用 `swanlab_list_run_metric_keys` 发现可用指标键名。"
+        "使用 `step_min`/`step_max` 以完整分辨率查看某个 step 区间，使用 `transform` 获取平滑或差分后的曲线。"
+        "数据量较大时，使用 `digits` 限制有效数字位数，"
+        "使用 `compact` 将 x 轴编码为 start/stride/count、重复值编码为游程。",
         annotations=ToolAnnotations(
             title="Get metric data for a run.",
             readOnlyHint=True,
@@ -161,7 +519,13 @@ def register_metric_tools(mcp: FastMCP, api: Api) -> None:
         keys: Optional[List[str]] = None,
         x_axis: str = "step",
         sample: Optional[int] = None,
-    ) -> Dict[str, Any]:
+        step_min: Optional[int] = None,
+        step_max: Optional[int] = None,
+        transform: Optional[MetricTransform] = None,
+        transform_param: Optional[float] = None,
+        digits: Optional[int] = None,
+        compact: bool = False,
+    ) -> CallToolResult:
         """
         Get metric data for a run (experiment).
 
@@ -170,10 +534,147 @@ def register_metric_tools(mcp: FastMCP, api: Api) -> None:
             keys: 要获取的指标名称列表，如 ['loss', 'acc']；不传则返回空结果
             x_axis: X轴维度，可选：step（步数）、指标名（如 acc）
             sample: 采样数量，限制返回的行数；不传则返回全部数据
+            step_min: 只返回 step 不小于该值的数据（含边界）
+            step_max: 只返回 step 不大于该值的数据（含边界）；指定窗口且不传 sample 时返回窗口内全部数据
+            transform: 对指标值的变换，在窗口切片和采样之前对完整序列计算：
+                ema（与 SwanLab 平滑滑块一致的 EMA）、rolling_mean、rolling_median（滚动均值/中位数）、diff（一阶差分）
+            transform_param: ema 的平滑权重（0~1，默认 0.6），或 rolling_* 的窗口大小（默认 10）
+            digits: 指标值保留的有效数字位数（1~17），不传则返回完整精度；x 轴和 `<key>_timestamp` 列不取整
+            compact: 是否返回紧凑编码：数据放在 encoded 中而不是 rows，整数 x 轴编码为 start/stride/count
+                或首项加差分，连续重复的值编码为 [值, 次数] 游程
+
+        Returns:
+            Structured metric table with rows (including `step`), columns, query metadata and per-key errors.
+            返回结构化指标表，包含行数据（含 step 列）、列名、查询元数据，以及获取失败的 key 及原因。
+        """
+        metric_table = await metric_tools.get_run_metrics(
+            path, keys, x_axis, sample, step_min, step_max, transform, transform_param, digits, compact
+        )
+        return serializer.tool_result(metric_table)
+
+    @mcp.tool(
+        name="swanlab_detect_run_anomalies",
+        description="Detect training anomalies in a run's metrics: NaN/Inf onset, spikes above k sigma, plateaus and "
+        "divergence. Scans the full-resolution series and returns a compact event list instead of raw rows. "
+        "Divergence assumes lower is better; list higher-is-better keys such as accuracy or reward in `maximize`. "
+        "检测实验指标中的训练异常（NaN/Inf 出现、尖峰、平台期、发散），扫描完整分辨率数据，只返回精简的事件列表。"
+        "发散默认按越低越好判断，越高越好的指标（如准确率、奖励）请放入 `maximize`。",
+        annotations=ToolAnnotations(
+            title="Detect anomalies in run metrics.",
+            readOnlyHint=True,
+        ),
+    )
+    async def detect_run_anomalies(
+        path: str,
+        keys: List[str],
+        window: int = DEFAULT_ANOMALY_WINDOW,
+        sigma: float = DEFAULT_SPIKE_SIGMA,
+        plateau_tolerance: float = DEFAULT_PLATEAU_TOLERANCE,
+        divergence_ratio: float = DEFAULT_DIVERGENCE_RATIO,
+        step_min: Optional[int] = None,
+        step_max: Optional[int] = None,
+        maximize: Optional[List[str]] = None,
+    ) -> CallToolResult:
+        """
+        Detect anomalies in the metrics of a run (experiment).
+
+        Args:
+            path: 实验路径，格式为 username/project_name/experiment_id
+            keys: 要检测的指标名称列表，如 ['loss', 'grad_norm']
+            window: 滚动统计的窗口大小（点数），默认 50
+            sigma: 尖峰阈值（标准差倍数），默认 6
+            plateau_tolerance: 平台期阈值（相邻窗口均值的相对变化），默认 0.01
+            divergence_ratio: 发散阈值（相对历史最优值的退步），默认 0.5
+            step_min: 只检测 step 不小于该值的数据（含边界）
+            step_max: 只检测 step 不大于该值的数据（含边界）
+            maximize: 越高越好的指标 key 列表，如 ['acc', 'reward']；不在列表中的 key 按越低越好（如 loss）判断发散
+
+        Returns:
+            Events with key, kind, step range, representative value and score, sorted by step.
+            返回按 step 排序的事件列表，包含指标名、事件类型、step 区间、代表值和强度。
+        """
+        report = await metric_tools.detect_run_anomalies(
+            path, keys, window, sigma, plateau_tolerance, divergence_ratio, step_min, step_max, maximize
+        )
+        return serializer.tool_result(report)
+
+    @mcp.tool(
+        name="swanlab_compare_runs",
+        description="Compare metrics of several runs aligned on step, relative wall-clock time or epoch. "
+        "Series are matched with as-of joins within a tolerance and returned as one compact, downsampled matrix. "
+        "按 step、相对时间或 epoch 对齐多个实验的指标，使用带容差的 as-of join，返回一个紧凑的降采样矩阵。",
+        annotations=ToolAnnotations(
+            title="Compare metrics across runs.",
+            readOnlyHint=True,
+        ),
+    )
+    async def compare_runs(
+        paths: List[str],
+        keys: List[str],
+        align: AlignAxis = "step",
+        points: int = DEFAULT_COMPARE_POINTS,
+        tolerance: Optional[float] = None,
+        epoch_key: str = "epoch",
+        transform: Optional[MetricTransform] = None,
+        transform_param: Optional[float] = None,
+        digits: Optional[int] = None,
+        compact: bool = False,
+    ) -> CallToolResult:
+        """
+        Compare metrics of several runs (experiments) on a shared axis.
+
+        Args:
+            paths: 实验路径列表，格式为 username/project_name/experiment_id
+            keys: 要对比的指标名称列表，如 ['loss', 'acc']
+            align: 对齐坐标：step、time（距实验开始的秒数）或 epoch
+            points: 降采样后的网格点数，默认 200
+            tolerance: as-of join 的最大距离（与对齐坐标同单位），默认为一个网格间距
+            epoch_key: align 为 epoch 时使用的 epoch 指标名，默认 epoch
+            transform: 对齐前的变换：ema、rolling_mean、rolling_median、diff
+            transform_param: ema 的平滑权重或 rolling_* 的窗口大小
+            digits: 指标值保留的有效数字位数（1~17），不传则返回完整精度
+            compact: 是否返回紧凑编码：矩阵按列放在 encoded 中而不是 rows，对齐坐标编码为 start/stride/count
+                或首项加差分，连续重复的值编码为 [值, 次数] 游程
+
+        Returns:
+            Aligned matrix: `columns` is [align, "<path>:<key>", ...] and each row lists the values in that order.
+            返回对齐矩阵：columns 为 [对齐坐标, "<path>:<key>", ...]，rows 中每行按该顺序给出数值。
+        """
+        comparison = await metric_tools.compare_runs(
+            paths, keys, align, points, tolerance, epoch_key, transform, transform_param, digits, compact
+        )
+        return serializer.tool_result(comparison)
+
+    @mcp.tool(
+        name="swanlab_get_run_throughput",
+        description="Compute training throughput of a run from metric timestamps: steps/sec over time, stalls "
+        "(unusually long gaps between logged steps) and, for RUNNING runs, the projected time to a target step. "
+        "根据指标时间戳计算实验吞吐量：随时间变化的 steps/sec、停顿区间，以及 RUNNING 实验到达目标 step 的预计时间。",
+        annotations=ToolAnnotations(
+            title="Get throughput of a run.",
+            readOnlyHint=True,
+        ),
+    )
+    async def get_run_throughput(
+        path: str,
+        key: str,
+        target_step: Optional[int] = None,
+        points: int = DEFAULT_THROUGHPUT_POINTS,
+        stall_factor: float = DEFAULT_STALL_FACTOR,
+    ) -> CallToolResult:
+        """
+        Get throughput and wall-clock analytics of a run (experiment).
+
+        Args:
+            path: 实验路径，格式为 username/project_name/experiment_id
+            key: 用于计算的指标名，应为每个训练 step 都记录的指标，如 loss
+            target_step: 目标 step（如总训练步数）；实验状态为 RUNNING 时据此估算剩余时间
+            points: 吞吐量曲线的时间分段数，默认 50
+            stall_factor: 单步耗时超过中位数该倍数的记录间隔视为停顿，默认 5
 
         Returns:
-            Structured metric table with rows, columns and query metadata.
-            返回结构化指标表，包含行数据、列名和查询元数据。
+            Overall and recent steps/sec, a [time, steps_per_second] curve, stalls, and ETA/idle time for RUNNING runs.
+            返回整体和近期 steps/sec、[time, steps_per_second] 曲线、停顿列表，以及 RUNNING 实验的预计剩余时间和空闲时间。
         """
-        metric_table = await metric_tools.get_run_metrics(path, keys, x_axis, sample)
-        return metric_table.model_dump()
+        throughput = await metric_tools.get_run_throughput(path, key, target_step, points, stall_factor)
+        return serializer.tool_result(throughput)
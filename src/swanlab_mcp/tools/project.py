@@ -3,14 +3,17 @@
 项目管理工具，用于获取项目信息和项目下的实验列表。
 """
 
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from mcp.server.fastmcp import FastMCP
-from mcp.types import ToolAnnotations
-from swanlab import Api
+from mcp.types import CallToolResult, ToolAnnotations
 
-from ..models import Project
-from ..utils import to_plain_dict, validate_project_path
+from ..api import LazyApi
+from ..export import EXPORT_RUN_CONCURRENCY, export_project
+from ..models import PROJECT_LIST_ADAPTER, Project, ProjectExport
+from ..serialization import JsonSerializer
+from ..utils import resolve_inside, validate_project_path
 
 
 class ProjectTools:
@@ -19,8 +22,9 @@ class ProjectTools:
     项目是实验的集合，对应一个研发任务（如"图像分类"）。
     """
 
-    def __init__(self, api: Api):
+    def __init__(self, api: LazyApi, export_dir: str):
         self.api = api
+        self.export_dir = Path(export_dir).expanduser()
 
     async def list_projects(
         self,
@@ -50,16 +54,14 @@ class ProjectTools:
             - count: 统计信息
         """
         try:
-            kwargs: Dict[str, Any] = {"detail": detail}
-            if path:
-                kwargs["path"] = path.strip()
-            if sort:
-                kwargs["sort"] = sort.strip()
-            if search:
-                kwargs["search"] = search.strip()
-
-            projects = self.api.projects(**kwargs)
-            return [Project(**to_plain_dict(proj)) for proj in projects]
+            backend = await self.api.get()
+            projects = await backend.projects(
+                path=path.strip() if path else None,
+                sort=sort.strip() if sort else None,
+                search=search.strip() if search else None,
+                detail=detail,
+            )
+            return PROJECT_LIST_ADAPTER.validate_python(projects)
         except Exception as e:
             raise RuntimeError(f"Failed to list projects: {str(e)}") from e
 
@@ -74,22 +76,53 @@ class ProjectTools:
             Project object with detailed information
         """
         try:
+            backend = await self.api.get()
             normalized_path = validate_project_path(path)
-            proj = self.api.project(path=normalized_path)
-            return Project(**to_plain_dict(proj))
+            return Project(**await backend.project(normalized_path))
         except Exception as e:
             raise RuntimeError(f"Failed to get project '{path}': {str(e)}") from e
 
+    async def export_project(
+        self,
+        path: str,
+        output_dir: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        concurrency: int = EXPORT_RUN_CONCURRENCY,
+    ) -> ProjectExport:
+        """
+        Export all runs of a project to a partitioned Parquet dataset.
+
+        Args:
+            path: 项目路径，格式为 username/project_name
+            output_dir: SWANLAB_EXPORT_DIR 下的相对子目录，为空时直接写入导出根目录；
+                项目写入 <output_dir>/<username>/<project_name>，不允许 `.`、`..` 或绝对路径
+            filters: 实验筛选条件，同 swanlab_list_runs
+            concurrency: 同时导出的实验数
+
+        Returns:
+            ProjectExport object with exported/skipped runs and per-run errors
+        """
+        try:
+            backend = await self.api.get()
+            normalized_path = validate_project_path(path)
+            target = resolve_inside(self.export_dir, output_dir.strip()) if output_dir else self.export_dir
+            result = await export_project(backend, normalized_path, str(target), filters, max(1, concurrency))
+            return ProjectExport(path=normalized_path, **result)
+        except Exception as e:
+            raise RuntimeError(f"Failed to export project '{path}': {str(e)}") from e
+
 
-def register_project_tools(mcp: FastMCP, api: Api) -> None:
+def register_project_tools(mcp: FastMCP, api: LazyApi, serializer: JsonSerializer, export_dir: str) -> None:
     """
     Register project-related MCP tools.
 
     Args:
         mcp: FastMCP server instance
-        api: SwanLab Api instance
+        api: Shared lazily warmed SwanLab Api
+        serializer: JSON serializer for tool outputs
+        export_dir: Root directory that swanlab_export_project writes into
     """
-    project_tools = ProjectTools(api)
+    project_tools = ProjectTools(api, export_dir)
 
     @mcp.tool(
         name="swanlab_list_projects",
@@ -105,7 +138,7 @@ def register_project_tools(mcp: FastMCP, api: Api) -> None:
         sort: Optional[str] = None,
         search: Optional[str] = None,
         detail: bool = True,
-    ) -> List[Dict[str, Any]]:
+    ) -> CallToolResult:
         """
         List all projects with optional filtering.
 
@@ -120,7 +153,7 @@ def register_project_tools(mcp: FastMCP, api: Api) -> None:
             返回项目列表，包含名称、路径、描述、可见性等信息。
         """
         projects = await project_tools.list_projects(path=path, sort=sort, search=search, detail=detail)
-        return [proj.model_dump() for proj in projects]
+        return serializer.tool_result(projects)
 
     @mcp.tool(
         name="swanlab_get_project",
@@ -130,7 +163,7 @@ def register_project_tools(mcp: FastMCP, api: Api) -> None:
             readOnlyHint=True,
         ),
     )
-    async def get_project(path: str) -> Dict[str, Any]:
+    async def get_project(path: str) -> CallToolResult:
         """
         Get detailed information about a specific project.
 
@@ -142,4 +175,39 @@ def register_project_tools(mcp: FastMCP, api: Api) -> None:
             返回项目详情，包含元数据和统计信息。
         """
         project_obj = await project_tools.get_project(path)
-        return project_obj.model_dump()
+        return serializer.tool_result(project_obj)
+
+    @mcp.tool(
+        name="swanlab_export_project",
+        description="Export runs, flattened configs, metadata and all scalar metrics of a project to a "
+        "partitioned Parquet dataset on the server's disk, inside the SWANLAB_EXPORT_DIR root. Re-running "
+        "resumes: runs already exported in FINISHED state without failed keys are skipped. "
+        "将项目导出为导出根目录下的分区 Parquet 数据集，支持断点续传。",
+        annotations=ToolAnnotations(
+            title="Export a project to a Parquet dataset.",
+            readOnlyHint=False,
+            destructiveHint=False,
+            idempotentHint=True,
+        ),
+    )
+    async def export_project(
+        path: str,
+        output_dir: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        concurrency: int = EXPORT_RUN_CONCURRENCY,
+    ) -> CallToolResult:
+        """
+        Export a project to a partitioned Parquet dataset.
+
+        Args:
+            path: 项目路径，格式为 username/project_name
+            output_dir: SWANLAB_EXPORT_DIR 下的相对子目录，为空时直接写入导出根目录；不允许 `.`、`..` 或绝对路径
+            filters: 实验筛选条件，同 swanlab_list_runs
+            concurrency: 同时导出的实验数
+
+        Returns:
+            Export summary with output directory, exported and skipped runs, row count and errors.
+            返回导出目录、导出和跳过的实验、写入行数以及错误信息。
+        """
+        result = await project_tools.export_project(path, output_dir, filters=filters, concurrency=concurrency)
+        return serializer.tool_result(result)
@@ -6,27 +6,24 @@
 from collections.abc import Mapping
 from typing import Any, Dict, List, Optional
 
-import pandas as pd
 from mcp.server.fastmcp import FastMCP
-from mcp.types import ToolAnnotations
-from swanlab import Api
+from mcp.types import CallToolResult, ToolAnnotations
 
-from ..models import Run
-from ..utils import to_plain_dict, validate_project_path, validate_run_path
+from ..api import LazyApi
+from ..models import RUN_LIST_ADAPTER, Run
+from ..serialization import JsonSerializer
+from ..utils import validate_project_path, validate_run_path
 
 
-def _profile_section(run_obj: Any, section: str) -> Any:
+def _profile_section(run_data: Dict[str, Any], section: str) -> Any:
     """Extract a section from run profile.
 
     从实验 profile 中提取指定部分（config、metadata、requirements）。
     """
-    profile = getattr(run_obj, "profile", None)
-    if profile is None:
-        run_data = to_plain_dict(run_obj)
-        return run_data.get("profile", {}).get(section)
+    profile = run_data.get("profile")
     if isinstance(profile, Mapping):
         return profile.get(section)
-    return getattr(profile, section, None)
+    return None
 
 
 class RunTools:
@@ -35,7 +32,7 @@ class RunTools:
     实验是单次训练/推理任务，包含指标、配置、日志等数据。
     """
 
-    def __init__(self, api: Api):
+    def __init__(self, api: LazyApi):
         self.api = api
 
     async def list_runs(
@@ -70,12 +67,11 @@ class RunTools:
             - profile: 实验配置信息
         """
         try:
-            kwargs: Dict[str, Any] = {"path": validate_project_path(path)}
-            if filters:
-                kwargs["filters"] = filters
-
-            runs = self.api.runs(**kwargs)
-            return [Run(**to_plain_dict(run)) for run in runs]
+            backend = await self.api.get()
+            runs = await backend.runs(validate_project_path(path), filters=filters or None)
+            # 后续通常会查询前几个实验的配置和指标键名，提前在后台预热
+            self.api.prefetch_runs([run["path"] for run in runs if run.get("path")])
+            return RUN_LIST_ADAPTER.validate_python(runs)
         except Exception as e:
             raise RuntimeError(f"Failed to list runs for project '{path}': {str(e)}") from e
 
@@ -90,9 +86,9 @@ class RunTools:
             Run object with detailed information including profile data
         """
         try:
+            backend = await self.api.get()
             normalized_path = validate_run_path(path)
-            run = self.api.run(path=normalized_path)
-            return Run(**to_plain_dict(run))
+            return Run(**await backend.run(normalized_path))
         except Exception as e:
             raise RuntimeError(f"Failed to get run '{path}': {str(e)}") from e
 
@@ -107,8 +103,9 @@ class RunTools:
             Configuration dictionary
         """
         try:
+            backend = await self.api.get()
             normalized_path = validate_run_path(path)
-            run = self.api.run(path=normalized_path)
+            run = await backend.run(normalized_path)
             config = _profile_section(run, "config")
             return config if isinstance(config, dict) else {}
         except Exception as e:
@@ -125,8 +122,9 @@ class RunTools:
             Metadata dictionary containing Python版本、硬件信息等
         """
         try:
+            backend = await self.api.get()
             normalized_path = validate_run_path(path)
-            run = self.api.run(path=normalized_path)
+            run = await backend.run(normalized_path)
             metadata = _profile_section(run, "metadata")
             return metadata if isinstance(metadata, dict) else {}
         except Exception as e:
@@ -143,8 +141,9 @@ class RunTools:
             List of Python package requirements
         """
         try:
+            backend = await self.api.get()
             normalized_path = validate_run_path(path)
-            run = self.api.run(path=normalized_path)
+            run = await backend.run(normalized_path)
             requirements = _profile_section(run, "requirements")
             if requirements is None:
                 return []
@@ -155,13 +154,14 @@ class RunTools:
             raise RuntimeError(f"Failed to get requirements for run '{path}': {str(e)}") from e
 
 
-def register_run_tools(mcp: FastMCP, api: Api) -> None:
+def register_run_tools(mcp: FastMCP, api: LazyApi, serializer: JsonSerializer) -> None:
     """
     Register run-related MCP tools.
 
     Args:
         mcp: FastMCP server instance
-        api: SwanLab Api instance
+        api: Shared lazily warmed SwanLab Api
+        serializer: JSON serializer for tool outputs
     """
     run_tools = RunTools(api)
 
@@ -177,7 +177,7 @@ def register_run_tools(mcp: FastMCP, api: Api) -> None:
     async def list_runs(
         path: str,
         filters: Optional[Dict[str, Any]] = None,
-    ) -> List[Dict[str, Any]]:
+    ) -> CallToolResult:
         """
         List all runs (experiments) in a project with optional filtering.
 
@@ -193,7 +193,7 @@ def register_run_tools(mcp: FastMCP, api: Api) -> None:
             返回实验列表，包含名称、状态、描述和元数据。
         """
         runs = await run_tools.list_runs(path=path, filters=filters)
-        return [run.model_dump() for run in runs]
+        return serializer.tool_result(runs)
 
     @mcp.tool(
         name="swanlab_get_run",
@@ -203,7 +203,7 @@ def register_run_tools(mcp: FastMCP, api: Api) -> None:
             readOnlyHint=True,
         ),
     )
-    async def get_run(path: str) -> Dict[str, Any]:
+    async def get_run(path: str) -> CallToolResult:
         """
         Get detailed information about a specific run (experiment).
 
@@ -215,7 +215,7 @@ def register_run_tools(mcp: FastMCP, api: Api) -> None:
             返回实验详情，包含 profile 数据、配置和元数据。
         """
         run = await run_tools.get_run(path)
-        return run.model_dump()
+        return serializer.tool_result(run)
 
     @mcp.tool(
         name="swanlab_get_run_config",
@@ -225,7 +225,7 @@ def register_run_tools(mcp: FastMCP, api: Api) -> None:
             readOnlyHint=True,
         ),
     )
-    async def get_run_config(path: str) -> Dict[str, Any]:
+    async def get_run_config(path: str) -> CallToolResult:
         """
         Get the configuration for a specific run (experiment).
 
@@ -236,7 +236,7 @@ def register_run_tools(mcp: FastMCP, api: Api) -> None:
             Configuration dictionary containing hyperparameters and settings.
             返回配置字典，包含超参数和设置。
         """
-        return await run_tools.get_run_config(path)
+        return serializer.tool_result(await run_tools.get_run_config(path))
 
     @mcp.tool(
         name="swanlab_get_run_metadata",
@@ -247,7 +247,7 @@ def register_run_tools(mcp: FastMCP, api: Api) -> None:
             readOnlyHint=True,
         ),
     )
-    async def get_run_metadata(path: str) -> Dict[str, Any]:
+    async def get_run_metadata(path: str) -> CallToolResult:
         """
         Get the environment metadata for a specific run (experiment).
 
@@ -258,7 +258,7 @@ def register_run_tools(mcp: FastMCP, api: Api) -> None:
             Metadata dictionary containing Python version, hardware info, etc.
             返回元数据字典，包含 Python 版本、硬件信息等。
         """
-        return await run_tools.get_run_metadata(path)
+        return serializer.tool_result(await run_tools.get_run_metadata(path))
 
     @mcp.tool(
         name="swanlab_get_run_requirements",
@@ -268,7 +268,7 @@ def register_run_tools(mcp: FastMCP, api: Api) -> None:
             readOnlyHint=True,
         ),
     )
-    async def get_run_requirements(path: str) -> List[str]:
+    async def get_run_requirements(path: str) -> CallToolResult:
         """
         Get the Python requirements for a specific run (experiment).
 
@@ -279,4 +279,4 @@ def register_run_tools(mcp: FastMCP, api: Api) -> None:
             List of Python package requirements.
             返回 Python 包依赖列表。
         """
-        return await run_tools.get_run_requirements(path)
+        return serializer.tool_result(await run_tools.get_run_requirements(path))
@@ -3,14 +3,15 @@
 工作空间管理工具，用于获取用户可访问的空间信息。
 """
 
-from typing import Any, Dict, List, Optional
+from typing import List, Optional
 
 from mcp.server.fastmcp import FastMCP
-from mcp.types import ToolAnnotations
-from swanlab import Api
+from mcp.types import CallToolResult, ToolAnnotations
 
-from ..models import Workspace
-from ..utils import to_plain_dict, validate_workspace_path
+from ..api import LazyApi
+from ..models import WORKSPACE_LIST_ADAPTER, Workspace
+from ..serialization import JsonSerializer
+from ..utils import validate_workspace_path
 
 
 class WorkspaceTools:
@@ -19,7 +20,7 @@ class WorkspaceTools:
     工作空间是项目的集合，对应一个研发团队（如"SwanLab"），分为个人空间（PERSON）和组织空间（TEAM）。
     """
 
-    def __init__(self, api: Api):
+    def __init__(self, api: LazyApi):
         self.api = api
 
     async def list_workspaces(self, username: Optional[str] = None) -> List[Workspace]:
@@ -38,11 +39,14 @@ class WorkspaceTools:
             - profile: 空间的介绍信息
         """
         try:
+            backend = await self.api.get()
             normalized_username = validate_workspace_path(username)
-            workspaces = (
-                self.api.workspaces(username=normalized_username) if normalized_username else self.api.workspaces()
-            )
-            return [Workspace(**to_plain_dict(ws)) for ws in workspaces]
+            if normalized_username:
+                workspaces = await backend.workspaces(username=normalized_username)
+            else:
+                # 首次调用优先使用预热阶段预取的结果
+                workspaces = self.api.take_workspaces() or await backend.workspaces()
+            return WORKSPACE_LIST_ADAPTER.validate_python(workspaces)
         except Exception as e:
             raise RuntimeError(f"Failed to list workspaces: {str(e)}") from e
 
@@ -57,21 +61,22 @@ class WorkspaceTools:
             Workspace object with detailed information
         """
         try:
+            backend = await self.api.get()
             normalized_username = validate_workspace_path(username)
-            ws = self.api.workspace(username=normalized_username) if normalized_username else self.api.workspace()
-            return Workspace(**to_plain_dict(ws))
+            return Workspace(**await backend.workspace(username=normalized_username))
         except Exception as e:
             workspace_name = username if username else "<current-user>"
             raise RuntimeError(f"Failed to get workspace '{workspace_name}': {str(e)}") from e
 
 
-def register_workspace_tools(mcp: FastMCP, api: Api) -> None:
+def register_workspace_tools(mcp: FastMCP, api: LazyApi, serializer: JsonSerializer) -> None:
     """
     Register workspace-related MCP tools.
 
     Args:
         mcp: FastMCP server instance
-        api: SwanLab Api instance
+        api: Shared lazily warmed SwanLab Api
+        serializer: JSON serializer for tool outputs
     """
     workspace_tools = WorkspaceTools(api)
 
@@ -83,7 +88,7 @@ def register_workspace_tools(mcp: FastMCP, api: Api) -> None:
             readOnlyHint=True,
         ),
     )
-    async def list_workspaces(username: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def list_workspaces(username: Optional[str] = None) -> CallToolResult:
         """
         List all workspaces accessible to the current user.
 
@@ -95,7 +100,7 @@ def register_workspace_tools(mcp: FastMCP, api: Api) -> None:
             返回空间列表，包含用户名、名称、角色和类型等信息。
         """
         workspaces = await workspace_tools.list_workspaces(username=username)
-        return [ws.model_dump() for ws in workspaces]
+        return serializer.tool_result(workspaces)
 
     @mcp.tool(
         name="swanlab_get_workspace",
@@ -105,7 +110,7 @@ def register_workspace_tools(mcp: FastMCP, api: Api) -> None:
             readOnlyHint=True,
         ),
     )
-    async def get_workspace(username: Optional[str] = None) -> Dict[str, Any]:
+    async def get_workspace(username: Optional[str] = None) -> CallToolResult:
         """
         Get detailed information about a specific workspace.
 
@@ -117,4 +122,4 @@ def register_workspace_tools(mcp: FastMCP, api: Api) -> None:
             返回空间详情，包含名称、角色、类型和介绍信息。
         """
         workspace = await workspace_tools.get_workspace(username)
-        return workspace.model_dump()
+        return serializer.tool_result(workspace)
@@ -0,0 +1,423 @@
+"""Admission control, retries and circuit breaking of upstream requests.
+
+所有访问 SwanLab 的请求共享一个限流器：令牌桶限制每秒请求数，
+并发上限按 AIMD 调整——请求成功时缓慢增加，遇到 429 或 5xx 时减半并遵守 `Retry-After`，
+无需手动调参即可逼近上游能承受的最大吞吐。
+暂时性错误（429、5xx、网络错误）按指数退避重试；每个上游接口有独立的熔断器，
+连续失败后在一段时间内直接拒绝请求，由缓存层返回过期数据。
+可选的请求对冲：请求超过该接口近期 p95 耗时仍未返回时再发一个相同请求，取先返回的结果，
+额外负载受全局比例限制。
+"""
+
+import asyncio
+import logging
+import random
+import time
+import urllib.error
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+import httpx
+
+from .constants import (
+    HEDGE_BURST,
+    HEDGE_LATENCY_WINDOW,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_QUANTILE,
+    LIMITER_DECREASE_FACTOR,
+    LIMITER_LATENCY_SMOOTHING,
+    MAX_RETRY_AFTER_SECONDS,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_DELAY_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def error_response(error: BaseException) -> Any:
+    """Return the HTTP response attached to an httpx/requests error or a SwanLab SDK `ApiError`.
+
+    urllib 的 `HTTPError`（pandas 读取 CSV 链接时抛出）本身就是响应，直接返回。
+    """
+    if isinstance(error, urllib.error.HTTPError):
+        return error
+    return getattr(error, "response", None) or getattr(error, "resp", None)
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """HTTP status code of a failed upstream request, None for transport errors."""
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code
+    return getattr(error_response(error), "status_code", None)
+
+
+def is_overloaded(status: Optional[int]) -> bool:
+    """Whether the upstream asked us to slow down (429) or failed on its side (5xx)."""
+    return status is not None and (status == 429 or status >= 500)
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed request may succeed when retried: 429, 5xx or a network/timeout error.
+
+    requests 和 urllib 的网络错误是 OSError 的子类；带状态码的错误（包括同为 OSError 子类的 urllib
+    `HTTPError`）只按状态码判断，4xx 不重试，也不计入熔断。
+    """
+    status = error_status(error)
+    if status is not None:
+        return is_overloaded(status)
+    return isinstance(error, (httpx.TransportError, OSError))
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without contacting the upstream while the circuit of an endpoint is open."""
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Parse the `Retry-After` header (seconds or HTTP date) of a failed request."""
+    headers = getattr(error_response(error), "headers", None) or {}
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+class AdaptiveLimiter:
+    """Token bucket plus AIMD concurrency limit shared by every upstream request of a backend.
+
+    并发上限从 `max_concurrency` 开始，每次成功增加 `1 / limit`（约每轮往返加 1），
+    遇到过载时乘以 `LIMITER_DECREASE_FACTOR`；一个往返时间（请求耗时的滑动平均）内的多次过载只减一次，
+    避免同一批并发请求同时失败时上限骤降。
+    `Retry-After` 期间暂停发放令牌，所有请求一起等待。
+    """
+
+    def __init__(self, rate: float, max_concurrency: int, min_concurrency: int = 1):
+        self.rate = rate
+        self.burst = max(1.0, rate)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min(min_concurrency, max_concurrency)
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._decreased_at = float("-inf")
+        self._latency = 0.0
+        self._freed = asyncio.Event()
+
+    async def call(self, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run one upstream request once a concurrency slot and a token are available.
+
+        Args:
+            request: 发起上游请求的异步函数；HTTP 错误需以异常形式抛出，便于识别 429/5xx
+
+        Returns:
+            请求结果；异常原样抛出
+        """
+        await self._acquire()
+        started = time.monotonic()
+        try:
+            result = await request()
+        except Exception as e:
+            status = error_status(e)
+            if is_overloaded(status):
+                self._overloaded(status, retry_after(e))
+            raise
+        else:
+            elapsed = time.monotonic() - started
+            self._latency += LIMITER_LATENCY_SMOOTHING * (elapsed - self._latency)
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            return result
+        finally:
+            self.in_flight -= 1
+            self._freed.set()
+
+    async def _acquire(self) -> None:
+        while self.in_flight >= int(self.limit):
+            self._freed.clear()
+            await self._freed.wait()
+        self.in_flight += 1
+        try:
+            await self._take_token()
+        except BaseException:
+            self.in_flight -= 1
+            self._freed.set()
+            raise
+        self.requests += 1
+
+    async def _take_token(self) -> None:
+        while True:
+            now = time.monotonic()
+            if self.rate > 0:
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+                self._refilled_at = now
+            pause = self._paused_until - now
+            if pause <= 0 and (self.rate <= 0 or self._tokens >= 1):
+                self._tokens -= 1
+                return
+            await asyncio.sleep(max(pause, (1 - self._tokens) / self.rate if self.rate > 0 else 0.0))
+
+    def _overloaded(self, status: Optional[int], delay: Optional[float]) -> None:
+        self.throttled += 1
+        now = time.monotonic()
+        if now - self._decreased_at >= self._latency:
+            self._decreased_at = now
+            self.limit = max(float(self.min_concurrency), self.limit * LIMITER_DECREASE_FACTOR)
+            logger.info("Upstream returned %s, concurrency limit lowered to %d", status, int(self.limit))
+        if delay:
+            self._paused_until = max(self._paused_until, now + delay)
+            self._tokens = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limits and counters, reported by the `swanlab://server/upstream` resource."""
+        return {
+            "concurrency_limit": int(self.limit),
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "rate_limit": self.rate,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "paused_seconds": round(max(0.0, self._paused_until - time.monotonic()), 3),
+        }
+
+
+class CircuitBreaker:
+    """Circuit breaker of one upstream endpoint.
+
+    连续 `failure_threshold` 次暂时性失败后打开，`reset_timeout` 秒内的请求直接失败；
+    之后进入半开状态，只放行一个探测请求：成功则关闭，失败则重新打开。
+    """
+
+    def __init__(self, endpoint: str, failure_threshold: int, reset_timeout: float):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """closed, open or half_open."""
+        if self._opened_at is None:
+            return "closed"
+        return "open" if time.monotonic() - self._opened_at < self.reset_timeout else "half_open"
+
+    def check(self) -> None:
+        """Admit a request, or raise `CircuitOpenError` while the circuit is open or a probe is in flight."""
+        if self._opened_at is None:
+            return
+        remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+        if remaining > 0 or self._probing:
+            raise CircuitOpenError(
+                f"Circuit open for upstream endpoint '{self.endpoint}' after {self.failures} consecutive failures, "
+                f"retrying in {max(remaining, 0.0):.1f}s"
+            )
+        self._probing = True
+
+    def succeeded(self) -> None:
+        if self._opened_at is not None:
+            logger.info("Circuit of upstream endpoint '%s' closed", self.endpoint)
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def failed(self) -> None:
+        self.failures += 1
+        if self._opened_at is not None or self.failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning("Circuit of upstream endpoint '%s' opened after %d failures", self.endpoint, self.failures)
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+    def abandoned(self) -> None:
+        # 探测请求被取消时既不算成功也不算失败，允许下一个请求重新探测
+        self._probing = False
+
+
+class LatencyWindow:
+    """Latencies of the most recent successful requests of one endpoint."""
+
+    def __init__(self, size: int = HEDGE_LATENCY_WINDOW):
+        self.samples: Deque[float] = deque(maxlen=size)
+        self._quantile: Optional[float] = None
+        self._added = 0
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self._added += 1
+
+    def quantile(self) -> Optional[float]:
+        """Running `HEDGE_QUANTILE` latency, None until enough samples were seen."""
+        if len(self.samples) < HEDGE_MIN_SAMPLES:
+            return None
+        # 每新增 1/16 窗口的样本重新排序一次，而不是每个请求都排序
+        if self._quantile is None or self._added * 16 >= len(self.samples):
+            ordered = sorted(self.samples)
+            self._quantile = ordered[int(HEDGE_QUANTILE * (len(ordered) - 1))]
+            self._added = 0
+        return self._quantile
+
+
+def _consume_result(task: "asyncio.Future[Any]") -> None:
+    # 被放弃的对冲请求失败时，避免 "exception was never retrieved" 警告
+    if not task.cancelled():
+        task.exception()
+
+
+class Upstream:
+    """Request policy shared by every upstream call of a backend: rate limit, retries, circuit breakers and hedging.
+
+    只用于幂等的读请求（包括 `/runs/shows` 等查询型 POST），失败后可以安全地重新发送。
+    `hedge_ratio` 大于 0 时启用对冲，最多额外发送该比例的请求（允许 `HEDGE_BURST` 次突发）。
+    """
+
+    def __init__(
+        self,
+        limiter: AdaptiveLimiter,
+        retries: int = 0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        hedge_ratio: float = 0.0,
+    ):
+        self.limiter = limiter
+        self.retries = retries
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hedge_ratio = hedge_ratio
+        self.retried = 0
+        self.rejected = 0
+        self.attempts = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._hedge_credit = 0.0
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyWindow] = {}
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(endpoint, self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    async def _send(self, endpoint: str, request: Callable[[], Awaitable[T]], hedge: bool) -> T:
+        """Send one attempt, hedged with a duplicate if it outlives the running p95 latency of the endpoint."""
+        self.attempts += 1
+        if not hedge or self.hedge_ratio <= 0:
+            return await self.limiter.call(request)
+        window = self._latencies.setdefault(endpoint, LatencyWindow())
+        self._hedge_credit = min(float(HEDGE_BURST), self._hedge_credit + self.hedge_ratio)
+        started = time.monotonic()
+        delay = window.quantile()
+        primary = asyncio.ensure_future(self.limiter.call(request))
+        primary.add_done_callback(_consume_result)
+        pending = {primary}
+        try:
+            # 样本不足时不对冲
+            if delay is not None:
+                await asyncio.wait(pending, timeout=delay)
+            if delay is not None and not primary.done() and self._hedge_credit >= 1:
+                self._hedge_credit -= 1
+                self.hedged += 1
+                hedged = asyncio.ensure_future(self.limiter.call(request))
+                hedged.add_done_callback(_consume_result)
+                pending.add(hedged)
+            # 取第一个成功的结果；都失败时抛出最先出现的错误
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        window.add(time.monotonic() - started)
+                        return task.result()
+                    error = error or task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def call(self, endpoint: str, request: Callable[[], Awaitable[T]], hedge: bool = True) -> T:
+        """
+        Send one idempotent upstream request with retries behind the circuit breaker of its endpoint.
+
+        Args:
+            endpoint: 接口名，同一接口共享一个熔断器和耗时统计，如 `GET /project/*/*/runs/*`
+            request: 发起请求的异步函数，每次重试和对冲都会重新调用
+            hedge: 是否允许对冲；无法取消的请求（如线程中的 SDK 调用）应传 False
+
+        Returns:
+            请求结果
+
+        Raises:
+            CircuitOpenError: 熔断器打开，未发送请求
+            Exception: 不可重试的错误，或重试次数用尽后的最后一个错误
+        """
+        breaker = self.breaker(endpoint)
+        attempt = 0
+        while True:
+            try:
+                breaker.check()
+            except CircuitOpenError:
+                self.rejected += 1
+                raise
+            try:
+                result = await self._send(endpoint, request, hedge)
+            except Exception as e:
+                if not is_transient(e):
+                    # 上游正常返回了错误（如 404），说明接口可用
+                    breaker.succeeded()
+                    raise
+                breaker.failed()
+                if attempt >= self.retries:
+                    raise
+            except BaseException:
+                breaker.abandoned()
+                raise
+            else:
+                breaker.succeeded()
+                return result
+            # 全抖动指数退避；限流器会单独等待 Retry-After
+            delay = min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2**attempt) * random.random()
+            attempt += 1
+            self.retried += 1
+            logger.debug("Retrying %s in %.2fs (attempt %d)", endpoint, delay, attempt + 1)
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Limiter state, retry and hedging counters and every circuit that is not closed."""
+        return {
+            "limiter": self.limiter.stats(),
+            "retried": self.retried,
+            "rejected": self.rejected,
+            "hedging": {
+                "max_ratio": self.hedge_ratio,
+                "hedged": self.hedged,
+                "wins": self.hedge_wins,
+                "rate": self.hedged / self.attempts if self.attempts else 0.0,
+                "p95_seconds": {
+                    endpoint: round(p95, 4)
+                    for endpoint, window in self._latencies.items()
+                    if (p95 := window.quantile()) is not None
+                },
+            },
+            "open_circuits": {
+                endpoint: {"state": breaker.state, "failures": breaker.failures}
+                for endpoint, breaker in self._breakers.items()
+                if breaker.state != "closed"
+            },
+        }
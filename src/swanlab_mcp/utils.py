@@ -5,16 +5,20 @@
 
 import json
 import re
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-# 预编译的正则表达式
-PROJECT_PATH_PATTERN = re.compile(r"^[^/\s]+/[^/\s]+$")
-RUN_PATH_PATTERN = re.compile(r"^[^/\s]+/[^/\s]+/[^/\s]+$")
+# 预编译的正则表达式；路径段不能是 . 或 ..
+_PATH_SEGMENT = r"(?!\.\.?(?:/|$))[^/\s]+"
+PROJECT_PATH_PATTERN = re.compile(rf"^{_PATH_SEGMENT}/{_PATH_SEGMENT}$")
+RUN_PATH_PATTERN = re.compile(rf"^{_PATH_SEGMENT}/{_PATH_SEGMENT}/{_PATH_SEGMENT}$")
 
 
 def _normalize_to_str(value: Any) -> str:
     """Normalize any value to string, returning empty string for None."""
+    if type(value) is str:
+        return value
     if value is None:
         return ""
     return str(value)
@@ -31,6 +35,8 @@ def _normalize_to_list(value: Any) -> List[str]:
 
 def _normalize_to_dict(value: Any) -> Dict[str, Any]:
     """Normalize any value to dict."""
+    if type(value) is dict:
+        return value
     if value is None or value == "":
         return {}
     if isinstance(value, Mapping):
@@ -63,6 +69,42 @@ def to_plain_dict(obj: Any) -> Dict[str, Any]:
     return data
 
 
+def to_plain_dicts(objs: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Convert SDK objects to plain dictionaries in bulk.
+
+    批量列表的快速路径：dict 直接复用不拷贝，优先使用直接返回 dict 的 model_dump()，
+    只有对象仅提供字符串形式的 json() 时才做 JSON 解析。
+    """
+    result: List[Dict[str, Any]] = []
+    append = result.append
+    for obj in objs:
+        if type(obj) is dict:
+            append(obj)
+        elif isinstance(obj, Mapping):
+            append(dict(obj.items()))
+        elif hasattr(obj, "model_dump"):
+            append(obj.model_dump())
+        else:
+            append(to_plain_dict(obj))
+    return result
+
+
+def resolve_inside(root: Path, path: str) -> Path:
+    """
+    Join a `/`-separated relative path onto `root`, rejecting paths that would leave it.
+
+    空段、`.`、`..`、绝对路径以及经符号链接解析后落在 root 之外的路径都会被拒绝。
+
+    Raises:
+        ValueError: 路径不在 root 之内时
+    """
+    parts = path.split("/")
+    target = root.joinpath(*parts)
+    if any(part in ("", ".", "..") for part in parts) or not target.resolve().is_relative_to(root.resolve()):
+        raise ValueError(f"Invalid path '{path}': it must stay inside {root}")
+    return target
+
+
 def validate_project_path(path: str) -> str:
     """Validate project path format: username/project_name."""
     normalized = path.strip()
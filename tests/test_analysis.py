@@ -0,0 +1,42 @@
+"""Divergence detection of detect_anomalies.
+
+发散按越低越好判断；`maximize=True` 的指标（准确率、奖励等）取反后判断，历史最优为负数时同样适用。
+"""
+
+import numpy as np
+import pandas as pd
+
+from swanlab_mcp.analysis import detect_anomalies
+
+
+def divergence(values, **kwargs):
+    df = pd.DataFrame({"x": values}, index=pd.Index(np.arange(len(values)), name="step"))
+    return [event for event in detect_anomalies(df, "x", **kwargs) if event["kind"] == "divergence"]
+
+
+def test_rising_loss_diverges():
+    loss = np.concatenate([np.linspace(2, 0.5, 600), np.linspace(0.5, 1.6, 400)])
+    assert divergence(loss)
+
+
+def test_rising_accuracy_is_not_divergence_when_maximized():
+    rng = np.random.default_rng(0)
+    acc = np.linspace(0.1, 0.9, 1000) + rng.normal(0, 0.01, 1000)
+    assert divergence(acc)
+    assert not divergence(acc, maximize=True)
+
+
+def test_collapsing_accuracy_diverges_when_maximized():
+    acc = np.concatenate([np.linspace(0.1, 0.9, 600), np.linspace(0.9, 0.2, 400)])
+    assert divergence(acc, maximize=True)
+
+
+def test_negative_reward_improving_towards_zero():
+    rng = np.random.default_rng(0)
+    reward = np.linspace(-100, -0.5, 1000) + rng.normal(0, 1, 1000)
+    assert not divergence(reward, maximize=True)
+
+
+def test_negative_loss_diverges():
+    loss = np.concatenate([np.linspace(-10, -100, 600), np.linspace(-100, -40, 400)])
+    assert divergence(loss)
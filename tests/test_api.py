@@ -0,0 +1,44 @@
+"""Warm-up retries of LazyApi.
+
+预热失败后的调用在重试间隔内返回同一个错误，之后重新预热；连续失败只记录一次错误日志。
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from swanlab_mcp import api as api_module
+from swanlab_mcp.api import WARMUP_FAILED, WARMUP_READY, LazyApi
+from swanlab_mcp.config import SwanLabConfig
+
+
+def offline_api(path) -> LazyApi:
+    return LazyApi(SwanLabConfig(SWANLAB_OFFLINE_DIR=str(path)))
+
+
+def test_failed_warm_up_is_retried_after_the_delay(tmp_path, monkeypatch, caplog):
+    snapshot = tmp_path / "snapshot"
+    lazy = offline_api(snapshot)
+
+    async def main():
+        with pytest.raises(RuntimeError, match="unavailable"):
+            await lazy.get()
+        # 重试间隔内不重新预热
+        with pytest.raises(RuntimeError, match="unavailable"):
+            await lazy.get()
+        assert lazy.state == WARMUP_FAILED
+
+        monkeypatch.setattr(api_module, "WARMUP_RETRY_SECONDS", 0)
+        with pytest.raises(RuntimeError, match="unavailable"):
+            await lazy.get()
+        snapshot.mkdir()
+        backend = await lazy.get()
+        assert backend.name == "offline"
+        assert lazy.state == WARMUP_READY
+        await lazy.aclose()
+
+    with caplog.at_level(logging.DEBUG, logger=api_module.__name__):
+        asyncio.run(main())
+    assert [record.levelno for record in caplog.records if record.levelno >= logging.ERROR] == [logging.ERROR]
+    assert lazy._failures == 0
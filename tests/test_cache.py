@@ -0,0 +1,69 @@
+"""Single-flight loading of TTLCache.
+
+同一个 key 的并发加载只请求一次；发起加载的调用被取消时，其余等待者重新加载而不是一起被取消。
+"""
+
+import asyncio
+
+import pytest
+
+from swanlab_mcp.cache import TTLCache
+
+
+def test_concurrent_callers_share_one_load():
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        cache = TTLCache(60, 16)
+        return await asyncio.gather(*(cache.get_or_load("key", load) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["value"] * 5
+    assert len(calls) == 1
+
+
+def test_cancelled_loader_does_not_cancel_other_waiters():
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        cache = TTLCache(60, 16)
+        first = asyncio.create_task(cache.get_or_load("key", load))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get_or_load("key", load))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # 第二个调用者接手重新加载
+        return await second
+
+    assert asyncio.run(main()) == 2
+    assert len(calls) == 2
+
+
+def test_cancelled_waiter_does_not_cancel_the_load():
+    async def load():
+        await asyncio.sleep(0.02)
+        return "value"
+
+    async def main():
+        cache = TTLCache(60, 16)
+        loader = asyncio.create_task(cache.get_or_load("key", load))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_load("key", load))
+        await asyncio.sleep(0.005)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return await loader
+
+    assert asyncio.run(main()) == "value"
@@ -0,0 +1,82 @@
+"""Memory bounds of swanlab_get_run_metrics.
+
+指标查询的内存上限：大结果按列式数组分块序列化，峰值内存与输出大小成正比；
+超过 `METRIC_REQUEST_MAX_MB` 的请求直接拒绝。
+"""
+
+import asyncio
+import json
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from swanlab_mcp.config import SwanLabConfig
+from swanlab_mcp.serialization import JsonSerializer
+from swanlab_mcp.tools.metric import MetricTools
+
+ROWS = 200_000
+KEYS = ["loss", "acc", "lr"]
+
+
+class FakeBackend:
+    def __init__(self, series):
+        self.series = series
+
+    async def metric_columns(self, path):
+        return [{"key": key} for key in self.series]
+
+    async def metric_series(self, path, key):
+        return self.series[key]
+
+
+class FakeApi:
+    def __init__(self, backend, **settings):
+        self.backend = backend
+        self.config = SwanLabConfig(**settings)
+
+    async def get(self):
+        return self.backend
+
+
+def make_series(rows):
+    rng = np.random.default_rng(0)
+    steps = pd.Index(np.arange(rows), name="step")
+    return {key: pd.DataFrame({key: rng.random(rows)}, index=steps) for key in KEYS}
+
+
+def run_metrics(api, **kwargs):
+    return asyncio.run(MetricTools(api).get_run_metrics("user/project/run", KEYS, **kwargs))
+
+
+def test_large_query_peak_memory_is_bounded_by_output_size():
+    series = make_series(ROWS)
+    api = FakeApi(FakeBackend(series))
+    serializer = JsonSerializer()
+
+    tracemalloc.start()
+    try:
+        table = run_metrics(api, step_min=0)
+        data = serializer.dumps(table)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert table.total == ROWS
+    payload = json.loads(data)
+    assert len(payload["rows"]) == ROWS
+    assert payload["rows"][1] == {"step": 1, **{key: series[key][key].iloc[1] for key in KEYS}}
+    values_bytes = ROWS * (len(KEYS) + 1) * 8
+    # 逐行构造字典的实现峰值约为输出的 7 倍；分块序列化只有输出缓冲区和少量列数组
+    assert peak < 3 * len(data)
+    assert peak < 8 * values_bytes
+
+
+def test_request_over_metric_request_max_mb_is_rejected():
+    api = FakeApi(FakeBackend(make_series(ROWS)), METRIC_REQUEST_MAX_MB=1)
+
+    with pytest.raises(RuntimeError, match="METRIC_REQUEST_MAX_MB"):
+        run_metrics(api, step_min=0)
+    # 默认只返回前 1000 行，不超过限制
+    assert run_metrics(api).total == 1000
@@ -0,0 +1,37 @@
+"""Path validation for exports and offline snapshots.
+
+项目路径的各段不能是 `.` 或 `..`；导出目录和快照路径不能越出各自的根目录。
+"""
+
+import pytest
+
+from swanlab_mcp.utils import resolve_inside, validate_project_path, validate_run_path
+
+
+@pytest.mark.parametrize("path", ["../..", "./project", "user/..", "user/.", "../x/y"])
+def test_dot_segments_are_not_paths(path):
+    with pytest.raises(ValueError):
+        validate_project_path(path) if path.count("/") == 1 else validate_run_path(path)
+
+
+def test_names_starting_with_dots_are_allowed():
+    assert validate_project_path("user/..hidden") == "user/..hidden"
+    assert validate_run_path("user/.project/run") == "user/.project/run"
+
+
+@pytest.mark.parametrize("path", ["..", "a/../..", "/etc", "a//b", "./a", ""])
+def test_escaping_paths_are_rejected(tmp_path, path):
+    with pytest.raises(ValueError):
+        resolve_inside(tmp_path, path)
+
+
+def test_symlink_out_of_root_is_rejected(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "link").symlink_to(tmp_path)
+    with pytest.raises(ValueError):
+        resolve_inside(root, "link/x")
+
+
+def test_relative_path_stays_inside(tmp_path):
+    assert resolve_inside(tmp_path, "exports/user") == tmp_path / "exports" / "user"
@@ -0,0 +1,35 @@
+"""Classification of upstream errors.
+
+urllib 的 `HTTPError`（pandas 读取 CSV 链接时抛出）按状态码判断：4xx 不重试，429/5xx 重试并遵守 Retry-After。
+"""
+
+import email.message
+import urllib.error
+
+import pytest
+
+from swanlab_mcp.upstream import error_status, is_transient, retry_after
+
+
+def http_error(code: int, retry: str = "") -> urllib.error.HTTPError:
+    headers = email.message.Message()
+    if retry:
+        headers["Retry-After"] = retry
+    return urllib.error.HTTPError("https://example.com/metric.csv", code, "error", headers, None)
+
+
+@pytest.mark.parametrize("code", [403, 404])
+def test_urllib_client_errors_are_not_transient(code):
+    assert error_status(http_error(code)) == code
+    assert not is_transient(http_error(code))
+
+
+@pytest.mark.parametrize("code", [429, 503])
+def test_urllib_overload_errors_are_transient(code):
+    assert is_transient(http_error(code))
+    assert retry_after(http_error(code, "3")) == 3.0
+
+
+def test_urllib_network_errors_are_transient():
+    assert error_status(urllib.error.URLError("connection refused")) is None
+    assert is_transient(urllib.error.URLError("connection refused"))